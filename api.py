@@ -0,0 +1,417 @@
+"""
+Headless REST API for programmatic resume generation
+
+A Starlette app over the same Database, ResumeOptimizer and PDF rendering used by
+the Streamlit UI. Requests authenticate with HTTP Basic auth using the app's
+usernames and passwords. Blocking work (SQLite, LLM calls, PDF rendering) runs in
+Starlette's thread pool so the event loop stays responsive.
+
+Run with multiple workers:
+    uvicorn api:app --host 0.0.0.0 --port 8000 --workers 4
+"""
+import base64
+import binascii
+import os
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional
+
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.responses import FileResponse, JSONResponse, PlainTextResponse
+from starlette.routing import Route
+
+import config
+import metrics
+import warmup
+from database import Database
+from llm_processor_web import ResumeOptimizer
+from resume_renderer import DEFAULT_TEMPLATE, RESUME_TEMPLATES, download_filename
+from resume_service import (
+    OUTPUT_DIR, ResumeLimitReached, create_resume, generate_tailored_bullets, similar_job_groups, similar_jobs
+)
+
+db = Database(os.getenv("RESUME_DB_PATH", "resume_optimizer.db"))
+
+# Fields PUT /profile accepts
+PROFILE_FIELDS = ('full_name', 'email', 'phone', 'linkedin_url', 'location', 'education', 'skills')
+
+
+class APIError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status"""
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+        self.message = message
+
+
+async def api_error_handler(request: Request, exc: APIError) -> JSONResponse:
+    headers = {"WWW-Authenticate": 'Basic realm="resume-optimizer"'} if exc.status_code == 401 else None
+    return JSONResponse({"error": exc.message}, status_code=exc.status_code, headers=headers)
+
+
+async def authenticate(request: Request) -> int:
+    """Return the user id for the request's Basic auth credentials"""
+    header = request.headers.get("Authorization", "")
+    if not header.startswith("Basic "):
+        raise APIError(401, "Authentication required")
+    try:
+        username, _, password = base64.b64decode(header[6:]).decode("utf-8").partition(":")
+    except (binascii.Error, UnicodeDecodeError):
+        raise APIError(401, "Malformed credentials")
+
+    user_id = await run_in_threadpool(db.authenticate_user, username, password)
+    if not user_id:
+        raise APIError(401, "Invalid username or password")
+    return user_id
+
+
+async def read_json(request: Request) -> Dict:
+    try:
+        data = await request.json()
+    except ValueError:
+        raise APIError(400, "Request body must be JSON")
+    if not isinstance(data, dict):
+        raise APIError(400, "Request body must be a JSON object")
+    return data
+
+
+def require_fields(data: Dict, *fields: str):
+    missing = [field for field in fields if not data.get(field)]
+    if missing:
+        raise APIError(400, f"Missing required fields: {', '.join(missing)}")
+
+
+def parse_int(value, name: str, minimum: int = 1) -> int:
+    """An integer from the request body, or a 400 naming the field"""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise APIError(400, f"{name} must be an integer")
+    if number < minimum:
+        raise APIError(400, f"{name} must be at least {minimum}")
+    return number
+
+
+def parse_bullets(value) -> Dict[int, List[str]]:
+    """{experience_id: [bullet, ...]} from the request body, or a 400"""
+    error = APIError(400, "bullets must map experience ids to lists of strings")
+    if not isinstance(value, dict):
+        raise error
+    bullets = {}
+    for exp_id, lines in value.items():
+        if not isinstance(lines, list) or not all(isinstance(line, str) for line in lines):
+            raise error
+        try:
+            bullets[int(exp_id)] = clean_bullets(lines)
+        except ValueError:
+            raise error
+    return bullets
+
+
+def clean_bullets(lines: List[str]) -> List[str]:
+    """Strip bullet symbols the same way the Streamlit forms do"""
+    return [line.strip().lstrip('•-*→ ') for line in lines if isinstance(line, str) and line.strip()]
+
+
+def get_owned_experience(user_id: int, exp_id: int) -> Dict:
+    for exp in db.get_work_experiences(user_id):
+        if exp['id'] == exp_id:
+            return exp
+    raise APIError(404, "Work experience not found")
+
+
+def get_owned_job(user_id: int, job_id: int) -> Dict:
+    job = db.get_target_job(job_id)
+    if not job or job['user_id'] != user_id:
+        raise APIError(404, "Target job not found")
+    return job
+
+
+# Profile
+
+async def get_profile(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    profile = await run_in_threadpool(db.get_profile, user_id)
+    profile.pop('education_json', None)
+    profile.pop('skills_json', None)
+    return JSONResponse(profile)
+
+
+async def update_profile(request: Request) -> JSONResponse:
+    """Update the fields given in the body; omitted fields keep their current values"""
+    user_id = await authenticate(request)
+    data = await read_json(request)
+    profile = await run_in_threadpool(db.get_profile, user_id) or {}
+    merged = {field: profile.get(field) for field in PROFILE_FIELDS}
+    merged.update({field: value for field, value in data.items() if field in PROFILE_FIELDS})
+    await run_in_threadpool(db.update_profile, user_id, merged)
+    return await get_profile(request)
+
+
+# Work experience
+
+def _experiences_with_bullets(user_id: int) -> List[Dict]:
+    experiences = db.get_work_experiences(user_id)
+    for exp in experiences:
+        exp['bullets'] = db.get_bullets(exp['id'])
+    return experiences
+
+
+async def list_experiences(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    return JSONResponse(await run_in_threadpool(_experiences_with_bullets, user_id))
+
+
+async def add_experience(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    data = await read_json(request)
+    require_fields(data, 'company_name', 'job_title', 'start_date')
+
+    is_current = bool(data.get('is_current'))
+    exp_id = await run_in_threadpool(
+        db.add_work_experience,
+        user_id,
+        data['company_name'],
+        data['job_title'],
+        data['start_date'],
+        None if is_current else data.get('end_date'),
+        is_current,
+        clean_bullets(data.get('bullets', []))
+    )
+    return JSONResponse({"id": exp_id}, status_code=201)
+
+
+async def delete_experience(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    exp_id = request.path_params['exp_id']
+    await run_in_threadpool(get_owned_experience, user_id, exp_id)
+    await run_in_threadpool(db.delete_work_experience, exp_id)
+    return JSONResponse({"deleted": exp_id})
+
+
+async def add_bullets(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    exp_id = request.path_params['exp_id']
+    data = await read_json(request)
+    bullets = clean_bullets(data.get('bullets', []))
+    if not bullets:
+        raise APIError(400, "No bullets provided")
+
+    await run_in_threadpool(get_owned_experience, user_id, exp_id)
+    added = await run_in_threadpool(db.add_bullets_bulk, exp_id, bullets)
+    return JSONResponse({"added": added, "skipped_duplicates": len(bullets) - added}, status_code=201)
+
+
+# Target jobs
+
+async def list_jobs(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    return JSONResponse(await run_in_threadpool(db.get_target_jobs, user_id))
+
+
+async def add_job(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    data = await read_json(request)
+    description = data.get('job_description')
+
+    if not description:
+        if not data.get('job_url'):
+            raise APIError(400, "Provide job_description or job_url to scrape")
+        from web_scraper import scrape_job_description
+
+        description = await run_in_threadpool(scrape_job_description, data['job_url'], db, user_id)
+        if not description:
+            raise APIError(422, "Failed to scrape job description")
+
+    job_id = await run_in_threadpool(
+        db.add_target_job,
+        user_id,
+        data.get('company_name') or "Company",
+        data.get('job_title') or "Position",
+        data.get('job_url'),
+        description
+    )
+    return JSONResponse({"id": job_id, "description_length": len(description)}, status_code=201)
+
+
+async def get_job(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    return JSONResponse(await run_in_threadpool(get_owned_job, user_id, request.path_params['job_id']))
+
+
+async def delete_job(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    job_id = request.path_params['job_id']
+    await run_in_threadpool(get_owned_job, user_id, job_id)
+    await run_in_threadpool(db.delete_target_job, job_id)
+    return JSONResponse({"deleted": job_id})
+
+
+async def list_similar_jobs(request: Request) -> JSONResponse:
+    """Target jobs whose descriptions are near-identical to this one"""
+    user_id = await authenticate(request)
+    job_id = request.path_params['job_id']
+    await run_in_threadpool(get_owned_job, user_id, job_id)
+    return JSONResponse(await run_in_threadpool(similar_jobs, db, user_id, job_id))
+
+
+async def list_job_clusters(request: Request) -> JSONResponse:
+    """Groups of near-identical target jobs, largest first"""
+    user_id = await authenticate(request)
+    return JSONResponse(await run_in_threadpool(similar_job_groups, db, user_id))
+
+
+# Generation
+
+async def generate(request: Request) -> JSONResponse:
+    """
+    Tailor bullets for a target job and render the PDF
+
+    Body (all optional):
+        target_count: bullets per experience (default 5)
+        bullets: {experience_id: [bullet, ...]} to skip the LLM and render these
+        create_pdf: false to return tailored bullets without rendering or counting a resume
+        template: resume template name (see RESUME_TEMPLATES)
+        similar_job_ids: other target jobs (see /jobs/{id}/similar) to render with the same bullets
+    """
+    user_id = await authenticate(request)
+    job_id = request.path_params['job_id']
+    data = await read_json(request) if await request.body() else {}
+    create_pdf = data.get('create_pdf', True)
+    if not isinstance(create_pdf, bool):
+        raise APIError(400, "create_pdf must be true or false")
+    template = data.get('template', DEFAULT_TEMPLATE)
+    if template not in RESUME_TEMPLATES:
+        raise APIError(400, f"Unknown template; choose one of: {', '.join(RESUME_TEMPLATES)}")
+    target_count = parse_int(data.get('target_count', 5), "target_count")
+    similar_job_ids = data.get('similar_job_ids') or []
+    if not isinstance(similar_job_ids, list):
+        raise APIError(400, "similar_job_ids must be a list of target job ids")
+
+    job = await run_in_threadpool(get_owned_job, user_id, job_id)
+    similar = [await run_in_threadpool(get_owned_job, user_id, parse_int(other_id, "similar_job_ids"))
+               for other_id in similar_job_ids]
+
+    # Cheap early exit before any LLM calls; create_resume reserves the slot atomically
+    if create_pdf and not await run_in_threadpool(db.can_generate_resume, user_id):
+        raise APIError(429, "Resume generation limit reached")
+
+    if data.get('bullets'):
+        bullets = parse_bullets(data['bullets'])
+        prior = None
+    else:
+        if not job['job_description']:
+            raise APIError(422, "Target job has no description")
+        optimizer = ResumeOptimizer(config.ANTHROPIC_API_KEY)
+        bullets, _, prior = await run_in_threadpool(
+            generate_tailored_bullets, db, optimizer, user_id, job, target_count
+        )
+
+    if not create_pdf:
+        return JSONResponse({"bullets": bullets, "prior_generation": prior})
+
+    try:
+        resume = await run_in_threadpool(create_resume, db, user_id, job, bullets, OUTPUT_DIR, template)
+    except ResumeLimitReached:
+        raise APIError(429, "Resume generation limit reached")
+    if resume is None:
+        raise APIError(500, "PDF generation failed")
+
+    # Near-identical postings reuse the tailored bullets instead of another round of LLM calls
+    similar_resumes = []
+    for other_job in similar:
+        try:
+            other = await run_in_threadpool(create_resume, db, user_id, other_job, bullets, OUTPUT_DIR, template)
+        except ResumeLimitReached:
+            break
+        if other:
+            similar_resumes.append(_resume_response(request, other, other_job['id']))
+
+    return JSONResponse(
+        dict(_resume_response(request, resume, job_id), similar_resumes=similar_resumes, prior_generation=prior),
+        status_code=201
+    )
+
+
+def _resume_response(request: Request, resume: Dict, job_id: int) -> Dict:
+    return {
+        "resume_id": resume['resume_id'],
+        "job_id": job_id,
+        "filename": f"{resume['filename']}.pdf",
+        "bullets": resume['bullets'],
+        "pages": resume['pages'],
+        "dropped_bullets": resume['dropped_bullets'],
+        "download_url": str(request.url_for("download_resume", resume_id=resume['resume_id']))
+    }
+
+
+# Generated resumes
+
+async def list_resumes(request: Request) -> JSONResponse:
+    user_id = await authenticate(request)
+    resumes = await run_in_threadpool(db.get_user_resumes, user_id)
+    for resume in resumes:
+        # The rendered HTML is large; fetch it through the download endpoint instead
+        resume.pop('html_content', None)
+    return JSONResponse(resumes)
+
+
+async def download_resume(request: Request) -> FileResponse:
+    user_id = await authenticate(request)
+    resume_id = request.path_params['resume_id']
+    resumes = await run_in_threadpool(db.get_user_resumes, user_id)
+    resume: Optional[Dict] = next((r for r in resumes if r['id'] == resume_id), None)
+    if not resume:
+        raise APIError(404, "Resume not found")
+
+    pdf_path = os.path.join(OUTPUT_DIR, f"{resume['pdf_filename']}.pdf")
+    if not os.path.exists(pdf_path):
+        raise APIError(404, "PDF file not found")
+    profile = await run_in_threadpool(db.get_profile, user_id) or {}
+    name = download_filename(profile.get('full_name'), resume['company_name'], resume['created_at'])
+    return FileResponse(pdf_path, media_type="application/pdf", filename=f"{name}.pdf")
+
+
+# Operations
+
+async def health(request: Request) -> JSONResponse:
+    return JSONResponse({"status": "ok"})
+
+
+async def metrics_endpoint(request: Request) -> PlainTextResponse:
+    # Counts and latencies describe every user's activity; only health is public
+    await authenticate(request)
+    return PlainTextResponse(metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+routes = [
+    Route("/health", health),
+    Route("/metrics", metrics_endpoint),
+    Route("/profile", get_profile, methods=["GET"]),
+    Route("/profile", update_profile, methods=["PUT"]),
+    Route("/experiences", list_experiences, methods=["GET"]),
+    Route("/experiences", add_experience, methods=["POST"]),
+    Route("/experiences/{exp_id:int}", delete_experience, methods=["DELETE"]),
+    Route("/experiences/{exp_id:int}/bullets", add_bullets, methods=["POST"]),
+    Route("/jobs", list_jobs, methods=["GET"]),
+    Route("/jobs", add_job, methods=["POST"]),
+    Route("/jobs/clusters", list_job_clusters, methods=["GET"]),
+    Route("/jobs/{job_id:int}", get_job, methods=["GET"]),
+    Route("/jobs/{job_id:int}", delete_job, methods=["DELETE"]),
+    Route("/jobs/{job_id:int}/similar", list_similar_jobs, methods=["GET"]),
+    Route("/jobs/{job_id:int}/generate", generate, methods=["POST"]),
+    Route("/resumes", list_resumes, methods=["GET"]),
+    Route("/resumes/{resume_id:int}/pdf", download_resume, methods=["GET"], name="download_resume"),
+]
+
+
+@asynccontextmanager
+async def lifespan(app: Starlette):
+    # Render a tiny PDF in the background so the first generate request does not pay for it
+    warmup.start_warmup(modules=())
+    yield
+
+
+app = Starlette(routes=routes, exception_handlers={APIError: api_error_handler}, lifespan=lifespan)
@@ -5,19 +5,16 @@ import streamlit as st
 import sys
 import os
 
-# Local imports
+# Local imports. The scraper, LLM stack and renderer are imported where they are
+# first used (and pre-warmed by warmup.py) to keep cold starts fast.
 from database import Database
-from web_scraper import scrape_job_description
-from llm_processor_web import ResumeOptimizer
+from tracing import span, traced, format_summary, logger as trace_logger
+import metrics
 import config
+import warmup
 
-# Helper function for filename generation
-def generate_output_filename(company_name: str) -> str:
-    """Generate output filename"""
-    from datetime import datetime
-    date_str = datetime.now().strftime("%y%m%d")
-    clean_company = company_name.replace(" ", "_").replace("/", "-")
-    return f"Bianco_Resume_{clean_company}_{date_str}"
+# Target jobs listed per page on Manage Target Jobs
+JOBS_PAGE_SIZE = 10
 
 # Page configuration
 st.set_page_config(
@@ -29,10 +26,19 @@ st.set_page_config(
 # Initialize database
 @st.cache_resource
 def get_database():
-    return Database()
+    return Database(cache_size=config.DB_READ_CACHE_SIZE)
 
 db = get_database()
 
+
+# Start the metrics side port / textfile writer once per process
+@st.cache_resource
+def start_metrics_exporter():
+    metrics.start_exporter()
+    return True
+
+start_metrics_exporter()
+
 # Session state initialization
 if 'user_id' not in st.session_state:
     st.session_state.user_id = None
@@ -137,6 +143,10 @@ def dashboard():
 
         st.markdown("---")
 
+        if config.TRACE_SHOW_SUMMARY:
+            with st.expander("⏱ Stage timings"):
+                st.code(format_summary())
+
         if st.button("Logout", type="secondary"):
             st.session_state.user_id = None
             st.session_state.username = None
@@ -238,6 +248,7 @@ def profile_page():
             st.rerun()
 
 
+@traced("page.work_experience")
 def work_experience_page():
     """Work experience management page"""
     st.title("Manage Work Experience")
@@ -287,28 +298,27 @@ def work_experience_page():
                 if not company or not job_title or not start_date:
                     st.error("Please fill in company, title, and start date")
                 else:
-                    # Add experience
+                    bullets = []
+                    for line in bullets_text.strip().split('\n'):
+                        # Remove bullet symbols
+                        cleaned = line.strip().lstrip('•-*→ ')
+                        if cleaned:
+                            bullets.append(cleaned)
+
+                    # Add experience and its bullets in one transaction
                     exp_id = db.add_work_experience(
                         st.session_state.user_id,
                         company,
                         job_title,
                         start_date,
                         end_date if not is_current else None,
-                        is_current
+                        is_current,
+                        bullets
                     )
 
-                    # Add bullets
-                    if bullets_text.strip():
-                        bullets = []
-                        for line in bullets_text.strip().split('\n'):
-                            # Remove bullet symbols
-                            cleaned = line.strip().lstrip('•-*→ ')
-                            if cleaned:
-                                bullets.append(cleaned)
-
-                        db.add_bullets_bulk(exp_id, bullets)
-
-                    st.session_state.experience_saved = f"Added {company} - {job_title}"
+                    skipped = len(bullets) - len(db.get_bullets(exp_id)) if bullets else 0
+                    st.session_state.experience_saved = f"Added {company} - {job_title}" + (
+                        f", skipped {skipped} near-duplicates" if skipped else "")
                     # Increment counter to force form recreation with empty fields
                     st.session_state.exp_form_counter = st.session_state.get('exp_form_counter', 0) + 1
                     st.rerun()
@@ -319,65 +329,96 @@ def work_experience_page():
 
     if not experiences:
         st.info("No work experience added yet. Add your first one above!")
+        return
+
+    query = st.text_input("🔍 Search bullets", key="bullet_search", placeholder="e.g. dashboards, SQL, led team")
+    if query.strip():
+        # Only the matches are rendered, not every experience and bullet
+        matches = db.search_bullets(st.session_state.user_id, query)
+        if not matches:
+            st.info("No bullets match your search")
+        for match in matches:
+            st.markdown(f"• {match['snippet']}")
+            st.caption(f"{match['company_name']} - {match['job_title']}")
     else:
         for exp in experiences:
-            with st.expander(f"📁 {exp['company_name']} - {exp['job_title']}", expanded=False):
-                st.write(f"**Dates:** {exp['start_date']} - {exp['end_date'] if exp['end_date'] else 'Present'}")
-
-                # Get bullets
-                bullets = db.get_bullets(exp['id'])
-
-                st.write(f"**Bullets:** {len(bullets)}")
-
-                if bullets:
-                    for bullet in bullets:
-                        col1, col2, col3 = st.columns([8, 1, 1])
-                        with col1:
-                            st.write(f"• {bullet['bullet_text']}")
-                        with col2:
-                            if st.button("✏️", key=f"edit_{bullet['id']}", help="Edit"):
-                                st.session_state[f"editing_{bullet['id']}"] = True
-                        with col3:
-                            if st.button("🗑️", key=f"del_{bullet['id']}", help="Delete"):
-                                db.delete_bullet(bullet['id'])
-                                st.rerun()
-
-                        # Inline edit
-                        if st.session_state.get(f"editing_{bullet['id']}", False):
-                            with st.form(f"edit_form_{bullet['id']}"):
-                                new_text = st.text_area("Edit bullet", value=bullet['bullet_text'])
-                                col_a, col_b = st.columns(2)
-                                with col_a:
-                                    if st.form_submit_button("Save"):
-                                        db.update_bullet(bullet['id'], new_text)
-                                        st.session_state[f"editing_{bullet['id']}"] = False
-                                        st.rerun()
-                                with col_b:
-                                    if st.form_submit_button("Cancel"):
-                                        st.session_state[f"editing_{bullet['id']}"] = False
-                                        st.rerun()
+            experience_fragment(exp)
+
+
+@st.fragment
+def experience_fragment(exp):
+    """
+    One experience with its bullets, rendered as an isolated fragment
+
+    Editing, deleting or adding bullets only reruns this fragment, so the other
+    experiences are neither re-rendered nor re-queried. Deleting the whole
+    experience changes the list, so that still reruns the full page.
+    """
+    with span("fragment.experience", experience_id=exp['id']):
+        with st.expander(f"📁 {exp['company_name']} - {exp['job_title']}", expanded=False):
+            # Set just before the fragment reran itself, which would have cleared it
+            bullets_added = st.session_state.pop(f"bullets_added_{exp['id']}", None)
+            if bullets_added:
+                st.success(bullets_added)
+
+            st.write(f"**Dates:** {exp['start_date']} - {exp['end_date'] if exp['end_date'] else 'Present'}")
+
+            # Get bullets
+            bullets = db.get_bullets(exp['id'])
+
+            st.write(f"**Bullets:** {len(bullets)}")
+
+            if bullets:
+                for bullet in bullets:
+                    col1, col2, col3 = st.columns([8, 1, 1])
+                    with col1:
+                        st.write(f"• {bullet['bullet_text']}")
+                    with col2:
+                        if st.button("✏️", key=f"edit_{bullet['id']}", help="Edit"):
+                            st.session_state[f"editing_{bullet['id']}"] = True
+                    with col3:
+                        if st.button("🗑️", key=f"del_{bullet['id']}", help="Delete"):
+                            db.delete_bullet(bullet['id'])
+                            st.rerun(scope="fragment")
+
+                    # Inline edit
+                    if st.session_state.get(f"editing_{bullet['id']}", False):
+                        with st.form(f"edit_form_{bullet['id']}"):
+                            new_text = st.text_area("Edit bullet", value=bullet['bullet_text'])
+                            col_a, col_b = st.columns(2)
+                            with col_a:
+                                if st.form_submit_button("Save"):
+                                    db.update_bullet(bullet['id'], new_text)
+                                    st.session_state[f"editing_{bullet['id']}"] = False
+                                    st.rerun(scope="fragment")
+                            with col_b:
+                                if st.form_submit_button("Cancel"):
+                                    st.session_state[f"editing_{bullet['id']}"] = False
+                                    st.rerun(scope="fragment")
+            else:
+                st.info("No bullets added yet")
+
+            # Add more bullets
+            with st.form(f"add_bullets_{exp['id']}"):
+                new_bullets = st.text_area("Add more bullets (one per line)", key=f"new_bullets_{exp['id']}")
+                if st.form_submit_button("Add Bullets"):
+                    if new_bullets.strip():
+                        bullets_list = [b.strip().lstrip('•-*→ ') for b in new_bullets.split('\n') if b.strip()]
+                        added = db.add_bullets_bulk(exp['id'], bullets_list)
+                        skipped = len(bullets_list) - added
+                        st.session_state[f"bullets_added_{exp['id']}"] = (
+                            f"Added {added} bullets" + (f", skipped {skipped} near-duplicates" if skipped else ""))
+                        st.rerun(scope="fragment")
+
+            # Delete experience
+            if st.button(f"🗑️ Delete Entire Experience", key=f"delete_exp_{exp['id']}", type="secondary"):
+                if st.session_state.get(f"confirm_delete_{exp['id']}", False):
+                    db.delete_work_experience(exp['id'])
+                    st.success("Deleted")
+                    st.rerun()
                 else:
-                    st.info("No bullets added yet")
-
-                # Add more bullets
-                with st.form(f"add_bullets_{exp['id']}"):
-                    new_bullets = st.text_area("Add more bullets (one per line)", key=f"new_bullets_{exp['id']}")
-                    if st.form_submit_button("Add Bullets"):
-                        if new_bullets.strip():
-                            bullets_list = [b.strip().lstrip('•-*→ ') for b in new_bullets.split('\n') if b.strip()]
-                            db.add_bullets_bulk(exp['id'], bullets_list)
-                            st.success(f"Added {len(bullets_list)} bullets")
-                            st.rerun()
-
-                # Delete experience
-                if st.button(f"🗑️ Delete Entire Experience", key=f"delete_exp_{exp['id']}", type="secondary"):
-                    if st.session_state.get(f"confirm_delete_{exp['id']}", False):
-                        db.delete_work_experience(exp['id'])
-                        st.success("Deleted")
-                        st.rerun()
-                    else:
-                        st.session_state[f"confirm_delete_{exp['id']}"] = True
-                        st.warning("Click again to confirm deletion")
+                    st.session_state[f"confirm_delete_{exp['id']}"] = True
+                    st.warning("Click again to confirm deletion")
 
 
 def target_jobs_page():
@@ -431,6 +472,8 @@ def target_jobs_page():
                         job_description
                     )
                     st.session_state.job_saved = f"Added {company} - {job_title}"
+                    # New jobs appear at the top of the first page
+                    st.session_state.jobs_page_cursors = [None]
                     # Increment counter to force form recreation with empty fields
                     st.session_state.job_form_counter = st.session_state.get('job_form_counter', 0) + 1
                     st.rerun()
@@ -440,7 +483,9 @@ def target_jobs_page():
                     st.error("Please provide a job URL to scrape")
                 else:
                     with st.spinner("Scraping job description..."):
-                        description = scrape_job_description(job_url)
+                        from web_scraper import scrape_job_description
+
+                        description = scrape_job_description(job_url, db, st.session_state.user_id)
                         if description:
                             # Add job with scraped description
                             job_id = db.add_target_job(
@@ -451,6 +496,8 @@ def target_jobs_page():
                                 description
                             )
                             st.session_state.job_saved = f"Scraped and added job! ({len(description)} characters)"
+                            # New jobs appear at the top of the first page
+                            st.session_state.jobs_page_cursors = [None]
                             # Increment counter to force form recreation with empty fields
                             st.session_state.job_form_counter = st.session_state.get('job_form_counter', 0) + 1
                             st.rerun()
@@ -461,9 +508,18 @@ def target_jobs_page():
     st.markdown("---")
     st.subheader("Your Target Jobs")
 
-    jobs = db.get_target_jobs(st.session_state.user_id)
+    # Keyset pagination: a stack of cursors, one per page already visited
+    if 'jobs_page_cursors' not in st.session_state:
+        st.session_state.jobs_page_cursors = [None]
 
-    if not jobs:
+    page = db.get_target_job_summaries(
+        st.session_state.user_id,
+        limit=JOBS_PAGE_SIZE,
+        before=st.session_state.jobs_page_cursors[-1]
+    )
+    jobs = page['jobs']
+
+    if not jobs and len(st.session_state.jobs_page_cursors) == 1:
         st.info("No target jobs added yet. Add your first one above!")
     else:
         for job in jobs:
@@ -471,16 +527,26 @@ def target_jobs_page():
                 st.write(f"**URL:** {job['job_url'] or 'N/A'}")
                 st.write(f"**Added:** {job['date_added']}")
 
-                if job['job_description']:
-                    st.write(f"**Description:** ({len(job['job_description'])} characters)")
-                    with st.container():
+                if job['description_length']:
+                    st.write(f"**Description:** ({job['description_length']} characters)")
+
+                    # Full text is only fetched when asked for
+                    if st.session_state.get(f"show_full_desc_{job['id']}"):
+                        full_job = db.get_target_job(job['id'])
                         st.text_area(
                             "Job Description",
-                            value=job['job_description'][:500] + "..." if len(job['job_description']) > 500 else job['job_description'],
-                            height=150,
+                            value=full_job['job_description'],
+                            height=300,
                             key=f"desc_{job['id']}",
                             disabled=True
                         )
+                    else:
+                        preview = job['description_preview']
+                        st.text(preview + "..." if job['description_length'] > 500 else preview)
+                        if job['description_length'] > 500:
+                            if st.button("Show full description", key=f"show_desc_{job['id']}"):
+                                st.session_state[f"show_full_desc_{job['id']}"] = True
+                                st.rerun()
                 else:
                     st.warning("No job description available")
 
@@ -489,6 +555,18 @@ def target_jobs_page():
                     st.success("Deleted")
                     st.rerun()
 
+        col_prev, col_page, col_next = st.columns([1, 2, 1])
+        with col_prev:
+            if len(st.session_state.jobs_page_cursors) > 1 and st.button("← Newer"):
+                st.session_state.jobs_page_cursors.pop()
+                st.rerun()
+        with col_page:
+            st.caption(f"Page {len(st.session_state.jobs_page_cursors)}")
+        with col_next:
+            if page['next_cursor'] and st.button("Older →"):
+                st.session_state.jobs_page_cursors.append(page['next_cursor'])
+                st.rerun()
+
 
 def generate_resumes_page():
     """Resume generation page"""
@@ -497,7 +575,12 @@ def generate_resumes_page():
     # Check if profile is complete
     profile = db.get_profile(st.session_state.user_id)
     experiences = db.get_work_experiences(st.session_state.user_id)
-    target_jobs = db.get_target_jobs(st.session_state.user_id)
+    # Only names and ids are needed for the picker; follow the pages without loading descriptions
+    page = db.get_target_job_summaries(st.session_state.user_id, limit=100)
+    target_jobs = page['jobs']
+    while page['next_cursor']:
+        page = db.get_target_job_summaries(st.session_state.user_id, limit=100, before=page['next_cursor'])
+        target_jobs.extend(page['jobs'])
 
     # Validation
     warnings = []
@@ -575,6 +658,17 @@ def show_review_interface():
         generated_bullets = st.session_state.generated_bullets
 
         st.write(f"**Target Job:** {job['company_name']} - {job['job_title']}")
+        if st.session_state.get('jd_tokens_saved'):
+            st.caption(f"Trimmed job description boilerplate: ~{st.session_state.jd_tokens_saved} prompt tokens saved")
+        prior = st.session_state.get('prior_generation')
+        if prior:
+            prior_job = db.get_target_job(prior['job_id'])
+            source = f"{prior_job['company_name']} - {prior_job['job_title']}" if prior_job else "an earlier job"
+            if prior['calls_avoided']:
+                st.caption(f"Reused your bullets for {source} ({prior['similarity']:.0%} similar): "
+                           f"{prior['calls_avoided']} AI call(s) avoided")
+            else:
+                st.caption(f"Started from your bullets for {source} ({prior['similarity']:.0%} similar)")
         st.markdown("---")
 
         # Create editable fields for each experience's bullets
@@ -599,6 +693,32 @@ def show_review_interface():
         # Store edited bullets in session state
         st.session_state.edited_bullets = edited_bullets
 
+        from resume_renderer import DEFAULT_TEMPLATE, RESUME_TEMPLATES
+
+        template_names = list(RESUME_TEMPLATES)
+        st.session_state.resume_template = st.selectbox(
+            "Resume template",
+            template_names,
+            index=template_names.index(st.session_state.get('resume_template', DEFAULT_TEMPLATE)),
+            format_func=lambda name: RESUME_TEMPLATES[name]
+        )
+
+        from resume_service import similar_jobs
+
+        # Near-identical postings can take the same bullets without more LLM calls
+        siblings = similar_jobs(db, st.session_state.user_id, job['id'])
+        if siblings:
+            sibling_names = {sibling['id']: f"{sibling['company_name']} - {sibling['job_title']}" for sibling in siblings}
+            st.session_state.similar_job_ids = st.multiselect(
+                "Also create resumes for similar postings",
+                list(sibling_names),
+                default=[job_id for job_id in st.session_state.get('similar_job_ids', []) if job_id in sibling_names],
+                format_func=sibling_names.get
+            )
+
+        if not warmup.is_pdf_renderer_ready():
+            st.caption("The PDF renderer is still starting up; your first PDF may take a few seconds longer.")
+
         # Action buttons
         col1, col2, col3 = st.columns([1, 1, 2])
 
@@ -618,6 +738,8 @@ def show_review_interface():
                     del st.session_state.generated_bullets
                 if 'edited_bullets' in st.session_state:
                     del st.session_state.edited_bullets
+                if 'similar_job_ids' in st.session_state:
+                    del st.session_state.similar_job_ids
                 st.rerun()
 
     elif st.session_state.generation_stage == 'finalizing':
@@ -625,6 +747,7 @@ def show_review_interface():
         finalize_resume()
 
 
+@traced("generate_initial_bullets")
 def generate_initial_bullets():
     """Generate initial bullets using AI"""
     job_id = st.session_state.generating_for_job
@@ -637,41 +760,31 @@ def generate_initial_bullets():
         st.session_state.generation_stage = None
         return
 
-    # Get user profile and experiences
-    experiences = db.get_work_experiences(st.session_state.user_id)
-
-    # Build bullet bank
-    bullet_bank = {}
-    for exp in experiences:
-        bullets = db.get_bullets(exp['id'])
-        bullet_bank[exp['id']] = {
-            'company': exp['company_name'],
-            'title': exp['job_title'],
-            'bullets': [b['bullet_text'] for b in bullets]
-        }
+    from llm_processor_web import ResumeOptimizer
+    from resume_service import generate_tailored_bullets
 
     # Initialize AI processor
     optimizer = ResumeOptimizer(config.ANTHROPIC_API_KEY)
 
-    # Generate bullets for each experience
-    generated_bullets = {}
-    for exp_id, exp_data in bullet_bank.items():
-        # Use AI to select and tailor bullets
-        selected_bullets = optimizer.generate_bullets(
-            job_description=job['job_description'],
-            experience_bullets=exp_data['bullets'],
-            target_count=5,
-            context=f"Position: {exp_data['title']} at {exp_data['company']}"
-        )
-        generated_bullets[exp_id] = selected_bullets
+    # Select and tailor bullets for each experience
+    generated_bullets, trimmed, prior = generate_tailored_bullets(
+        db, optimizer, st.session_state.user_id, job, target_count=5
+    )
 
     # Store in session state
     st.session_state.generated_bullets = generated_bullets
+    # Reused experiences never sent the job description, so they saved nothing
+    llm_calls = len(generated_bullets) - (prior['calls_avoided'] if prior else 0)
+    st.session_state.jd_tokens_saved = trimmed.tokens_saved * llm_calls
+    st.session_state.prior_generation = prior
 
 
 def finalize_resume():
     """Create final PDF with edited bullets"""
-    with st.spinner("Creating your resume PDF..."):
+    from resume_renderer import DEFAULT_TEMPLATE
+    from resume_service import ResumeLimitReached, create_resume
+
+    with st.spinner("Creating your resume PDF..."), span("finalize_resume"):
         try:
             job_id = st.session_state.generating_for_job
             edited_bullets = st.session_state.edited_bullets
@@ -679,73 +792,65 @@ def finalize_resume():
             # Get job details
             job = db.get_target_job(job_id)
 
-            # Get user profile and experiences
-            profile = db.get_profile(st.session_state.user_id)
-            experiences = db.get_work_experiences(st.session_state.user_id)
-
-            # Create custom HTML with user's profile and edited bullets
-            html_content = build_resume_html(profile, experiences, edited_bullets)
-
-            # Save HTML
-            output_filename = generate_output_filename(job['company_name'])
-            output_dir = "output"
-            os.makedirs(output_dir, exist_ok=True)
-
-            html_path = os.path.join(output_dir, f"{output_filename}.html")
-            pdf_path = os.path.join(output_dir, f"{output_filename}.pdf")
-
-            with open(html_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
-
-            # Generate PDF
+            # Render HTML and PDF, then save the resume and count it
             st.write("Converting to PDF...")
             try:
-                from xhtml2pdf import pisa
-
-                # Open the PDF file
-                with open(pdf_path, "wb") as pdf_file:
-                    # Convert HTML to PDF
-                    pisa_status = pisa.CreatePDF(
-                        html_content,
-                        dest=pdf_file
-                    )
-
-                # Check if PDF was created successfully
-                success = not pisa_status.err
+                resume = create_resume(
+                    db, st.session_state.user_id, job, edited_bullets,
+                    template=st.session_state.get('resume_template', DEFAULT_TEMPLATE)
+                )
 
-                if not success:
+                if resume is None:
                     st.error("PDF generation encountered errors.")
+            except ResumeLimitReached:
+                st.error("You've reached your resume generation limit.")
+                resume = None
             except Exception as pdf_error:
                 st.error(f"PDF generation error: {str(pdf_error)}")
                 st.error("Please contact administrator if this issue persists.")
-                success = False
-
-            if success:
-                # Save to database
-                import json
-                db.save_generated_resume(
-                    st.session_state.user_id,
-                    job_id,
-                    json.dumps(edited_bullets),
-                    html_content,
-                    output_filename
-                )
-
-                # Increment resume count
-                db.increment_resume_count(st.session_state.user_id)
+                resume = None
 
+            if resume:
                 st.success("✅ Resume generated successfully!")
+                if resume['dropped_bullets']:
+                    st.info(f"Dropped {resume['dropped_bullets']} lowest-ranked bullet(s) to fit the resume on one page.")
+                elif resume['pages'] > 1:
+                    st.warning(f"The resume runs to {resume['pages']} pages.")
 
                 # Offer download
-                with open(pdf_path, 'rb') as f:
+                with open(resume['pdf_path'], 'rb') as f:
                     st.download_button(
                         label="📥 Download Resume PDF",
                         data=f.read(),
-                        file_name=f"{output_filename}.pdf",
+                        file_name=f"{resume['filename']}.pdf",
                         mime="application/pdf",
                         type="primary"
                     )
 
+                # Same bullets for the similar postings picked on the review screen
+                for other_id in st.session_state.get('similar_job_ids', []):
+                    other_job = db.get_target_job(other_id)
+                    if other_job is None:
+                        # Deleted since the review screen was shown
+                        continue
+                    try:
+                        other = create_resume(
+                            db, st.session_state.user_id, other_job, edited_bullets,
+                            template=st.session_state.get('resume_template', DEFAULT_TEMPLATE)
+                        )
+                    except ResumeLimitReached:
+                        st.warning("Resume limit reached before every similar posting was covered.")
+                        break
+                    if other:
+                        with open(other['pdf_path'], 'rb') as f:
+                            st.download_button(
+                                label=f"📥 {other_job['company_name']} - {other_job['job_title']}",
+                                data=f.read(),
+                                file_name=f"{other['filename']}.pdf",
+                                mime="application/pdf",
+                                key=f"download_similar_{other_id}"
+                            )
+
                 # Clear generation state after successful download button shown
                 if 'generating_for_job' in st.session_state:
                     del st.session_state.generating_for_job
@@ -755,152 +860,28 @@ def finalize_resume():
                     del st.session_state.generated_bullets
                 if 'edited_bullets' in st.session_state:
                     del st.session_state.edited_bullets
+                if 'similar_job_ids' in st.session_state:
+                    del st.session_state.similar_job_ids
 
             else:
                 st.error("Failed to generate PDF. Please check the logs.")
 
+            trace_logger.info(format_summary())
+
         except Exception as e:
             st.error(f"Error generating resume: {str(e)}")
             import traceback
             st.code(traceback.format_exc())
 
 
-def build_resume_html(profile, experiences, generated_bullets):
-    """Build complete HTML resume with professional formatting"""
-    html = f"""<!DOCTYPE html>
-<html>
-<head>
-    <meta charset="UTF-8">
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            margin: 40px;
-            line-height: 1.4;
-            color: #333;
-        }}
-
-        /* Name - Largest */
-        h1 {{
-            text-align: center;
-            margin: 0 0 8px 0;
-            font-size: 24px;
-            font-weight: bold;
-        }}
-
-        /* Contact info - Medium (same as section headers) */
-        .contact {{
-            text-align: center;
-            margin: 0 0 20px 0;
-            font-size: 12px;
-            line-height: 1.3;
-        }}
-
-        /* Section headers - Medium */
-        h2 {{
-            font-size: 12px;
-            font-weight: bold;
-            border-bottom: 1px solid #333;
-            padding-bottom: 3px;
-            margin: 16px 0 8px 0;
-            text-transform: uppercase;
-        }}
-
-        /* Job section */
-        .job {{
-            margin-bottom: 12px;
-        }}
-
-        /* Company name - bold, small text */
-        .company {{
-            font-weight: bold;
-            font-size: 11px;
-            margin: 0 0 2px 0;
-            line-height: 1.2;
-        }}
-
-        /* Job title - small text */
-        .title {{
-            font-size: 11px;
-            margin: 0 0 2px 0;
-            line-height: 1.2;
-        }}
-
-        /* Dates - small text, italic */
-        .dates {{
-            font-size: 11px;
-            font-style: italic;
-            margin: 0 0 4px 0;
-            line-height: 1.2;
-        }}
-
-        /* Bullets - Small text */
-        ul {{
-            margin: 0 0 0 0;
-            padding-left: 18px;
-        }}
-
-        li {{
-            font-size: 11px;
-            margin: 0 0 3px 0;
-            line-height: 1.3;
-        }}
-
-        /* Education and Skills content - Small text */
-        .content {{
-            font-size: 11px;
-            margin: 4px 0;
-            line-height: 1.3;
-        }}
-
-        .edu-item {{
-            margin: 4px 0;
-        }}
-    </style>
-</head>
-<body>
-    <h1>{profile['full_name'] or 'Your Name'}</h1>
-    <div class="contact">
-        {profile['email'] or ''} | {profile['phone'] or ''} | {profile['linkedin_url'] or ''} | {profile['location'] or ''}
-    </div>
-
-    <h2>Professional Experience</h2>
-"""
-
-    # Add experience (now comes first)
-    for exp in experiences:
-        bullets_html = ""
-        if exp['id'] in generated_bullets:
-            for bullet in generated_bullets[exp['id']]:
-                bullets_html += f"        <li>{bullet}</li>\n"
-
-        html += f"""    <div class="job">
-        <div class="company">{exp['company_name']}</div>
-        <div class="title">{exp['job_title']}</div>
-        <div class="dates">{exp['start_date']} - {exp['end_date'] if exp['end_date'] else 'Present'}</div>
-        <ul>
-{bullets_html}        </ul>
-    </div>
-"""
-
-    # Add education (now comes after experience)
-    html += "\n    <h2>Education</h2>\n"
-    for edu in profile.get('education', []):
-        html += f'    <div class="content edu-item"><strong>{edu["degree"]}</strong> - {edu["school"]} ({edu["year"]})</div>\n'
-
-    # Add skills
-    html += "\n    <h2>Skills</h2>\n"
-    html += f'    <div class="content">{", ".join(profile.get("skills", []))}</div>\n'
-
-    html += "</body>\n</html>"
-
-    return html
-
-
 def generated_resumes_page():
     """View generated resumes"""
     st.title("My Generated Resumes")
 
+    from resume_renderer import download_filename
+
     resumes = db.get_user_resumes(st.session_state.user_id)
+    profile = db.get_profile(st.session_state.user_id)
 
     if not resumes:
         st.info("No resumes generated yet. Go to 'Generate Resumes' to create your first one!")
@@ -908,13 +889,14 @@ def generated_resumes_page():
         for resume in resumes:
             with st.expander(f"📄 {resume['company_name']} - {resume['job_title']} (Created: {resume['created_at']})", expanded=False):
                 pdf_path = f"output/{resume['pdf_filename']}.pdf"
+                name = download_filename((profile or {}).get('full_name'), resume['company_name'], resume['created_at'])
 
                 if os.path.exists(pdf_path):
                     with open(pdf_path, 'rb') as f:
                         st.download_button(
                             label="📥 Download PDF",
                             data=f.read(),
-                            file_name=f"{resume['pdf_filename']}.pdf",
+                            file_name=f"{name}.pdf",
                             mime="application/pdf",
                             key=f"download_{resume['id']}"
                         )
@@ -923,12 +905,22 @@ def generated_resumes_page():
 
 
 # Main app logic
+# Import the heavy modules and warm the PDF renderer in the background once the
+# first page is on screen
+@st.cache_resource
+def start_warmup():
+    warmup.start_warmup()
+    return True
+
+
 def main():
     if st.session_state.user_id is None:
         login_page()
     else:
         dashboard()
 
+    start_warmup()
+
 
 if __name__ == "__main__":
     main()
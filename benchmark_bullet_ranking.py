@@ -0,0 +1,76 @@
+"""
+Time ranking a whole bullet bank against many target jobs with local embeddings
+
+Seeds a throwaway database with a bullet bank (vectors are computed as bullets
+are added), then ranks every bullet against every job: one query for the stored
+bullet vectors, one embedding pass over the job descriptions and one matrix product.
+
+Usage:
+    python benchmark_bullet_ranking.py --bullets 1000 --jobs 50
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+import embeddings
+from benchmark_bullet_import import make_bullet
+from database import Database
+from resume_service import rank_bullets
+
+SKILLS = ("SQL", "Python", "Tableau", "forecasting", "stakeholder management", "A/B testing", "Spark",
+          "vendor negotiation", "budgeting", "dbt", "Looker", "people management", "pricing", "ETL")
+
+
+def make_job_description(rng: random.Random) -> str:
+    skills = ", ".join(rng.sample(SKILLS, 5))
+    duties = "\n".join(f"- {make_bullet(rng)}" for _ in range(8))
+    return f"Senior Analyst\nResponsibilities:\n{duties}\nRequirements:\n- Experience with {skills}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--bullets", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    jobs = [make_job_description(rng) for _ in range(args.jobs)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "ranking.db"))
+        user_id = db.create_user("benchmark", "benchmark")
+        exp_id = db.add_work_experience(user_id, "Company", "Analyst", "January 2020", None, True)
+        texts = [make_bullet(rng) for _ in range(args.bullets)]
+        start = time.perf_counter()
+        db.add_bullets_bulk(exp_id, texts, skip_duplicates=False)
+        insert_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        embeddings.embed(texts)
+        embed_ms = (time.perf_counter() - start) * 1000
+
+        timings = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            rank_bullets(db, user_id, jobs)
+            timings.append((time.perf_counter() - start) * 1000)
+
+        bullets, vectors = db.get_bullet_vectors(user_id)
+        job_vectors = embeddings.embed(jobs)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            embeddings.similarity(vectors, job_vectors)
+        product_ms = (time.perf_counter() - start) * 1000 / args.runs
+
+    timings.sort()
+    print(f"Bullets x jobs:             {len(bullets)} x {args.jobs}")
+    print(f"Add bullets (with vectors): {insert_ms:.1f} ms, of which embedding ~{embed_ms:.1f} ms")
+    print(f"Rank all, p50:              {timings[len(timings) // 2]:.1f} ms")
+    print(f"  similarity matrix only:   {product_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""
+First PDF latency in a fresh process, with and without the renderer warm-up
+
+Starts a new interpreter for each case and times the first fit_resume call (HTML,
+layout estimate and xhtml2pdf conversion) for a 5-experience resume:
+
+- cold: the first render also imports xhtml2pdf/reportlab and sets up fonts
+- warm: warmup.start_warmup() ran at process start and the render waits for
+  is_pdf_renderer_ready() first, as a user arriving after start-up would
+
+Usage:
+    python benchmark_first_render.py --runs 3
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import time
+import warmup
+from benchmark_resume_render import PROFILE, make_experiences
+if {warm}:
+    warmup.start_warmup(modules=("resume_service",))
+    warmup.wait_for_pdf_renderer()
+from resume_renderer import fit_resume
+experiences, bullets = make_experiences(5, 5)
+start = time.perf_counter()
+fit_resume(PROFILE, experiences, bullets)
+print((time.perf_counter() - start) * 1000)
+"""
+
+
+def first_render_ms(warm: bool) -> float:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD.format(warm=warm)],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    cold = [first_render_ms(warm=False) for _ in range(args.runs)]
+    warm = [first_render_ms(warm=True) for _ in range(args.runs)]
+
+    print(f"First PDF, cold process (median of {args.runs}):  {statistics.median(cold):.0f} ms")
+    print(f"First PDF, after warm-up (median of {args.runs}): {statistics.median(warm):.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Offline throughput benchmark for the bullet generation pipeline
+
+Runs concurrent resume generations against a throwaway database using the fake
+LLM backend, so no API calls are made.
+
+Usage:
+    python benchmark_generation.py --resumes 50 --workers 8 --latency 1.5
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from database import Database
+from llm_backends import FakeBackend
+from llm_processor_web import ResumeOptimizer
+from resume_service import generate_tailored_bullets
+
+JOB_DESCRIPTION = """Senior Data Analyst
+Responsibilities:
+- Build dashboards and models in Python and SQL
+- Partner with product teams on experimentation
+Requirements:
+- 5+ years of analytics experience
+- Strong communication skills"""
+
+
+def seed_database(db: Database, experiences: int, bullets_per_experience: int) -> int:
+    """Create a user with a full bullet bank and one target job"""
+    user_id = db.create_user("benchmark", "benchmark")
+    for i in range(experiences):
+        exp_id = db.add_work_experience(user_id, f"Company {i}", "Analyst", "January 2020", None, i == 0)
+        # The templated bullets are near-duplicates of each other; keep them all
+        db.add_bullets_bulk(exp_id, [
+            f"Delivered analytics project {j} that improved KPI {j} by {j + 10}%"
+            for j in range(bullets_per_experience)
+        ], skip_duplicates=False)
+    db.add_target_job(user_id, "Target Co", "Senior Data Analyst", None, JOB_DESCRIPTION)
+    return user_id
+
+
+def generate_resume(db: Database, optimizer: ResumeOptimizer, user_id: int) -> float:
+    """Run one generation the same way app.generate_initial_bullets does"""
+    start = time.perf_counter()
+    job = db.get_target_jobs(user_id)[0]
+    generate_tailored_bullets(db, optimizer, user_id, job, target_count=5)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--experiences", type=int, default=3)
+    parser.add_argument("--bullets", type=int, default=15)
+    parser.add_argument("--latency", type=float, default=1.5, help="mean LLM latency in seconds")
+    parser.add_argument("--stddev", type=float, default=0.5, help="LLM latency standard deviation")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "benchmark.db"))
+        user_id = seed_database(db, args.experiences, args.bullets)
+
+        backend = FakeBackend(
+            latency_mean=args.latency,
+            latency_stddev=args.stddev,
+            error_rate=args.error_rate,
+            seed=args.seed
+        )
+        optimizer = ResumeOptimizer(api_key="", backend=backend)
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            durations = list(pool.map(lambda _: generate_resume(db, optimizer, user_id), range(args.resumes)))
+        elapsed = time.perf_counter() - start
+
+    durations.sort()
+    print(f"Resumes:     {args.resumes} ({args.experiences} LLM calls each, {args.workers} workers)")
+    print(f"LLM calls:   {backend.call_count}")
+    print(f"Wall time:   {elapsed:.2f}s")
+    print(f"Throughput:  {args.resumes / elapsed:.2f} resumes/s")
+    print(f"Latency p50: {statistics.median(durations):.2f}s")
+    print(f"Latency p95: {durations[int(0.95 * (len(durations) - 1))]:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Startup import time for app.py
+
+Runs a fresh interpreter with `python -X importtime` over the modules app.py imports
+at top level and reports where the time goes, largest first. Exits non-zero if a
+heavy dependency (scraper, LLM SDK, PDF renderer, templating, NumPy) is loaded at startup,
+or if the app's own imports after Streamlit exceed --max-ms.
+
+Usage:
+    python benchmark_import_time.py --max-ms 100
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+# Imported on first use or by warmup.py, never while app.py starts
+HEAVY_DEPENDENCIES = ("requests", "bs4", "anthropic", "xhtml2pdf", "reportlab", "jinja2", "numpy")
+
+
+def startup_modules(app_path: str = APP_PATH) -> List[str]:
+    """Modules imported at the top level of app.py, in order"""
+    with open(app_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return modules
+
+
+def measure(modules: List[str]) -> Tuple[Dict[str, int], List[str]]:
+    """
+    Import modules in a fresh interpreter
+
+    Returns:
+        (cumulative microseconds per top-level import, heavy dependencies loaded)
+    """
+    code = (
+        "import sys\n"
+        + "".join(f"import {name}\n" for name in modules)
+        + f"print(','.join(name for name in {HEAVY_DEPENDENCIES!r} if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(APP_PATH), check=True
+    )
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, total, name = line.split("|")
+        # Only top-level entries (no indent) are imports the snippet made itself
+        if total.strip().isdigit() and not name.startswith("  "):
+            cumulative[name.strip()] = int(total)
+
+    loaded = [name for name in result.stdout.strip().split(",") if name]
+    return cumulative, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--max-ms", type=float, default=None,
+                        help="fail if app imports after streamlit take longer than this")
+    args = parser.parse_args()
+
+    modules = startup_modules()
+    cumulative, loaded = measure(modules)
+
+    print(f"{'module':<28} {'cumulative ms':>14}")
+    for name, micros in sorted(cumulative.items(), key=lambda item: -item[1]):
+        if name not in modules:
+            continue
+        print(f"{name:<28} {micros / 1000:>14.1f}")
+
+    streamlit_ms = cumulative.get("streamlit", 0) / 1000
+    app_ms = sum(micros for name, micros in cumulative.items() if name in modules and name != "streamlit") / 1000
+    print(f"\nStreamlit:                  {streamlit_ms:.1f} ms")
+    print(f"App imports after it:       {app_ms:.1f} ms")
+
+    failed = False
+    if loaded:
+        print(f"Heavy dependencies loaded at startup: {', '.join(loaded)}")
+        failed = True
+    if args.max_ms is not None and app_ms > args.max_ms:
+        print(f"App imports exceed the {args.max_ms:.0f} ms budget")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
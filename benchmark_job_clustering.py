@@ -0,0 +1,65 @@
+"""
+Time grouping thousands of target jobs into near-identical postings
+
+Generates job descriptions where every few jobs share a role (the same duties
+and requirements posted by different companies with small wording changes),
+embeds them and clusters them in blocks with job_clustering.cluster.
+
+Usage:
+    python benchmark_job_clustering.py --jobs 5000 --repost 4
+"""
+import argparse
+import random
+import time
+
+import config
+import embeddings
+import job_clustering
+from benchmark_bullet_ranking import make_job_description
+from token_budget import trim_job_description
+
+COMPANIES = ("Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka")
+
+
+def make_postings(rng: random.Random, jobs: int, repost: int):
+    """Each generated role is posted up to repost times, with the company and one duty changed"""
+    postings = []
+    while len(postings) < jobs:
+        role = make_job_description(rng)
+        for _ in range(rng.randint(1, repost)):
+            lines = role.split("\n")
+            lines[rng.randrange(2, 10)] = "- Other duties as assigned"
+            postings.append(f"About {rng.choice(COMPANIES)}\n" + "\n".join(lines))
+    return postings[:jobs]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--jobs", type=int, default=5000)
+    parser.add_argument("--repost", type=int, default=4, help="Most postings per role")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    postings = make_postings(random.Random(11), args.jobs, args.repost)
+
+    start = time.perf_counter()
+    vectors = embeddings.embed([trim_job_description(text, config.JOB_DESCRIPTION_TOKEN_BUDGET).text
+                                for text in postings])
+    embed_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(args.runs):
+        start = time.perf_counter()
+        groups = job_clustering.cluster(vectors)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    timings.sort()
+    grouped = sum(len(group) for group in groups)
+    print(f"Jobs:                  {len(postings)}")
+    print(f"Trim and embed:        {embed_ms:.1f} ms")
+    print(f"Cluster, p50:          {timings[len(timings) // 2]:.1f} ms")
+    print(f"Groups:                {len(groups)} covering {grouped} jobs (largest {len(groups[0]) if groups else 0})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compare site-specific extraction with the generic selectors on saved job board pages
+
+For each page in fixtures/job_pages, times extract_description with and without
+job_extractors and reports the extracted length, which is roughly what the page
+costs in prompt tokens (see token_budget.estimate_tokens).
+
+Usage:
+    python benchmark_job_extractors.py --runs 50
+"""
+import argparse
+import glob
+import os
+import re
+import time
+
+from token_budget import estimate_tokens
+from web_scraper import extract_description
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "job_pages")
+
+
+def time_extraction(content: bytes, url: str, site_extractors: bool, runs: int):
+    start = time.perf_counter()
+    for _ in range(runs):
+        text = extract_description(content, url, site_extractors)
+    return text, (time.perf_counter() - start) * 1000 / runs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--runs", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{'Page':<22}{'site chars':>11}{'tokens':>8}{'ms':>7}   {'generic chars':>13}{'tokens':>8}{'ms':>7}")
+    for path in sorted(glob.glob(os.path.join(FIXTURES, "*.html"))):
+        with open(path, "rb") as f:
+            content = f.read()
+        url = re.search(rb'rel="canonical" href="([^"]+)"', content).group(1).decode()
+
+        site, site_ms = time_extraction(content, url, True, args.runs)
+        generic, generic_ms = time_extraction(content, url, False, args.runs)
+        print(f"{os.path.basename(path):<22}{len(site):>11}{estimate_tokens(site):>8}{site_ms:>7.2f}   "
+              f"{len(generic):>13}{estimate_tokens(generic):>8}{generic_ms:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
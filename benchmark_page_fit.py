@@ -0,0 +1,82 @@
+"""
+Renders needed to fit generated resumes on one page
+
+Builds resumes of random size (2-6 experiences, 3-8 bullets of 8-30 words) and runs
+the one-page fit loop on each, reporting how many PDF renders it took, how often
+the result still spilled onto a second page and how many bullets were dropped.
+The layout estimator is what keeps most resumes at a single render.
+
+Usage:
+    python benchmark_page_fit.py --resumes 50 --template classic
+"""
+import argparse
+import random
+import time
+from collections import Counter
+
+from resume_renderer import DEFAULT_TEMPLATE, RESUME_TEMPLATES, fit_resume
+
+WORDS = (
+    "delivered analytics project improved forecasting accuracy for stakeholder dashboards "
+    "using Python SQL and Tableau to grow revenue pipeline while reducing costs through "
+    "automated reporting and leading a cross-functional team of analysts"
+).split()
+
+PROFILE = {
+    'full_name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'phone': '555-0100',
+    'linkedin_url': 'linkedin.com/in/janedoe',
+    'location': 'Austin, TX',
+    'education': [{'degree': 'B.S. Statistics', 'school': 'University of Texas', 'year': '2015'}],
+    'skills': ['SQL', 'Python', 'Tableau', 'Experimentation', 'Forecasting'],
+}
+
+
+def make_resume(rng: random.Random):
+    experiences, bullets = [], {}
+    for i in range(rng.randint(2, 6)):
+        experiences.append({
+            'id': i,
+            'company_name': f"Company {i}",
+            'job_title': 'Senior Analyst',
+            'start_date': 'January 2020',
+            'end_date': None,
+        })
+        bullets[i] = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 30))).capitalize()
+            for _ in range(rng.randint(3, 8))
+        ]
+    return experiences, bullets
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--resumes", type=int, default=50)
+    parser.add_argument("--template", choices=list(RESUME_TEMPLATES), default=DEFAULT_TEMPLATE)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    renders = Counter()
+    overflow = dropped = 0
+
+    start = time.perf_counter()
+    for _ in range(args.resumes):
+        experiences, bullets = make_resume(rng)
+        result = fit_resume(PROFILE, experiences, bullets, args.template)
+        renders[result['renders']] += 1
+        overflow += result['pages'] > 1
+        dropped += result['dropped_bullets']
+    elapsed = time.perf_counter() - start
+
+    print(f"Resumes:              {args.resumes} ({args.template})")
+    for count in sorted(renders):
+        print(f"  {count} render(s):        {renders[count]}")
+    print(f"Still over one page:  {overflow}")
+    print(f"Bullets dropped:      {dropped}")
+    print(f"Mean time per resume: {elapsed * 1000 / args.resumes:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Resume HTML build time per template, and repeat finalization cost
+
+Times build_resume_html for growing numbers of experiences with each of the
+precompiled Jinja2 templates. Templates are compiled once at import, so each call
+only pays for rendering the context.
+
+Then times fit_resume (HTML, layout estimate and PDF) the way the review flow uses
+it: a cold first finalization, a second one after editing a single bullet and a
+third with nothing changed.
+
+Usage:
+    python benchmark_resume_render.py --max-experiences 20 --bullets 5 --runs 200
+"""
+import argparse
+import time
+
+from resume_renderer import RESUME_TEMPLATES, build_resume_html, clear_render_caches, fit_resume
+
+PROFILE = {
+    'full_name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'phone': '555-0100',
+    'location': 'Austin, TX',
+    'linkedin_url': 'linkedin.com/in/janedoe',
+    'education': [{'degree': 'B.S. Statistics', 'school': 'University of Texas', 'year': '2015'}],
+    'skills': ['SQL', 'Python', 'Tableau', 'Experimentation'],
+}
+
+
+def make_experiences(count: int, bullets: int):
+    experiences = []
+    generated = {}
+    for i in range(count):
+        experiences.append({
+            'id': i,
+            'company_name': f"Company {i} & Partners",
+            'job_title': 'Senior Analyst',
+            'start_date': 'January 2020',
+            'end_date': None,
+            'is_current': i == 0,
+        })
+        generated[i] = [
+            f"Delivered analytics project {j} that improved KPI {j} by {j + 10}%"
+            for j in range(bullets)
+        ]
+    return experiences, generated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--max-experiences", type=int, default=20)
+    parser.add_argument("--bullets", type=int, default=5)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'experiences':>11} " + " ".join(f"{name + ' ms':>12}" for name in RESUME_TEMPLATES))
+    for count in sorted({1, 5, 10, args.max_experiences}):
+        experiences, generated = make_experiences(count, args.bullets)
+        row = []
+        for template in RESUME_TEMPLATES:
+            start = time.perf_counter()
+            for _ in range(args.runs):
+                # Measure a cold build, not the memoized sections
+                clear_render_caches()
+                build_resume_html(PROFILE, experiences, generated, template)
+            row.append((time.perf_counter() - start) * 1000 / args.runs)
+        print(f"{count:>11} " + " ".join(f"{ms:>12.3f}" for ms in row))
+
+    experiences, generated = make_experiences(6, args.bullets)
+    edited = dict(generated)
+    edited[3] = generated[3][:-1] + ["Rewrote one bullet during review"]
+    print()
+    print(f"{'finalize (6 experiences)':<26} " + " ".join(f"{name + ' ms':>12}" for name in RESUME_TEMPLATES))
+    timings = {"cold": [], "one bullet edited": [], "unchanged": []}
+    # Keep the one-off xhtml2pdf import out of the "cold" timing
+    fit_resume(PROFILE, experiences[:1], generated)
+    for template in RESUME_TEMPLATES:
+        clear_render_caches()
+        for label, bullets in (("cold", generated), ("one bullet edited", edited), ("unchanged", edited)):
+            start = time.perf_counter()
+            fit_resume(PROFILE, experiences, bullets, template)
+            timings[label].append((time.perf_counter() - start) * 1000)
+    for label, row in timings.items():
+        print(f"{label:<26} " + " ".join(f"{ms:>12.1f}" for ms in row))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Simulate many users scraping a few job boards through the per-host scheduler
+
+No network: each fetch sleeps for a sampled latency while holding its slot.
+One "bulk" user queues many URLs for the busiest board at once while the other
+users each queue a few, so the report shows throughput, the highest concurrency
+any host saw and how long the light users waited behind the bulk import.
+
+Usage:
+    python benchmark_scrape_scheduler.py --hosts 4 --users 8 --bulk 40 --latency 0.2
+"""
+import argparse
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scrape_scheduler import HostScheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--hosts", type=int, default=4)
+    parser.add_argument("--users", type=int, default=8, help="light users, 3 URLs each")
+    parser.add_argument("--bulk", type=int, default=40, help="URLs the bulk user queues for the first host")
+    parser.add_argument("--latency", type=float, default=0.2, help="mean fetch latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    hosts = [f"https://board{i}.example.com/jobs" for i in range(args.hosts)]
+    requests = [(f"{hosts[0]}/{i}", "bulk") for i in range(args.bulk)]
+    requests += [(f"{rng.choice(hosts)}/{user}-{i}", user) for user in range(args.users) for i in range(3)]
+
+    scheduler = HostScheduler(concurrency=args.concurrency, delay=args.delay, queue_timeout=600)
+    active, peak, lock = {}, {}, threading.Lock()
+    waits = {}
+
+    def fetch(url, user, latency):
+        host = scheduler.host_of(url)
+        queued = time.perf_counter()
+        with scheduler.slot(url, user):
+            with lock:
+                waits.setdefault(user == "bulk", []).append(time.perf_counter() - queued)
+                active[host] = active.get(host, 0) + 1
+                peak[host] = max(peak.get(host, 0), active[host])
+            time.sleep(latency)
+            with lock:
+                active[host] -= 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(requests)) as pool:
+        for url, user in requests:
+            pool.submit(fetch, url, user, max(0.0, rng.gauss(args.latency, args.latency / 4)))
+    elapsed = time.perf_counter() - start
+
+    print(f"Fetches:                 {len(requests)} over {args.hosts} hosts in {elapsed:.2f}s "
+          f"({len(requests) / elapsed:.1f}/s)")
+    print(f"Peak per-host fetches:   {max(peak.values())} (limit {args.concurrency})")
+    print(f"Light users' wait, p50:  {statistics.median(waits[False]):.2f}s, max {max(waits[False]):.2f}s")
+    print(f"Bulk user's wait, p50:   {statistics.median(waits[True]):.2f}s, max {max(waits[True]):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Per-interaction server time for the Manage Work Experience page
+
+Seeds a throwaway database with 8 experiences x 20 bullets, renders the page with
+Streamlit's AppTest harness and clicks a bullet's edit button inside the first
+experience fragment, timing each click's rerun. It compares the cost of a
+full-page rerun (what every bullet edit/delete click used to trigger) with the
+cost of rerunning the clicked experience fragment (what those clicks trigger
+now). AppTest replays the whole script on a click, so the fragment figure is
+the clicked fragment's own span, which is all a browser session reruns.
+
+Usage:
+    python benchmark_work_experience_page.py --experiences 8 --bullets 20
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from streamlit.testing.v1 import AppTest
+
+import tracing
+from database import Database
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().split('\n')[0])
+    parser.add_argument("--experiences", type=int, default=8)
+    parser.add_argument("--bullets", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.py opens resume_optimizer.db in the working directory
+        os.chdir(tmp)
+        db = Database()
+        user_id = db.create_user("benchmark", "benchmark")
+        for i in range(args.experiences):
+            exp_id = db.add_work_experience(user_id, f"Company {i}", "Analyst", "January 2020", None, False)
+            # The templated bullets are near-duplicates of each other; keep them all
+            db.add_bullets_bulk(exp_id, [
+                f"Delivered analytics project {j} that improved KPI {j} by {j + 10}%"
+                for j in range(args.bullets)
+            ], skip_duplicates=False)
+
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.session_state.user_id = user_id
+        at.session_state.username = "benchmark"
+        at.run()
+        at.sidebar.radio(key="nav_radio").set_value("Manage Work Experience").run()
+
+        exp_id = db.get_work_experiences(user_id)[0]['id']
+        edit_key = f"edit_{db.get_bullets(exp_id)[0]['id']}"
+        clicked_ms = []
+
+        def record_clicked_fragment(span):
+            if span.name == "fragment.experience" and span.attributes.get("experience_id") == exp_id:
+                clicked_ms.append(span.duration_ms)
+
+        tracing.add_span_listener(record_clicked_fragment)
+        tracing.reset()
+        click_ms = []
+        for _ in range(args.runs):
+            start = time.perf_counter()
+            at.button(key=edit_key).click().run()
+            click_ms.append((time.perf_counter() - start) * 1000)
+
+    page = tracing.summary()["page.work_experience"]
+    fragment_p50 = statistics.median(clicked_ms)
+
+    print(f"Experiences x bullets:          {args.experiences} x {args.bullets}")
+    print(f"AppTest click round trip p50:   {statistics.median(click_ms):.1f} ms")
+    print(f"Full page rerun (before) p50:   {page['p50_ms']:.1f} ms")
+    print(f"One fragment rerun (after) p50: {fragment_p50:.1f} ms")
+    print(f"Speedup per bullet click:       {page['p50_ms'] / fragment_p50:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
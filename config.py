@@ -7,6 +7,53 @@ import os
 # This will be set as environment variable on Render
 ANTHROPIC_API_KEY = os.getenv("ANTHROPIC_API_KEY", "")
 
+# LLM backend configuration
+# "anthropic" calls the real API, "fake" uses the local stand-in for offline benchmarks
+LLM_BACKEND = os.getenv("LLM_BACKEND", "anthropic")
+LLM_MODEL = os.getenv("LLM_MODEL", "claude-sonnet-4-20250514")
+LLM_MAX_TOKENS = int(os.getenv("LLM_MAX_TOKENS", "2000"))
+
+# Job descriptions are stripped of boilerplate and truncated to this many tokens
+# before prompting (0 disables truncation)
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("JOB_DESCRIPTION_TOKEN_BUDGET", "1500"))
+
+# Bullets from the user's resume for the most similar earlier job (cosine similarity of
+# trimmed descriptions) are reused as-is at or above REUSE, skipping the LLM, and shown
+# to the LLM as an example at or above SEED (above 1.0 disables either)
+PRIOR_REUSE_SIMILARITY = float(os.getenv("PRIOR_REUSE_SIMILARITY", "0.95"))
+PRIOR_SEED_SIMILARITY = float(os.getenv("PRIOR_SEED_SIMILARITY", "0.6"))
+
+# Fake backend settings (only used when LLM_BACKEND = "fake")
+FAKE_LLM_LATENCY_MEAN = float(os.getenv("FAKE_LLM_LATENCY_MEAN", "1.5"))      # seconds
+FAKE_LLM_LATENCY_STDDEV = float(os.getenv("FAKE_LLM_LATENCY_STDDEV", "0.5"))  # seconds
+FAKE_LLM_OUTPUT_TOKENS = int(os.getenv("FAKE_LLM_OUTPUT_TOKENS", "350"))
+FAKE_LLM_ERROR_RATE = float(os.getenv("FAKE_LLM_ERROR_RATE", "0.0"))          # 0.0 - 1.0
+FAKE_LLM_RESPONSE = os.getenv("FAKE_LLM_RESPONSE", "")                        # canned JSON, optional
+FAKE_LLM_SEED = os.getenv("FAKE_LLM_SEED")                                    # set for reproducible runs
+
+# Tracing configuration
+TRACE_LOG = os.getenv("TRACE_LOG", "0") == "1"              # structured span logs to stderr
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH", "")      # OTLP/JSON lines file, empty disables
+TRACE_SAMPLE_SIZE = int(os.getenv("TRACE_SAMPLE_SIZE", "1000"))  # durations kept per stage
+TRACE_SHOW_SUMMARY = os.getenv("TRACE_SHOW_SUMMARY", "0") == "1"  # p50/p95 table in the sidebar
+
+# Metrics configuration (Prometheus text format)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "0"))          # side port serving /metrics, 0 disables
+METRICS_FILE = os.getenv("METRICS_FILE", "")                # textfile collector path, empty disables
+METRICS_FILE_INTERVAL = float(os.getenv("METRICS_FILE_INTERVAL", "15"))  # seconds between writes
+
+# Database read cache (entries), 0 disables. A commit from any other connection or process
+# (such as the API workers in the Procfile) empties it before the next cached read.
+DB_READ_CACHE_SIZE = int(os.getenv("DB_READ_CACHE_SIZE", "2048"))
+
 # Web scraping configuration
 SCRAPING_TIMEOUT = 10
+SCRAPE_CACHE_TTL = int(os.getenv("SCRAPE_CACHE_TTL", "86400"))     # seconds a scraped description is reused
+SCRAPE_FAILURE_TTL = int(os.getenv("SCRAPE_FAILURE_TTL", "600"))   # seconds before a permanently failed URL is retried
+
+# Politeness towards each job board (see scrape_scheduler.py)
+SCRAPE_HOST_CONCURRENCY = int(os.getenv("SCRAPE_HOST_CONCURRENCY", "2"))    # fetches at once per host
+SCRAPE_HOST_DELAY = float(os.getenv("SCRAPE_HOST_DELAY", "1.0"))            # seconds between starts per host
+SCRAPE_QUEUE_TIMEOUT = float(os.getenv("SCRAPE_QUEUE_TIMEOUT", "60"))       # longest wait for a slot
+SCRAPE_MAX_RETRY_AFTER = float(os.getenv("SCRAPE_MAX_RETRY_AFTER", "30"))   # longer Retry-After fails the scrape
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
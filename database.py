@@ -3,17 +3,377 @@ Database models and functions for Resume Optimizer Web App
 """
 import sqlite3
 import hashlib
+import os
 import secrets
+import copy
+import functools
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Optional, List, Dict, Tuple
+from typing import TYPE_CHECKING, Optional, List, Dict, Tuple
 import json
+import re
+from tracing import span, traced
+import metrics
+
+if TYPE_CHECKING:
+    # Only for annotations; embeddings imports NumPy lazily so plain page loads skip it
+    import numpy as np
+
+# Characters that Streamlit markdown would render; escaped in search snippets
+MARKDOWN_SPECIAL = re.compile(r"([\\`*_#$~\[\]<>|])")
+
+
+class ReadCache:
+    """
+    Thread-safe LRU cache of read query results keyed by (kind, id)
+
+    Each key can hold several variants (e.g. different pages of the same list) so
+    that invalidating the key drops all of them at once. Values are deep-copied in
+    and out so callers can mutate what they get back.
+
+    Every invalidation gives the key a new generation, and clear() gives every key
+    one. A reader takes the generation before querying and passes it to set(), so
+    a result read before a concurrent write is not stored after that write has
+    invalidated the key.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        # key -> generation of its last invalidation since the last clear()
+        self._generations: Dict[Tuple, int] = {}
+        self._counter = 0
+        self._cleared_at = 0
+        self._lock = threading.Lock()
+
+    def generation(self, key: Tuple) -> int:
+        with self._lock:
+            return max(self._generations.get(key, 0), self._cleared_at)
+
+    def get(self, key: Tuple, variant: Tuple = ()) -> Tuple[bool, object]:
+        with self._lock:
+            variants = self._entries.get(key)
+            if variants is None or variant not in variants:
+                return False, None
+            self._entries.move_to_end(key)
+            value = variants[variant]
+        return True, copy.deepcopy(value)
+
+    def set(self, key: Tuple, value, variant: Tuple = (), generation: Optional[int] = None):
+        """Store a read; skipped if the key was invalidated since `generation` was taken"""
+        value = copy.deepcopy(value)
+        with self._lock:
+            if generation is not None and max(self._generations.get(key, 0), self._cleared_at) != generation:
+                return
+            self._entries.setdefault(key, {})[variant] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *keys: Tuple):
+        with self._lock:
+            self._counter += 1
+            for key in keys:
+                self._entries.pop(key, None)
+                self._generations[key] = self._counter
+
+    def clear(self):
+        with self._lock:
+            self._counter += 1
+            self._cleared_at = self._counter
+            self._entries.clear()
+            self._generations.clear()
+
+
+def cached_read(kind: str):
+    """
+    Serve a read method from Database.cache when it is enabled
+
+    The method's first argument is the id invalidated by writes; any further
+    arguments select a variant cached under the same (kind, id) key.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, key_id, *args, **kwargs):
+            if self.cache is None:
+                return method(self, key_id, *args, **kwargs)
+
+            self._check_other_writers()
+            key = (kind, key_id)
+            variant = (method.__name__, args, tuple(sorted(kwargs.items())))
+            generation = self.cache.generation(key)
+            hit, value = self.cache.get(key, variant)
+            metrics.DB_CACHE_REQUESTS.inc(result="hit" if hit else "miss")
+            if hit:
+                return value
+
+            value = method(self, key_id, *args, **kwargs)
+            self.cache.set(key, value, variant, generation)
+            return value
+        return wrapper
+    return decorator
+
+
+class UnitOfWork:
+    """
+    Database writes and file writes that succeed or fail together
+
+    SQL runs on one connection in one transaction. Files are written to temporary
+    paths beside their destination and renamed into place just before the commit;
+    a file already at a destination is moved aside first and deleted only after
+    the commit. If anything fails, the transaction is rolled back, new files are
+    removed and moved-aside files are put back. Use through Database.unit_of_work().
+    """
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        self.cursor = conn.cursor()
+        self.invalidated: List[Tuple] = []
+        # (temporary path, destination)
+        self._staged: List[Tuple[str, str]] = []
+        # (destination, where its previous file was moved or None)
+        self._published: List[Tuple[str, Optional[str]]] = []
+
+    def stage_file(self, path: str, content) -> str:
+        """Write str or bytes content to a temporary file that becomes `path` on commit"""
+        tmp_path = f"{path}.{secrets.token_hex(4)}.tmp"
+        self._staged.append((tmp_path, path))
+        if isinstance(content, bytes):
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+        else:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(content)
+        return tmp_path
+
+    def reserve_resume_slot(self, user_id: int) -> Optional[int]:
+        """See Database.reserve_resume_slot"""
+        self.cursor.execute("""
+            UPDATE users SET resume_count = resume_count + 1
+            WHERE id = ? AND resume_count < resume_limit
+            RETURNING resume_count
+        """, (user_id,))
+        row = self.cursor.fetchone()
+        self.invalidated.append(("user_info", user_id))
+        return row['resume_count'] if row else None
+
+    def save_generated_resume(self, user_id: int, target_job_id: int,
+                              bullets_json: str, html_content: str,
+                              pdf_filename: str) -> int:
+        """See Database.save_generated_resume"""
+        self.cursor.execute("""
+            INSERT INTO generated_resumes
+            (user_id, target_job_id, generated_bullets_json, html_content, pdf_filename)
+            VALUES (?, ?, ?, ?, ?)
+        """, (user_id, target_job_id, bullets_json, html_content, pdf_filename))
+        self.invalidated.append(("resumes", user_id))
+        return self.cursor.lastrowid
+
+    def add_work_experience(self, user_id: int, company: str, title: str,
+                            start_date: str, end_date: Optional[str],
+                            is_current: bool) -> int:
+        """See Database.add_work_experience"""
+        self.cursor.execute(
+            "SELECT MAX(display_order) FROM work_experiences WHERE user_id = ?",
+            (user_id,)
+        )
+        display_order = (self.cursor.fetchone()[0] or 0) + 1
+
+        self.cursor.execute("""
+            INSERT INTO work_experiences
+            (user_id, company_name, job_title, start_date, end_date, is_current, display_order)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, (user_id, company, title, start_date, end_date, is_current, display_order))
+        self.invalidated.append(("experiences", user_id))
+        return self.cursor.lastrowid
+
+    def add_bullets_bulk(self, work_experience_id: int, bullets: List[str],
+                         skip_duplicates: bool = True) -> int:
+        """See Database.add_bullets_bulk"""
+        # dedup pulls in NumPy; keep it off the app's startup path
+        import dedup
+
+        texts = [bullet.strip() for bullet in bullets if bullet.strip()]
+        sigs = dedup.signatures(texts)
+        bands = dedup.band_keys(sigs)
+        self.cursor.execute("SELECT user_id FROM work_experiences WHERE id = ?", (work_experience_id,))
+        row = self.cursor.fetchone()
+        user_id = row['user_id'] if row else None
+
+        if skip_duplicates:
+            kept = self._without_duplicates(user_id, texts, sigs, bands)
+            texts = [texts[i] for i in kept]
+            sigs = sigs[kept]
+            bands = [bands[i] for i in kept]
+        if not texts:
+            return 0
+
+        self.cursor.executemany("""
+            INSERT INTO experience_bullets (work_experience_id, bullet_text)
+            VALUES (?, ?)
+        """, [(work_experience_id, text) for text in texts])
+        # AUTOINCREMENT ids are consecutive while this transaction holds the write lock
+        self.cursor.execute("SELECT last_insert_rowid()")
+        first_id = self.cursor.fetchone()[0] - len(texts) + 1
+        bullet_ids = range(first_id, first_id + len(texts))
+        self.index_bullets(user_id, bullet_ids, sigs, bands)
+
+        self.invalidated.append(("bullets", work_experience_id))
+        return len(texts)
+
+    def update_bullet(self, bullet_id: int, bullet_text: str):
+        """See Database.update_bullet"""
+        self.cursor.execute("""
+            UPDATE experience_bullets SET bullet_text = ? WHERE id = ?
+            RETURNING work_experience_id,
+                      (SELECT user_id FROM work_experiences w WHERE w.id = work_experience_id) AS user_id
+        """, (bullet_text, bullet_id))
+        row = self.cursor.fetchone()
+        if row is None:
+            return
+        import dedup
+
+        # The update trigger dropped the old signature and band keys
+        sigs = dedup.signatures([bullet_text])
+        self.index_bullets(row['user_id'], [bullet_id], sigs, dedup.band_keys(sigs))
+        self.invalidated.append(("bullets", row['work_experience_id']))
+
+    def index_bullets(self, user_id: int, bullet_ids, sigs, bands: List[List[int]]):
+        """Store MinHash signatures and LSH band keys for near-duplicate lookups (see dedup.py)"""
+        self.cursor.executemany(
+            "INSERT INTO bullet_minhash (bullet_id, signature) VALUES (?, ?)",
+            [(bullet_id, sig.tobytes()) for bullet_id, sig in zip(bullet_ids, sigs)]
+        )
+        self.cursor.executemany(
+            "INSERT OR IGNORE INTO bullet_lsh (user_id, band_key, bullet_id) VALUES (?, ?, ?)",
+            [(user_id, key, bullet_id) for bullet_id, keys in zip(bullet_ids, bands) for key in keys]
+        )
+
+    def embed_bullets(self, bullet_ids, texts: List[str]) -> "np.ndarray":
+        """
+        Store embedding vectors for ranking bullets against jobs (see embeddings.py)
+
+        A vector is only stored while the bullet still has the text it was computed
+        from, so a bullet edited in the meantime is embedded again on the next read.
+
+        Returns:
+            The vectors, one row per text
+        """
+        import embeddings
+
+        vectors = embeddings.embed(texts)
+        self.cursor.executemany("""
+            INSERT OR REPLACE INTO bullet_embeddings (bullet_id, vector)
+            SELECT id, ? FROM experience_bullets WHERE id = ? AND bullet_text = ?
+        """, [(vector.tobytes(), bullet_id, text) for bullet_id, vector, text in zip(bullet_ids, vectors, texts)])
+        return vectors
+
+    def add_target_job(self, user_id: int, company: str, title: str,
+                       url: Optional[str], description: Optional[str]) -> int:
+        """See Database.add_target_job"""
+        self.cursor.execute("""
+            INSERT INTO target_jobs (user_id, company_name, job_title, job_url, job_description)
+            VALUES (?, ?, ?, ?, ?)
+        """, (user_id, company, title, url, description))
+        job_id = self.cursor.lastrowid
+        self.embed_jobs([job_id], [description])
+        self.invalidated.append(("target_jobs", user_id))
+        return job_id
+
+    def embed_jobs(self, job_ids, descriptions: List[Optional[str]]):
+        """Store description vectors for job clustering (see job_clustering.py)"""
+        import config
+        import embeddings
+        from token_budget import trim_job_description
+
+        # Boilerplate (about us, benefits, EEO) differs between companies posting the same role
+        texts = [trim_job_description(text, config.JOB_DESCRIPTION_TOKEN_BUDGET).text if text else ""
+                 for text in descriptions]
+        self.cursor.executemany(
+            "INSERT OR REPLACE INTO target_job_embeddings (job_id, vector) VALUES (?, ?)",
+            [(job_id, vector.tobytes()) for job_id, vector in zip(job_ids, embeddings.embed(texts))]
+        )
+
+    def _without_duplicates(self, user_id: int, texts: List[str], sigs, bands: List[List[int]]) -> List[int]:
+        """Positions of texts that duplicate neither the user's bank nor an earlier text"""
+        import dedup
+
+        band_list = sorted({key for keys in bands for key in keys})
+        candidates = {}
+        # Stay well under SQLite's bound-parameter limit
+        for start in range(0, len(band_list), 500):
+            chunk = band_list[start:start + 500]
+            self.cursor.execute(f"""
+                SELECT DISTINCT b.id, b.bullet_text, m.signature
+                FROM bullet_lsh l
+                JOIN experience_bullets b ON b.id = l.bullet_id
+                JOIN bullet_minhash m ON m.bullet_id = l.bullet_id
+                WHERE l.user_id = ? AND l.band_key IN ({", ".join("?" * len(chunk))}) AND b.is_active = 1
+            """, (user_id, *chunk))
+            candidates.update((row['id'], row) for row in self.cursor.fetchall())
+
+        index = dedup.LSHIndex()
+        rows = list(candidates.values())
+        existing_sigs = dedup.signatures_from_bytes([row['signature'] for row in rows])
+        # Existing bullets only need indexing under the bands they share with the new ones
+        wanted = set(band_list)
+        for row, sig, keys in zip(rows, existing_sigs, dedup.band_keys(existing_sigs)):
+            index.add(row['id'], row['bullet_text'], sig, [key for key in keys if key in wanted])
+
+        kept = []
+        for i, (text, sig, keys) in enumerate(zip(texts, sigs, bands)):
+            if not index.query(text, sig, keys):
+                index.add(("new", i), text, sig, keys)
+                kept.append(i)
+        return kept
+
+    def _publish_files(self):
+        for tmp_path, path in self._staged:
+            backup = None
+            if os.path.exists(path):
+                backup = f"{path}.{secrets.token_hex(4)}.bak"
+                os.replace(path, backup)
+            # Recorded before the rename so a failure here still restores the backup
+            self._published.append((path, backup))
+            os.replace(tmp_path, path)
+
+    def _remove_backups(self):
+        """After the commit, the moved-aside files are no longer needed"""
+        for _, backup in self._published:
+            if backup:
+                _remove_if_exists(backup)
+
+    def _discard_files(self):
+        for tmp_path, _ in self._staged:
+            _remove_if_exists(tmp_path)
+        for path, backup in reversed(self._published):
+            if backup:
+                os.replace(backup, path)
+            else:
+                _remove_if_exists(path)
+
+
+def _remove_if_exists(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
 
 
 class Database:
     """Handle all database operations"""
 
-    def __init__(self, db_path: str = "resume_optimizer.db"):
+    def __init__(self, db_path: str = "resume_optimizer.db", cache_size: int = 0):
         self.db_path = db_path
+        self.cache = ReadCache(cache_size) if cache_size else None
+        if self.cache is not None:
+            # Long-lived connection whose data_version shows commits made by any other
+            # connection, including other processes (the API workers) writing the same file
+            self._watch = sqlite3.connect(db_path, check_same_thread=False)
+            self._watch_lock = threading.Lock()
+            self._data_version = None
         self.init_database()
 
     def get_connection(self):
@@ -110,9 +470,224 @@ class Database:
             )
         """)
 
+        # Scraped job descriptions shared by every user, keyed by web_scraper.normalize_url;
+        # a NULL description records a failed scrape
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS scrape_cache (
+                url_key TEXT PRIMARY KEY,
+                description TEXT,
+                status TEXT NOT NULL,
+                fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+        # Keyset pagination of a user's target jobs, newest first
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_target_jobs_user_date
+            ON target_jobs (user_id, date_added DESC, id DESC)
+        """)
+
+        # Full-text index over bullet text and its owner ('u' + user id, so a MATCH can pick one
+        # user's bullets), kept in sync with experience_bullets by triggers
+        cursor.execute("SELECT sql FROM sqlite_master WHERE name = 'experience_bullets_fts'")
+        row = cursor.fetchone()
+        fts_exists = row is not None and "owner" in row['sql']
+        if row is not None and not fts_exists:
+            # Built before the owner column existed; index again from scratch
+            cursor.executescript("""
+                DROP TRIGGER IF EXISTS experience_bullets_fts_insert;
+                DROP TRIGGER IF EXISTS experience_bullets_fts_delete;
+                DROP TRIGGER IF EXISTS experience_bullets_fts_update;
+                DROP TABLE experience_bullets_fts;
+            """)
+        cursor.execute("""
+            CREATE VIEW IF NOT EXISTS experience_bullets_search AS
+            SELECT b.id, b.bullet_text, 'u' || w.user_id AS owner
+            FROM experience_bullets b
+            JOIN work_experiences w ON w.id = b.work_experience_id
+        """)
+        cursor.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS experience_bullets_fts USING fts5(
+                bullet_text,
+                owner,
+                content='experience_bullets_search',
+                content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+        """)
+        # Bullets are deleted before their experience, so the owner lookup still finds it
+        cursor.executescript("""
+            CREATE TRIGGER IF NOT EXISTS experience_bullets_fts_insert
+            AFTER INSERT ON experience_bullets BEGIN
+                INSERT INTO experience_bullets_fts (rowid, bullet_text, owner)
+                SELECT new.id, new.bullet_text, 'u' || user_id FROM work_experiences WHERE id = new.work_experience_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS experience_bullets_fts_delete
+            AFTER DELETE ON experience_bullets BEGIN
+                INSERT INTO experience_bullets_fts (experience_bullets_fts, rowid, bullet_text, owner)
+                SELECT 'delete', old.id, old.bullet_text, 'u' || user_id FROM work_experiences WHERE id = old.work_experience_id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS experience_bullets_fts_update
+            AFTER UPDATE OF bullet_text ON experience_bullets BEGIN
+                INSERT INTO experience_bullets_fts (experience_bullets_fts, rowid, bullet_text, owner)
+                SELECT 'delete', old.id, old.bullet_text, 'u' || user_id FROM work_experiences WHERE id = old.work_experience_id;
+                INSERT INTO experience_bullets_fts (rowid, bullet_text, owner)
+                SELECT new.id, new.bullet_text, 'u' || user_id FROM work_experiences WHERE id = new.work_experience_id;
+            END;
+        """)
+        if not fts_exists:
+            # Index bullets written before the search index existed
+            cursor.execute("INSERT INTO experience_bullets_fts (experience_bullets_fts) VALUES ('rebuild')")
+
+        # MinHash signatures and LSH band keys per bullet, for near-duplicate lookups (see dedup.py)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'bullet_minhash'")
+        minhash_exists = cursor.fetchone() is not None
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS bullet_minhash (
+                bullet_id INTEGER PRIMARY KEY,
+                signature BLOB NOT NULL,
+                FOREIGN KEY (bullet_id) REFERENCES experience_bullets(id)
+            );
+            CREATE TABLE IF NOT EXISTS bullet_lsh (
+                user_id INTEGER NOT NULL,
+                band_key INTEGER NOT NULL,
+                bullet_id INTEGER NOT NULL,
+                PRIMARY KEY (user_id, band_key, bullet_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_bullet_lsh_bullet ON bullet_lsh (bullet_id);
+            CREATE TRIGGER IF NOT EXISTS bullet_minhash_delete
+            AFTER DELETE ON experience_bullets BEGIN
+                DELETE FROM bullet_minhash WHERE bullet_id = old.id;
+                DELETE FROM bullet_lsh WHERE bullet_id = old.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS bullet_minhash_update
+            AFTER UPDATE OF bullet_text ON experience_bullets BEGIN
+                DELETE FROM bullet_minhash WHERE bullet_id = old.id;
+                DELETE FROM bullet_lsh WHERE bullet_id = old.id;
+            END;
+        """)
+        if not minhash_exists:
+            # Index bullets written before near-duplicate detection existed
+            import dedup
+
+            cursor.execute("""
+                SELECT b.id, b.bullet_text, w.user_id
+                FROM experience_bullets b
+                JOIN work_experiences w ON w.id = b.work_experience_id
+                ORDER BY w.user_id
+            """)
+            rows = cursor.fetchall()
+            uow = UnitOfWork(conn)
+            for user_id in {row['user_id'] for row in rows}:
+                user_rows = [row for row in rows if row['user_id'] == user_id]
+                sigs = dedup.signatures([row['bullet_text'] for row in user_rows])
+                uow.index_bullets(user_id, [row['id'] for row in user_rows], sigs, dedup.band_keys(sigs))
+
+        # Embedding vector per bullet, for ranking bullets against jobs (see embeddings.py).
+        # Vectors are computed on first read (get_bullet_vectors), so writes stay fast.
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS bullet_embeddings (
+                bullet_id INTEGER PRIMARY KEY,
+                vector BLOB NOT NULL,
+                FOREIGN KEY (bullet_id) REFERENCES experience_bullets(id)
+            );
+            CREATE TRIGGER IF NOT EXISTS bullet_embeddings_delete
+            AFTER DELETE ON experience_bullets BEGIN
+                DELETE FROM bullet_embeddings WHERE bullet_id = old.id;
+            END;
+            CREATE TRIGGER IF NOT EXISTS bullet_embeddings_update
+            AFTER UPDATE OF bullet_text ON experience_bullets BEGIN
+                DELETE FROM bullet_embeddings WHERE bullet_id = old.id;
+            END;
+        """)
+
+        # Description vector per target job, for grouping similar postings (see job_clustering.py)
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'target_job_embeddings'")
+        job_embeddings_exist = cursor.fetchone() is not None
+        cursor.executescript("""
+            CREATE TABLE IF NOT EXISTS target_job_embeddings (
+                job_id INTEGER PRIMARY KEY,
+                vector BLOB NOT NULL,
+                FOREIGN KEY (job_id) REFERENCES target_jobs(id)
+            );
+            CREATE TRIGGER IF NOT EXISTS target_job_embeddings_delete
+            AFTER DELETE ON target_jobs BEGIN
+                DELETE FROM target_job_embeddings WHERE job_id = old.id;
+            END;
+        """)
+        if not job_embeddings_exist:
+            cursor.execute("SELECT id, job_description FROM target_jobs")
+            rows = cursor.fetchall()
+            if rows:
+                UnitOfWork(conn).embed_jobs([row['id'] for row in rows], [row['job_description'] for row in rows])
+
         conn.commit()
         conn.close()
 
+    @contextmanager
+    def unit_of_work(self):
+        """
+        Group writes into one transaction, with files committed alongside the rows
+
+        Usage:
+            with db.unit_of_work() as uow:
+                exp_id = uow.add_work_experience(...)
+                uow.add_bullets_bulk(exp_id, bullets)
+
+            with db.unit_of_work() as uow:
+                uow.stage_file(pdf_path, pdf_bytes)
+                uow.save_generated_resume(...)
+
+        Stage files before running SQL so the write lock is held only briefly. A
+        crash between the renames and the commit can leave files without rows,
+        never rows without files.
+        """
+        conn = self.get_connection()
+        uow = UnitOfWork(conn)
+        try:
+            with span("db.unit_of_work"):
+                yield uow
+                uow._publish_files()
+                conn.commit()
+        except BaseException:
+            conn.rollback()
+            uow._discard_files()
+            raise
+        else:
+            uow._remove_backups()
+        finally:
+            conn.close()
+            self._invalidate(*uow.invalidated)
+
+    def _check_other_writers(self):
+        """
+        Empty the read cache if the database changed since the last cached read
+
+        data_version cannot say what another writer changed, so everything is
+        dropped. Each method here writes on its own connection, so this process's
+        writes also clear the cache on the next read; their per-key invalidation
+        still keeps a read that raced the write from being stored.
+        """
+        with self._watch_lock:
+            version = self._watch.execute("PRAGMA data_version").fetchone()[0]
+            changed = self._data_version is not None and version != self._data_version
+            self._data_version = version
+        if changed:
+            self.cache.clear()
+
+    def _invalidate(self, *keys: Tuple):
+        """Drop cached reads made stale by a write"""
+        if self.cache is not None:
+            self.cache.invalidate(*keys)
+
+    def _lookup(self, cursor, query: str, params: Tuple):
+        """Fetch one value needed to work out which cached reads a write invalidates"""
+        if self.cache is None:
+            return None
+        cursor.execute(query, params)
+        row = cursor.fetchone()
+        return row[0] if row else None
+
     # User authentication methods
     def hash_password(self, password: str) -> str:
         """Hash password with salt"""
@@ -128,6 +703,7 @@ class Database:
         except:
             return False
 
+    @traced("db.create_user")
     def create_user(self, username: str, password: str) -> Optional[int]:
         """Create new user"""
         conn = self.get_connection()
@@ -154,6 +730,7 @@ class Database:
         finally:
             conn.close()
 
+    @traced("db.authenticate_user")
     def authenticate_user(self, username: str, password: str) -> Optional[int]:
         """Authenticate user and return user_id if successful"""
         conn = self.get_connection()
@@ -170,6 +747,8 @@ class Database:
             return row['id']
         return None
 
+    @cached_read("user_info")
+    @traced("db.get_user_info")
     def get_user_info(self, user_id: int) -> Optional[Dict]:
         """Get user information"""
         conn = self.get_connection()
@@ -186,25 +765,34 @@ class Database:
             return dict(row)
         return None
 
-    def increment_resume_count(self, user_id: int):
-        """Increment user's resume count"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE users SET resume_count = resume_count + 1 WHERE id = ?",
-            (user_id,)
-        )
-        conn.commit()
-        conn.close()
-
     def can_generate_resume(self, user_id: int) -> bool:
-        """Check if user can generate another resume"""
+        """
+        Check if user can generate another resume
+
+        Advisory only (e.g. before spending LLM calls); reserve_resume_slot is what
+        enforces the limit.
+        """
         user_info = self.get_user_info(user_id)
         if user_info:
             return user_info['resume_count'] < user_info['resume_limit']
         return False
 
+    @traced("db.reserve_resume_slot")
+    def reserve_resume_slot(self, user_id: int) -> Optional[int]:
+        """
+        Count a resume against the user's limit if there is room, in one statement
+
+        The check and the increment are a single conditional UPDATE, so parallel
+        generations can never take the count past the limit.
+
+        Returns:
+            The new resume count, or None if the user is at their limit
+        """
+        with self.unit_of_work() as uow:
+            return uow.reserve_resume_slot(user_id)
+
     # Profile methods
+    @traced("db.update_profile")
     def update_profile(self, user_id: int, profile_data: Dict):
         """Update user profile"""
         conn = self.get_connection()
@@ -233,7 +821,10 @@ class Database:
 
         conn.commit()
         conn.close()
+        self._invalidate(("profile", user_id))
 
+    @cached_read("profile")
+    @traced("db.get_profile")
     def get_profile(self, user_id: int) -> Optional[Dict]:
         """Get user profile"""
         conn = self.get_connection()
@@ -251,33 +842,56 @@ class Database:
         return None
 
     # Work experience methods
+    @traced("db.add_work_experience")
     def add_work_experience(self, user_id: int, company: str, title: str,
                            start_date: str, end_date: Optional[str],
-                           is_current: bool) -> int:
-        """Add work experience"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        # Get max display_order
-        cursor.execute(
-            "SELECT MAX(display_order) FROM work_experiences WHERE user_id = ?",
-            (user_id,)
-        )
-        max_order = cursor.fetchone()[0]
-        display_order = (max_order or 0) + 1
-
-        cursor.execute("""
-            INSERT INTO work_experiences
-            (user_id, company_name, job_title, start_date, end_date, is_current, display_order)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (user_id, company, title, start_date, end_date, is_current, display_order))
-
-        exp_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-
+                           is_current: bool, bullets: Optional[List[str]] = None,
+                           skip_duplicates: bool = True) -> int:
+        """
+        Add work experience, and optionally its bullets, in one transaction
+
+        Bullets that near-duplicate one already in the user's bank are skipped
+        unless skip_duplicates is False (see add_bullets_bulk).
+        """
+        with self.unit_of_work() as uow:
+            exp_id = uow.add_work_experience(user_id, company, title, start_date, end_date, is_current)
+            if bullets:
+                uow.add_bullets_bulk(exp_id, bullets, skip_duplicates)
         return exp_id
 
+    @traced("db.import_work_experiences")
+    def import_work_experiences(self, user_id: int, experiences: List[Dict],
+                                skip_duplicates: bool = True) -> List[int]:
+        """
+        Add many work experiences with their bullets in one transaction
+
+        Args:
+            user_id: Owner of the experiences
+            experiences: Dicts with company_name, job_title, start_date, end_date,
+                is_current and bullets, in display order
+            skip_duplicates: Skip bullets that near-duplicate one already imported
+                or in the user's bank
+
+        Returns:
+            New experience ids, in the same order
+        """
+        with self.unit_of_work() as uow:
+            exp_ids = []
+            for exp in experiences:
+                exp_id = uow.add_work_experience(
+                    user_id,
+                    exp['company_name'],
+                    exp['job_title'],
+                    exp['start_date'],
+                    exp.get('end_date'),
+                    bool(exp.get('is_current'))
+                )
+                uow.add_bullets_bulk(exp_id, exp.get('bullets', []), skip_duplicates)
+                exp_ids.append(exp_id)
+        return exp_ids
+
+    @cached_read("experiences")
+    @traced("db.get_work_experiences")
     def get_work_experiences(self, user_id: int) -> List[Dict]:
         """Get all work experiences for user"""
         conn = self.get_connection()
@@ -294,99 +908,201 @@ class Database:
 
         return [dict(row) for row in rows]
 
+    @traced("db.delete_work_experience")
     def delete_work_experience(self, exp_id: int):
         """Delete work experience and all its bullets"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
+        user_id = self._lookup(cursor, "SELECT user_id FROM work_experiences WHERE id = ?", (exp_id,))
         cursor.execute("DELETE FROM experience_bullets WHERE work_experience_id = ?", (exp_id,))
         cursor.execute("DELETE FROM work_experiences WHERE id = ?", (exp_id,))
 
         conn.commit()
         conn.close()
+        self._invalidate(("experiences", user_id), ("bullets", exp_id))
 
     # Bullet methods
+    @traced("db.add_bullet")
     def add_bullet(self, work_experience_id: int, bullet_text: str):
-        """Add bullet to work experience"""
+        """Add bullet to work experience, even if it near-duplicates an existing one"""
+        with self.unit_of_work() as uow:
+            uow.add_bullets_bulk(work_experience_id, [bullet_text], skip_duplicates=False)
+
+    @traced("db.add_bullets_bulk")
+    def add_bullets_bulk(self, work_experience_id: int, bullets: List[str],
+                         skip_duplicates: bool = True) -> int:
+        """
+        Add multiple bullets at once
+
+        Args:
+            work_experience_id: Experience the bullets belong to
+            bullets: Bullet texts; blank ones are ignored
+            skip_duplicates: Skip bullets that near-duplicate one already in the
+                user's bank (any experience) or earlier in this list; see dedup.py
+
+        Returns:
+            Number of bullets added
+        """
+        with self.unit_of_work() as uow:
+            return uow.add_bullets_bulk(work_experience_id, bullets, skip_duplicates)
+
+    @cached_read("bullets")
+    @traced("db.get_bullets")
+    def get_bullets(self, work_experience_id: int) -> List[Dict]:
+        """Get all bullets for work experience"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
         cursor.execute("""
-            INSERT INTO experience_bullets (work_experience_id, bullet_text)
-            VALUES (?, ?)
-        """, (work_experience_id, bullet_text))
+            SELECT * FROM experience_bullets
+            WHERE work_experience_id = ? AND is_active = 1
+            ORDER BY id
+        """, (work_experience_id,))
 
-        conn.commit()
+        rows = cursor.fetchall()
         conn.close()
 
-    def add_bullets_bulk(self, work_experience_id: int, bullets: List[str]):
-        """Add multiple bullets at once"""
+        return [dict(row) for row in rows]
+
+    @traced("db.search_bullets")
+    def search_bullets(self, user_id: int, query: str, limit: int = 50) -> List[Dict]:
+        """
+        Full-text search over a user's active bullets, best matches first
+
+        Every word in the query must match (case-insensitive); the last
+        word also matches as a prefix so results update while typing.
+
+        Args:
+            user_id: Owner of the bullets
+            query: Free text; FTS5 operators are treated as plain words
+            limit: Maximum number of results
+
+        Returns:
+            Bullet dicts with company_name, job_title and a markdown snippet
+            with the matched words in **bold** and everything else escaped
+        """
+        words = re.findall(r"\w+", query)
+        if not words:
+            return []
+        # Only this user's bullets are matched and ranked, not everyone's
+        match = f'owner : "u{user_id}" AND bullet_text : (' + " ".join(f'"{word}"' for word in words) + "*)"
+
         conn = self.get_connection()
         cursor = conn.cursor()
+        # Control characters mark the matches so text that looks like markdown can be escaped
+        cursor.execute("""
+            SELECT b.*, w.company_name, w.job_title,
+                   snippet(experience_bullets_fts, 0, char(2), char(3), '…', 16) AS snippet
+            FROM experience_bullets_fts
+            JOIN experience_bullets b ON b.id = experience_bullets_fts.rowid
+            JOIN work_experiences w ON w.id = b.work_experience_id
+            WHERE experience_bullets_fts MATCH ? AND b.is_active = 1
+            ORDER BY experience_bullets_fts.rank
+            LIMIT ?
+        """, (match, limit))
 
-        for bullet in bullets:
-            if bullet.strip():
-                cursor.execute("""
-                    INSERT INTO experience_bullets (work_experience_id, bullet_text)
-                    VALUES (?, ?)
-                """, (work_experience_id, bullet.strip()))
-
-        conn.commit()
+        rows = cursor.fetchall()
         conn.close()
 
-    def get_bullets(self, work_experience_id: int) -> List[Dict]:
-        """Get all bullets for work experience"""
+        results = []
+        for row in rows:
+            result = dict(row)
+            snippet = MARKDOWN_SPECIAL.sub(r"\\\1", result['snippet'])
+            result['snippet'] = snippet.replace("\x02", "**").replace("\x03", "**")
+            results.append(result)
+        return results
+
+    @traced("db.get_bullet_vectors")
+    def get_bullet_vectors(self, user_id: int) -> Tuple[List[Dict], "np.ndarray"]:
+        """
+        A user's active bullets with their embedding vectors, for bullets-to-jobs ranking
+
+        Bullets added or edited since the last call are embedded now, in one batch,
+        and their vectors stored for next time.
+
+        Returns:
+            (bullet dicts with id, work_experience_id and bullet_text,
+             float32 matrix with one row per bullet in the same order)
+        """
+        import embeddings
+
         conn = self.get_connection()
         cursor = conn.cursor()
-
         cursor.execute("""
-            SELECT * FROM experience_bullets
-            WHERE work_experience_id = ? AND is_active = 1
-            ORDER BY id
-        """, (work_experience_id,))
+            SELECT b.id, b.work_experience_id, b.bullet_text, e.vector
+            FROM experience_bullets b
+            JOIN work_experiences w ON w.id = b.work_experience_id
+            LEFT JOIN bullet_embeddings e ON e.bullet_id = b.id
+            WHERE w.user_id = ? AND b.is_active = 1
+            ORDER BY w.display_order, b.id
+        """, (user_id,))
+        rows = cursor.fetchall()
+        conn.close()
 
+        bullets = [{key: row[key] for key in ('id', 'work_experience_id', 'bullet_text')} for row in rows]
+        missing = [i for i, row in enumerate(rows) if row['vector'] is None]
+        fresh = {}
+        if missing:
+            with self.unit_of_work() as uow:
+                fresh = dict(zip(missing, uow.embed_bullets([rows[i]['id'] for i in missing],
+                                                            [rows[i]['bullet_text'] for i in missing])))
+        return bullets, embeddings.from_bytes([fresh[i].tobytes() if i in fresh else row['vector']
+                                               for i, row in enumerate(rows)])
+
+    @traced("db.get_job_vectors")
+    def get_job_vectors(self, user_id: int) -> Tuple[List[Dict], "np.ndarray"]:
+        """
+        A user's target jobs with their description vectors, for clustering
+
+        Returns:
+            (job dicts with id, company_name and job_title, newest first,
+             float32 matrix with one row per job in the same order)
+        """
+        import embeddings
+
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT j.id, j.company_name, j.job_title, e.vector
+            FROM target_jobs j
+            JOIN target_job_embeddings e ON e.job_id = j.id
+            WHERE j.user_id = ?
+            ORDER BY j.date_added DESC, j.id DESC
+        """, (user_id,))
         rows = cursor.fetchall()
         conn.close()
 
-        return [dict(row) for row in rows]
+        jobs = [{key: row[key] for key in ('id', 'company_name', 'job_title')} for row in rows]
+        return jobs, embeddings.from_bytes([row['vector'] for row in rows])
 
+    @traced("db.delete_bullet")
     def delete_bullet(self, bullet_id: int):
         """Delete bullet"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        exp_id = self._lookup(cursor, "SELECT work_experience_id FROM experience_bullets WHERE id = ?", (bullet_id,))
         cursor.execute("DELETE FROM experience_bullets WHERE id = ?", (bullet_id,))
         conn.commit()
         conn.close()
+        self._invalidate(("bullets", exp_id))
 
+    @traced("db.update_bullet")
     def update_bullet(self, bullet_id: int, bullet_text: str):
         """Update bullet text"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE experience_bullets SET bullet_text = ? WHERE id = ?",
-            (bullet_text, bullet_id)
-        )
-        conn.commit()
-        conn.close()
+        with self.unit_of_work() as uow:
+            uow.update_bullet(bullet_id, bullet_text)
 
     # Target job methods
+    @traced("db.add_target_job")
     def add_target_job(self, user_id: int, company: str, title: str,
                       url: Optional[str], description: Optional[str]) -> int:
         """Add target job"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("""
-            INSERT INTO target_jobs (user_id, company_name, job_title, job_url, job_description)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_id, company, title, url, description))
-
-        job_id = cursor.lastrowid
-        conn.commit()
-        conn.close()
-
-        return job_id
+        with self.unit_of_work() as uow:
+            return uow.add_target_job(user_id, company, title, url, description)
 
+    @cached_read("target_jobs")
+    @traced("db.get_target_jobs")
     def get_target_jobs(self, user_id: int) -> List[Dict]:
         """Get all target jobs for user"""
         conn = self.get_connection()
@@ -403,6 +1119,51 @@ class Database:
 
         return [dict(row) for row in rows]
 
+    @cached_read("target_jobs")
+    @traced("db.get_target_job_summaries")
+    def get_target_job_summaries(self, user_id: int, limit: int = 20,
+                                 before: Optional[Tuple[str, int]] = None) -> Dict:
+        """
+        Get one page of a user's target jobs without their full descriptions
+
+        Args:
+            user_id: Owner of the jobs
+            limit: Page size
+            before: Keyset cursor (date_added, id) of the last job on the previous page
+
+        Returns:
+            Dict with 'jobs' (id, company_name, job_title, job_url, date_added,
+            description_length, description_preview) and 'next_cursor' (None on the last page)
+        """
+        conn = self.get_connection()
+        cursor = conn.cursor()
+
+        query = """
+            SELECT id, company_name, job_title, job_url, date_added,
+                   LENGTH(job_description) AS description_length,
+                   SUBSTR(job_description, 1, 500) AS description_preview
+            FROM target_jobs
+            WHERE user_id = ?
+        """
+        params = [user_id]
+        if before:
+            query += " AND (date_added < ? OR (date_added = ? AND id < ?))"
+            params += [before[0], before[0], before[1]]
+        query += " ORDER BY date_added DESC, id DESC LIMIT ?"
+        # One extra row tells us whether another page exists
+        params.append(limit + 1)
+
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        conn.close()
+
+        jobs = [dict(row) for row in rows[:limit]]
+        next_cursor = (jobs[-1]['date_added'], jobs[-1]['id']) if len(rows) > limit else None
+
+        return {'jobs': jobs, 'next_cursor': next_cursor}
+
+    @cached_read("target_job")
+    @traced("db.get_target_job")
     def get_target_job(self, job_id: int) -> Optional[Dict]:
         """Get single target job"""
         conn = self.get_connection()
@@ -416,45 +1177,93 @@ class Database:
             return dict(row)
         return None
 
+    @traced("db.delete_target_job")
     def delete_target_job(self, job_id: int):
         """Delete target job"""
         conn = self.get_connection()
         cursor = conn.cursor()
+        user_id = self._lookup(cursor, "SELECT user_id FROM target_jobs WHERE id = ?", (job_id,))
         cursor.execute("DELETE FROM target_jobs WHERE id = ?", (job_id,))
         conn.commit()
         conn.close()
+        # Resume listings join target_jobs, so deleting a job changes them too
+        self._invalidate(("target_jobs", user_id), ("target_job", job_id), ("resumes", user_id))
 
+    @traced("db.update_job_description")
     def update_job_description(self, job_id: int, description: str):
         """Update job description"""
-        conn = self.get_connection()
-        cursor = conn.cursor()
-        cursor.execute(
-            "UPDATE target_jobs SET job_description = ? WHERE id = ?",
-            (description, job_id)
-        )
-        conn.commit()
-        conn.close()
+        with self.unit_of_work() as uow:
+            user_id = self._lookup(uow.cursor, "SELECT user_id FROM target_jobs WHERE id = ?", (job_id,))
+            uow.cursor.execute(
+                "UPDATE target_jobs SET job_description = ? WHERE id = ?",
+                (description, job_id)
+            )
+            uow.embed_jobs([job_id], [description])
+            uow.invalidated.extend([("target_jobs", user_id), ("target_job", job_id)])
 
     # Resume methods
+    @traced("db.save_generated_resume")
     def save_generated_resume(self, user_id: int, target_job_id: int,
                              bullets_json: str, html_content: str,
                              pdf_filename: str) -> int:
         """Save generated resume"""
+        with self.unit_of_work() as uow:
+            return uow.save_generated_resume(user_id, target_job_id, bullets_json, html_content, pdf_filename)
+
+    @traced("db.get_prior_generations")
+    def get_prior_generations(self, user_id: int) -> Tuple[List[Dict], "np.ndarray"]:
+        """
+        The latest generated bullets for each target job, with the job's description vector
+
+        Returns:
+            (dicts with target_job_id and generated_bullets_json,
+             float32 matrix with one row per dict in the same order)
+        """
+        import embeddings
+
         conn = self.get_connection()
         cursor = conn.cursor()
+        cursor.execute("""
+            SELECT gr.target_job_id, gr.generated_bullets_json, e.vector
+            FROM generated_resumes gr
+            JOIN target_job_embeddings e ON e.job_id = gr.target_job_id
+            WHERE gr.id IN (
+                SELECT MAX(id) FROM generated_resumes WHERE user_id = ? GROUP BY target_job_id
+            )
+            ORDER BY gr.id DESC
+        """, (user_id,))
+        rows = cursor.fetchall()
+        conn.close()
 
+        generations = [{key: row[key] for key in ('target_job_id', 'generated_bullets_json')} for row in rows]
+        return generations, embeddings.from_bytes([row['vector'] for row in rows])
+
+    @traced("db.get_cached_scrape")
+    def get_cached_scrape(self, url_key: str) -> Optional[Dict]:
+        """Cached scrape for a normalized URL, with description, status and age_seconds"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
         cursor.execute("""
-            INSERT INTO generated_resumes
-            (user_id, target_job_id, generated_bullets_json, html_content, pdf_filename)
-            VALUES (?, ?, ?, ?, ?)
-        """, (user_id, target_job_id, bullets_json, html_content, pdf_filename))
+            SELECT description, status, (julianday('now') - julianday(fetched_at)) * 86400 AS age_seconds
+            FROM scrape_cache WHERE url_key = ?
+        """, (url_key,))
+        row = cursor.fetchone()
+        conn.close()
+        return dict(row) if row else None
 
-        resume_id = cursor.lastrowid
+    @traced("db.save_scrape")
+    def save_scrape(self, url_key: str, description: Optional[str], status: str):
+        """Record a scrape result (None for a failure), replacing any older one"""
+        conn = self.get_connection()
+        conn.execute("""
+            INSERT OR REPLACE INTO scrape_cache (url_key, description, status, fetched_at)
+            VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        """, (url_key, description, status))
         conn.commit()
         conn.close()
 
-        return resume_id
-
+    @cached_read("resumes")
+    @traced("db.get_user_resumes")
     def get_user_resumes(self, user_id: int) -> List[Dict]:
         """Get all generated resumes for user"""
         conn = self.get_connection()
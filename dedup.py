@@ -0,0 +1,238 @@
+"""
+Near-duplicate bullet detection with MinHash and locality-sensitive hashing
+
+Each bullet is reduced to character 4-gram shingles and summarized by a MinHash
+signature whose agreement rate estimates the Jaccard similarity of two bullets.
+The signature is split into bands; bullets sharing any band key are candidates,
+and only candidates are compared exactly. Finding the duplicates of a new bullet
+therefore costs a few index lookups instead of a scan of the whole bank.
+
+Database stores every bullet's signature in bullet_minhash and its band keys in
+bullet_lsh, and skips near duplicates in add_bullets_bulk. Run this module for a report over the existing
+bank:
+    python dedup.py --db resume_optimizer.db
+"""
+import argparse
+import re
+import sqlite3
+from typing import Dict, Iterable, List, Set, Tuple
+
+import numpy as np
+
+SHINGLE_SIZE = 4
+# 16 bands of 5 rows: pairs at the threshold become candidates ~95% of the time,
+# unrelated bullets (similarity ~0.3) well under 5% of the time
+NUM_PERMUTATIONS = 80
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+
+# Bullets at least this similar (Jaccard over shingles) count as duplicates
+DUPLICATE_THRESHOLD = 0.7
+
+# Multiply-shift hash family; uint64 products wrap, the high 32 bits are the hash
+_rng = np.random.default_rng(20240601)
+_MULTIPLIERS = _rng.integers(1, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64) | np.uint64(1)
+_OFFSETS = _rng.integers(0, 2 ** 63, NUM_PERMUTATIONS, dtype=np.uint64)
+# Combines the rows of a band into one 64-bit key, distinct per band
+_BAND_MULTIPLIERS = _rng.integers(1, 2 ** 63, ROWS_PER_BAND, dtype=np.uint64) | np.uint64(1)
+_BAND_OFFSETS = _rng.integers(0, 2 ** 63, BANDS, dtype=np.uint64)
+# Polynomial base for hashing the code points of a shingle
+_SHINGLE_BASE = np.uint64(0x100000001B3)
+
+# Bullets hashed per NumPy batch, bounding the (permutations x shingles) work array
+_BATCH_SIZE = 256
+
+
+def normalize(text: str) -> str:
+    """Lowercase words only, so punctuation and spacing do not matter"""
+    return " ".join(re.findall(r"\w+", text.lower()))
+
+
+def shingles(text: str) -> Set[str]:
+    """Character shingles of the normalized text"""
+    text = normalize(text)
+    if len(text) <= SHINGLE_SIZE:
+        return {text}
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def _shingle_hashes(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Hashes of every shingle of every text, computed on code point arrays
+
+    Returns:
+        (hashes of all texts back to back, index where each text's hashes start)
+    """
+    # Short texts are padded so they still have exactly one shingle
+    normalized = [normalize(text).ljust(SHINGLE_SIZE) for text in texts]
+    codes = np.frombuffer("".join(normalized).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    lengths = np.array([len(text) for text in normalized])
+    counts = lengths - SHINGLE_SIZE + 1
+    text_starts = np.cumsum(lengths) - lengths
+    starts = np.repeat(text_starts, counts) + np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+
+    hashes = np.zeros(len(starts), dtype=np.uint64)
+    for offset in range(SHINGLE_SIZE):
+        hashes = hashes * _SHINGLE_BASE + codes[starts + offset]
+    return hashes, np.cumsum(counts) - counts
+
+
+def signatures(texts: List[str]) -> np.ndarray:
+    """MinHash signatures, one row of NUM_PERMUTATIONS uint32 values per text"""
+    result = np.empty((len(texts), NUM_PERMUTATIONS), dtype=np.uint32)
+    for start in range(0, len(texts), _BATCH_SIZE):
+        hashes, offsets = _shingle_hashes(texts[start:start + _BATCH_SIZE])
+        permuted = np.multiply.outer(_MULTIPLIERS, hashes)
+        permuted += _OFFSETS[:, None]
+        # The shift is monotonic, so it can come after the minimum
+        minimums = np.minimum.reduceat(permuted, offsets, axis=1) >> np.uint64(32)
+        result[start:start + len(offsets)] = minimums.T
+    return result
+
+
+def signatures_from_bytes(blobs: List[bytes]) -> np.ndarray:
+    """Inverse of signature.tobytes() for each blob stored in bullet_minhash"""
+    return np.frombuffer(b"".join(blobs), dtype=np.uint32).reshape(len(blobs), NUM_PERMUTATIONS)
+
+
+def band_keys(sigs: np.ndarray) -> List[List[int]]:
+    """LSH band keys for each signature, as signed 64-bit ints (SQLite INTEGERs)"""
+    rows = sigs.reshape(len(sigs), BANDS, ROWS_PER_BAND).astype(np.uint64)
+    keys = (rows * _BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64) + _BAND_OFFSETS
+    return keys.view(np.int64).tolist()
+
+
+class LSHIndex:
+    """
+    In-memory LSH index over bullet texts and their MinHash signatures
+
+    Candidates are first compared by signature agreement; only those whose
+    estimate is within VERIFY_MARGIN of the threshold are compared exactly.
+    """
+
+    VERIFY_MARGIN = 0.15
+
+    def __init__(self, threshold: float = DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self.buckets: Dict[int, List] = {}
+        self.texts: Dict = {}
+        self.signatures: Dict = {}
+
+    def add(self, item_id, text: str, sig: np.ndarray = None, bands: List[int] = None):
+        """
+        Index text under item_id
+
+        bands may be a subset of the text's band keys, e.g. only those shared with
+        the texts about to be queried.
+        """
+        sig = sig if sig is not None else signatures([text])[0]
+        self.texts[item_id] = text
+        self.signatures[item_id] = sig
+        for key in bands if bands is not None else band_keys(sig[None, :])[0]:
+            self.buckets.setdefault(key, []).append(item_id)
+
+    def query(self, text: str, sig: np.ndarray = None, bands: List[int] = None) -> List[Tuple[object, float]]:
+        """Indexed items at least `threshold` similar to text, most similar first"""
+        sig = sig if sig is not None else signatures([text])[0]
+        bands = bands if bands is not None else band_keys(sig[None, :])[0]
+        candidates = list({item_id for key in bands for item_id in self.buckets.get(key, ())})
+        if not candidates:
+            return []
+
+        estimates = (np.stack([self.signatures[item_id] for item_id in candidates]) == sig).mean(axis=1)
+        matches = []
+        shingle_set = None
+        for item_id, estimate in zip(candidates, estimates.tolist()):
+            if estimate < self.threshold - self.VERIFY_MARGIN:
+                continue
+            similarity = estimate
+            if estimate < self.threshold + self.VERIFY_MARGIN:
+                shingle_set = shingle_set or shingles(text)
+                similarity = jaccard(shingle_set, shingles(self.texts[item_id]))
+            if similarity >= self.threshold:
+                matches.append((item_id, similarity))
+        return sorted(matches, key=lambda match: -match[1])
+
+
+def find_duplicate_groups(bullets: Iterable[Dict], threshold: float = DUPLICATE_THRESHOLD) -> List[List[Dict]]:
+    """
+    Group bullets that are near-duplicates of each other
+
+    Args:
+        bullets: Dicts with 'id' and 'bullet_text'
+        threshold: Minimum Jaccard similarity to count as a duplicate
+
+    Returns:
+        Groups of two or more bullets, each in id order
+    """
+    bullets = list(bullets)
+    index = LSHIndex(threshold)
+    by_id = {}
+    parent = {}
+
+    def find(item_id):
+        while parent[item_id] != item_id:
+            parent[item_id] = parent[parent[item_id]]
+            item_id = parent[item_id]
+        return item_id
+
+    sigs = signatures([bullet['bullet_text'] for bullet in bullets])
+    for bullet, sig, bands in zip(bullets, sigs, band_keys(sigs)):
+        by_id[bullet['id']] = bullet
+        parent[bullet['id']] = bullet['id']
+        for match_id, _ in index.query(bullet['bullet_text'], sig, bands):
+            parent[find(bullet['id'])] = find(match_id)
+        index.add(bullet['id'], bullet['bullet_text'], sig, bands)
+
+    groups = {}
+    for item_id in by_id:
+        groups.setdefault(find(item_id), []).append(by_id[item_id])
+    return [sorted(group, key=lambda b: b['id']) for group in groups.values() if len(group) > 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report near-duplicate bullets in the bullet bank")
+    parser.add_argument("--db", default="resume_optimizer.db")
+    parser.add_argument("--user", type=int, default=None, help="only report this user id")
+    parser.add_argument("--threshold", type=float, default=DUPLICATE_THRESHOLD)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    conn.row_factory = sqlite3.Row
+    rows = conn.execute("""
+        SELECT b.id, b.bullet_text, w.user_id, w.company_name
+        FROM experience_bullets b
+        JOIN work_experiences w ON w.id = b.work_experience_id
+        WHERE b.is_active = 1 AND (? IS NULL OR w.user_id = ?)
+        ORDER BY w.user_id, b.id
+    """, (args.user, args.user)).fetchall()
+    conn.close()
+
+    by_user: Dict[int, List[Dict]] = {}
+    for row in rows:
+        by_user.setdefault(row['user_id'], []).append(dict(row))
+
+    total_duplicates = 0
+    for user_id, bullets in by_user.items():
+        groups = find_duplicate_groups(bullets, args.threshold)
+        if not groups:
+            continue
+        print(f"User {user_id}: {len(groups)} groups of near-duplicate bullets")
+        for group in groups:
+            for bullet in group:
+                print(f"  [{bullet['id']}] {bullet['company_name']}: {bullet['bullet_text']}")
+            print()
+        total_duplicates += sum(len(group) - 1 for group in groups)
+
+    print(f"{len(rows)} bullets checked, {total_duplicates} could be removed as near-duplicates")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,60 +3,101 @@ Module for processing HTML documents and generating PDFs
 """
 import os
 import re
-from typing import List
-import config
+from typing import Dict, List, Union
 from datetime import datetime
 
+# <!-- SLOT:name --> marks an empty slot; <!-- NAME_START --> ... <!-- NAME_END --> is the
+# older block form whose content is kept as the default when the slot is not filled
+SLOT_PATTERN = re.compile(
+    r'<!--\s*SLOT:(?P<slot>\w+)\s*-->'
+    r'|(?P<open><!--\s*(?P<block>\w+)_START\s*-->)(?P<default>.*?)(?P<close><!--\s*(?P=block)_END\s*-->)',
+    re.DOTALL
+)
+
 
 class DocumentProcessor:
     """Handles HTML document manipulation and PDF generation"""
 
     def __init__(self, template_path: str):
         self.template_path = template_path
-        # Load template once
+        # Load and split the template once; every render only joins strings
         with open(template_path, 'r', encoding='utf-8') as f:
             self.template_html = f.read()
+        self._chunks, self._slots, self._defaults = self._parse_template(self.template_html)
+
+    @staticmethod
+    def _parse_template(template_html: str):
+        """
+        Split a template into static chunks around its slots
+
+        Returns:
+            (chunks, slot names, default content per slot) where
+            len(chunks) == len(slot names) + 1
+        """
+        chunks, slots, defaults = [], [], {}
+        position, lead = 0, ""
+        for match in SLOT_PATTERN.finditer(template_html):
+            prefix = lead + template_html[position:match.start()]
+            if match.group('slot'):
+                name = match.group('slot')
+                chunks.append(prefix)
+                defaults.setdefault(name, "")
+                position, lead = match.end(), ""
+            else:
+                # Keep the START/END markers so the output can be filled again later
+                name = match.group('block').lower()
+                chunks.append(prefix + match.group('open') + "\n")
+                defaults.setdefault(name, match.group('default').lstrip('\n').rstrip())
+                close_start = match.start('close')
+                indent = template_html[template_html.rfind('\n', 0, close_start) + 1:close_start]
+                position, lead = close_start, "\n" + (indent if not indent.strip() else "")
+            slots.append(name)
+        chunks.append(lead + template_html[position:])
+        return chunks, slots, defaults
+
+    @property
+    def slots(self) -> List[str]:
+        """Slot names in template order"""
+        return list(self._slots)
+
+    def render(self, sections: Dict[str, Union[List[str], str]]) -> str:
+        """
+        Fill every slot in one pass
+
+        Args:
+            sections: Slot name to a list of bullets (rendered as <ul>) or raw HTML.
+                Unfilled slots keep their default content.
+
+        Returns:
+            Rendered HTML
+        """
+        unknown = set(sections) - set(self._slots)
+        if unknown:
+            raise KeyError(f"Template has no slot(s): {', '.join(sorted(unknown))}")
+
+        filled = {}
+        for name, value in sections.items():
+            filled[name] = value if isinstance(value, str) else self._generate_bullet_html(value)
+
+        parts = [self._chunks[0]]
+        for name, chunk in zip(self._slots, self._chunks[1:]):
+            parts.append(filled.get(name, self._defaults[name]))
+            parts.append(chunk)
+        return "".join(parts)
 
-    def create_resume(
-        self,
-        arya_bullets: List[str],
-        deloitte_bullets: List[str],
-        output_path: str
-    ) -> bool:
+    def create_resume(self, sections: Dict[str, Union[List[str], str]], output_path: str) -> bool:
         """
-        Create a resume HTML document by replacing bullets in the template
+        Create a resume HTML document by filling the template's slots
 
         Args:
-            arya_bullets: List of bullets for Arya Consulting Partners
-            deloitte_bullets: List of bullets for Deloitte Consulting
+            sections: Slot name to a list of bullets or raw HTML (see render)
             output_path: Path to save the output HTML document
 
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Start with template
-            html_content = self.template_html
-
-            # Generate Arya bullets HTML
-            arya_html = self._generate_bullet_html(arya_bullets)
-            # Replace Arya placeholder
-            html_content = re.sub(
-                config.ARYA_BULLETS_PLACEHOLDER,
-                f"<!-- ARYA_BULLETS_START -->\n{arya_html}\n                <!-- ARYA_BULLETS_END -->",
-                html_content,
-                flags=re.DOTALL
-            )
-
-            # Generate Deloitte bullets HTML
-            deloitte_html = self._generate_bullet_html(deloitte_bullets)
-            # Replace Deloitte placeholder
-            html_content = re.sub(
-                config.DELOITTE_BULLETS_PLACEHOLDER,
-                f"<!-- DELOITTE_BULLETS_START -->\n{deloitte_html}\n                <!-- DELOITTE_BULLETS_END -->",
-                html_content,
-                flags=re.DOTALL
-            )
+            html_content = self.render(sections)
 
             # Save HTML file
             with open(output_path, 'w', encoding='utf-8') as f:
@@ -0,0 +1,68 @@
+"""
+Local text embeddings for ranking bullets against job descriptions
+
+A hashing vectorizer: lightly stemmed words and word pairs are hashed into
+DIMENSIONS signed buckets, weighted by log term frequency and L2-normalized, so
+the dot product of two vectors is their cosine similarity. Nothing is fitted or
+downloaded, vectors for new text never change old ones, and ranking a whole
+bullet bank against many jobs is a single matrix product.
+
+Database stores a vector per bullet in bullet_embeddings, computed the first
+time the bullet is ranked after being added or edited.
+"""
+import re
+import zlib
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+DIMENSIONS = 512
+
+# Frequent words that say nothing about fit
+_STOPWORDS = frozenset("""
+a an and are as at be by for from has have in into is it its of on or our that the their
+this to was were will with we you your who which while within across over per via
+""".split())
+_SUFFIXES = ("ing", "ed", "es", "s")
+
+
+def _stem(word: str) -> str:
+    for suffix in _SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            return word[:-len(suffix)]
+    return word
+
+
+def features(text: str) -> List[str]:
+    """Stemmed words and adjacent word pairs, stopwords removed"""
+    words = [_stem(word) for word in re.findall(r"[a-z0-9][a-z0-9+#]*", text.lower())
+             if word not in _STOPWORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def embed(texts: List[str]) -> np.ndarray:
+    """Unit-length float32 vectors, one row per text (all zeros for empty text)"""
+    rows, columns, values = [], [], []
+    for row, text in enumerate(texts):
+        for feature, count in Counter(features(text)).items():
+            digest = zlib.crc32(feature.encode("utf-8"))
+            rows.append(row)
+            columns.append(digest % DIMENSIONS)
+            # A hash-derived sign keeps bucket collisions from adding up
+            values.append((1.0 if digest & 0x80000000 else -1.0) * (1.0 + np.log(count)))
+
+    vectors = np.zeros((len(texts), DIMENSIONS), dtype=np.float32)
+    np.add.at(vectors, (rows, columns), values)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def from_bytes(blobs: List[bytes]) -> np.ndarray:
+    """Inverse of vector.tobytes() for each blob stored in bullet_embeddings"""
+    return np.frombuffer(b"".join(blobs), dtype=np.float32).reshape(len(blobs), DIMENSIONS)
+
+
+def similarity(bullet_vectors: np.ndarray, job_vectors: np.ndarray) -> np.ndarray:
+    """Cosine similarity of every bullet (rows) to every job (columns)"""
+    return bullet_vectors @ job_vectors.T
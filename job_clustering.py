@@ -0,0 +1,62 @@
+"""
+Group near-identical target jobs by description similarity
+
+Job descriptions are embedded with embeddings.embed after boilerplate is trimmed
+(see token_budget), so the same role posted by different companies lands close
+together. Pairs at or above SIMILARITY_THRESHOLD are linked and linked jobs are
+merged with union-find; neighbours() gives one job's direct matches without
+clustering the rest. The pairwise similarities are computed as matrix products
+over blocks of rows, so thousands of jobs never need the full n x n matrix at once.
+"""
+from typing import List
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.8
+
+# Rows per block of the similarity matrix (BLOCK_SIZE x n float32 values at a time)
+BLOCK_SIZE = 1024
+
+
+def similar_pairs(vectors: np.ndarray, threshold: float = SIMILARITY_THRESHOLD) -> np.ndarray:
+    """Index pairs (i < j) of rows whose cosine similarity is at least threshold"""
+    pairs = []
+    for start in range(0, len(vectors), BLOCK_SIZE):
+        block = vectors[start:start + BLOCK_SIZE] @ vectors[start:].T
+        rows, columns = np.nonzero(block >= threshold)
+        # Keep each pair once, and never a row with itself
+        keep = columns > rows
+        pairs.append(np.stack([rows[keep] + start, columns[keep] + start], axis=1))
+    return np.concatenate(pairs) if pairs else np.empty((0, 2), dtype=np.int64)
+
+
+def neighbours(vectors: np.ndarray, row: int, threshold: float = SIMILARITY_THRESHOLD) -> List[int]:
+    """Other rows directly similar to `row` (one row of the similarity matrix), most similar first"""
+    scores = vectors @ vectors[row]
+    scores[row] = -np.inf
+    order = (-scores).argsort(kind="stable")
+    return [int(i) for i in order if scores[i] >= threshold]
+
+
+def cluster(vectors: np.ndarray, threshold: float = SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Group rows linked by similar pairs, directly or through other rows
+
+    Returns:
+        Groups of two or more row indices, each sorted, largest group first
+    """
+    parent = list(range(len(vectors)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i, j in similar_pairs(vectors, threshold).tolist():
+        parent[find(i)] = find(j)
+
+    groups = {}
+    for i in range(len(vectors)):
+        groups.setdefault(find(i), []).append(i)
+    return sorted((group for group in groups.values() if len(group) > 1), key=lambda group: (-len(group), group))
@@ -0,0 +1,123 @@
+"""
+Site-specific job description extractors, dispatched by hostname
+
+Job boards put the description in a known place, so reading it from there is
+faster and far less noisy than web_scraper's generic selectors, which often
+fall back to the whole page body. Extractors are registered for host suffixes
+with @register; extract() tries the ones for the page's host, then a
+schema.org JobPosting JSON-LD block (LinkedIn, Workday and most applicant
+tracking systems embed one), and returns None so the caller can fall back to
+the generic path.
+"""
+import html
+import json
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+from bs4 import BeautifulSoup
+import metrics
+
+# Shorter results are treated as a miss, like the generic path's 100-character check
+MIN_LENGTH = 100
+
+# host suffix -> extractors tried in order
+EXTRACTORS: Dict[str, List[Callable[[BeautifulSoup], Optional[str]]]] = {}
+
+
+def register(*hosts: str):
+    """Register an extractor for pages on these hosts (and their subdomains)"""
+    def decorator(func):
+        for host in hosts:
+            EXTRACTORS.setdefault(host, []).append(func)
+        return func
+    return decorator
+
+
+def extractors_for(url: str) -> List[Callable[[BeautifulSoup], Optional[str]]]:
+    host = urlsplit(url).netloc.lower().split(":")[0]
+    found = []
+    for suffix, funcs in EXTRACTORS.items():
+        if host == suffix or host.endswith("." + suffix):
+            found.extend(funcs)
+    return found + [json_ld_job_posting]
+
+
+def extract(soup: BeautifulSoup, url: str) -> Optional[str]:
+    """
+    Description text from the first extractor that finds one for this page
+
+    Call before script tags are removed; the JSON-LD extractor reads them.
+    """
+    for func in extractors_for(url):
+        try:
+            text = func(soup)
+        except Exception as e:
+            # A board changed its markup; the next extractor or the generic path still works
+            print(f"Extractor {func.__name__} failed on {url}: {str(e)}")
+            continue
+        if text and len(text) >= MIN_LENGTH:
+            metrics.SCRAPE_EXTRACTORS.inc(extractor=func.__name__)
+            return text
+    return None
+
+
+def _text(*elements) -> str:
+    return "\n".join(element.get_text(separator="\n", strip=True) for element in elements if element)
+
+
+def _html_to_text(markup: str) -> str:
+    return BeautifulSoup(markup, "html.parser").get_text(separator="\n", strip=True)
+
+
+def json_ld_job_posting(soup: BeautifulSoup) -> Optional[str]:
+    """Title, company and description from a schema.org JobPosting JSON-LD block"""
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "", strict=False)
+        except ValueError:
+            continue
+        items = data if isinstance(data, list) else data.get("@graph", [data]) if isinstance(data, dict) else []
+        for item in items:
+            types = item.get("@type") if isinstance(item, dict) else None
+            if "JobPosting" not in (types if isinstance(types, list) else [types]):
+                continue
+            organization = item.get("hiringOrganization")
+            company = organization.get("name") if isinstance(organization, dict) else None
+            description = item.get("description") or ""
+            # The description is HTML, sometimes entity-escaped a second time
+            if "&lt;" in description:
+                description = html.unescape(description)
+            return "\n".join(part for part in (item.get("title"), company, _html_to_text(description)) if part)
+    return None
+
+
+@register("greenhouse.io")
+def greenhouse(soup: BeautifulSoup) -> Optional[str]:
+    """boards.greenhouse.io (#app_body) and job-boards.greenhouse.io (.job__description)"""
+    title = soup.find(class_="app-title") or soup.find(class_="job__title")
+    description = soup.find(id="content") or soup.find(class_="job__description")
+    return _text(title, description) if description else None
+
+
+@register("lever.co")
+def lever(soup: BeautifulSoup) -> Optional[str]:
+    """jobs.lever.co: the posting headline and every content section except the apply button"""
+    title = soup.select_one(".posting-headline h2")
+    sections = [section for section in soup.select(".posting-page .section.page-centered")
+                if "last-section-apply" not in (section.get("class") or []) and not section.select_one(".postings-btn")]
+    return _text(title, *sections) if sections else None
+
+
+@register("myworkdayjobs.com", "myworkdaysite.com")
+def workday(soup: BeautifulSoup) -> Optional[str]:
+    """Workday career sites, when served rendered; otherwise the JSON-LD block is used"""
+    description = soup.find(attrs={"data-automation-id": "jobPostingDescription"})
+    title = soup.find(attrs={"data-automation-id": "jobPostingHeader"})
+    return _text(title, description) if description else None
+
+
+@register("linkedin.com")
+def linkedin(soup: BeautifulSoup) -> Optional[str]:
+    """LinkedIn's guest job view; the page's JSON-LD block is the fallback"""
+    title = soup.find(class_="top-card-layout__title")
+    description = soup.find(class_="show-more-less-html__markup") or soup.find(class_="description__text")
+    return _text(title, description) if description else None
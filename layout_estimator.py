@@ -0,0 +1,134 @@
+"""
+Fast resume height estimation from font width tables
+
+xhtml2pdf lays Arial out as Helvetica, so wrapping every line with the standard
+Helvetica advance widths predicts how much of the page a resume will use without
+running the PDF renderer. The estimate drives the one-page fit loop in
+resume_renderer; the rendered page count remains the final word.
+"""
+import functools
+from typing import Dict, List
+
+# xhtml2pdf converts CSS px to PDF points at 96 dpi
+PX_TO_PT = 0.75
+
+# xhtml2pdf's default page: A4 with a 1cm frame on every side (points). The
+# templates' body margin only narrows the text, it does not move the frame.
+PAGE_WIDTH = 595.27
+PAGE_HEIGHT = 841.89
+PAGE_FRAME_MARGIN = 28.35
+
+# xhtml2pdf does not shrink spacing linearly, so tightened layouts run a little taller
+# than estimated; keep this much of the page in reserve (points)
+SAFETY_MARGIN = 12
+
+# Advance widths in 1/1000 em for characters 32..126 (Adobe Helvetica AFM)
+_HELVETICA = (
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+)
+_HELVETICA_BOLD = (
+    278, 333, 474, 556, 556, 889, 722, 238, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 333, 333, 584, 584, 584, 611,
+    975, 722, 722, 722, 722, 667, 611, 778, 722, 278, 556, 722, 611, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 333, 278, 333, 584, 556,
+    333, 556, 611, 556, 611, 556, 333, 611, 611, 278, 278, 556, 278, 889, 611, 611,
+    611, 611, 389, 556, 333, 611, 556, 778, 556, 556, 500, 389, 280, 389, 584,
+)
+# Characters outside the table (accents, dashes, symbols) are close to an average glyph
+_DEFAULT_WIDTH = 556
+
+
+def text_width(text: str, size: float, bold: bool = False) -> float:
+    """Width of a single line of text in points"""
+    table = _HELVETICA_BOLD if bold else _HELVETICA
+    units = 0
+    for char in text:
+        code = ord(char) - 32
+        units += table[code] if 0 <= code < 95 else _DEFAULT_WIDTH
+    return units * size / 1000
+
+
+@functools.lru_cache(maxsize=8192)
+def count_lines(text: str, size: float, width: float, bold: bool = False) -> int:
+    """
+    Number of lines text wraps to at the given width, breaking on spaces
+
+    Memoized: a re-fit after editing one bullet only measures the changed text.
+    """
+    if not text:
+        return 1
+
+    space = text_width(" ", size, bold)
+    lines, line_width = 1, 0.0
+    for word in text.split():
+        word_width = text_width(word, size, bold)
+        if line_width and line_width + space + word_width > width:
+            lines += 1
+            line_width = word_width
+        else:
+            line_width += (space if line_width else 0) + word_width
+        # A single word wider than the line is broken across lines
+        while line_width > width:
+            lines += 1
+            line_width -= width
+    return lines
+
+
+def estimate_height(
+    profile: Dict,
+    experiences: List[Dict],
+    style: Dict,
+    header_lines: int = 3
+) -> float:
+    """
+    Estimate the rendered resume height in points
+
+    Args:
+        profile: Profile dict with full_name, contact fields, education and skills
+        experiences: Experience dicts with their 'bullets' to show
+        style: Template style in CSS px (see resume_renderer.TEMPLATE_STYLES)
+        header_lines: Lines used by company, title and dates above each job's bullets
+
+    Returns:
+        Estimated content height in points
+    """
+    px = {key: value * PX_TO_PT for key, value in style.items() if key != 'line_height'}
+    line_height = style['line_height']
+    width = PAGE_WIDTH - 2 * PAGE_FRAME_MARGIN - 2 * px['page_margin']
+    body_line = px['font_size'] * line_height
+
+    def block(text: str, size: float, text_width_available: float = width, bold: bool = False) -> float:
+        return count_lines(text, size, text_width_available, bold) * size * line_height
+
+    height = block(profile.get('full_name') or "Your Name", px['name_size'], bold=True)
+    contact = " | ".join(profile.get(key) or "" for key in ('email', 'phone', 'linkedin_url', 'location'))
+    height += block(contact, px['contact_size']) + px['header_gap']
+
+    heading = px['section_gap'] + px['heading_size'] * line_height + px['heading_gap']
+
+    height += heading
+    bullet_width = width - px['bullet_indent']
+    for exp in experiences:
+        height += header_lines * body_line + px['job_gap']
+        for bullet in exp.get('bullets', []):
+            height += block(bullet, px['font_size'], bullet_width) + px['bullet_gap']
+
+    height += heading
+    for edu in profile.get('education', []):
+        edu_text = f"{edu.get('degree', '')} - {edu.get('school', '')} ({edu.get('year', '')})"
+        height += block(edu_text, px['font_size']) + px['bullet_gap']
+
+    height += heading
+    height += block(", ".join(profile.get('skills', [])), px['font_size'])
+
+    return height
+
+
+def available_height() -> float:
+    """Height an estimate may use and still be expected to fit on one page (points)"""
+    return PAGE_HEIGHT - 2 * PAGE_FRAME_MARGIN - SAFETY_MARGIN
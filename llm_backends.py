@@ -0,0 +1,151 @@
+"""
+LLM backends for the Resume Optimizer
+
+The generation pipeline talks to a backend instead of a concrete SDK client so the
+real Anthropic API can be swapped for a local stand-in during load tests and
+benchmarks. The backend is selected with config.LLM_BACKEND.
+"""
+import abc
+import json
+import random
+import re
+import threading
+import time
+from typing import Optional
+import config
+from token_budget import estimate_tokens
+
+
+class LLMResponse:
+    """Text and token usage returned by a backend call"""
+
+    def __init__(self, text: str, input_tokens: int, output_tokens: int, model: str):
+        self.text = text
+        self.input_tokens = input_tokens
+        self.output_tokens = output_tokens
+        self.model = model
+
+
+class LLMBackend(abc.ABC):
+    """Interface every LLM backend implements"""
+
+    name = "base"
+
+    @abc.abstractmethod
+    def complete(self, prompt: str, max_tokens: int) -> LLMResponse:
+        """
+        Send a single-turn prompt and return the model's reply
+
+        Args:
+            prompt: The user message
+            max_tokens: Maximum tokens to generate
+
+        Returns:
+            LLMResponse with the reply text and token usage
+        """
+
+
+class AnthropicBackend(LLMBackend):
+    """Backend calling the Anthropic Messages API"""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str, model: str = config.LLM_MODEL):
+        from anthropic import Anthropic
+
+        self.client = Anthropic(api_key=api_key)
+        self.model = model
+
+    def complete(self, prompt: str, max_tokens: int) -> LLMResponse:
+        message = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens,
+            messages=[{
+                "role": "user",
+                "content": prompt
+            }]
+        )
+
+        return LLMResponse(
+            text=message.content[0].text,
+            input_tokens=message.usage.input_tokens,
+            output_tokens=message.usage.output_tokens,
+            model=self.model
+        )
+
+
+class FakeBackendError(Exception):
+    """Error injected by FakeBackend to exercise fallback paths"""
+
+
+class FakeBackend(LLMBackend):
+    """
+    Deterministic local stand-in for the Anthropic backend
+
+    Sleeps for a sampled latency, then either raises an injected error or returns
+    canned JSON. Without a canned response it echoes the first bullets found in the
+    prompt, so the rest of the pipeline sees realistic output.
+    """
+
+    name = "fake"
+
+    def __init__(
+        self,
+        latency_mean: float = config.FAKE_LLM_LATENCY_MEAN,
+        latency_stddev: float = config.FAKE_LLM_LATENCY_STDDEV,
+        output_tokens: int = config.FAKE_LLM_OUTPUT_TOKENS,
+        error_rate: float = config.FAKE_LLM_ERROR_RATE,
+        canned_response: str = config.FAKE_LLM_RESPONSE,
+        seed: Optional[int] = None,
+        model: str = "fake-model"
+    ):
+        self.latency_mean = latency_mean
+        self.latency_stddev = latency_stddev
+        self.output_tokens = output_tokens
+        self.error_rate = error_rate
+        self.canned_response = canned_response
+        self.model = model
+        self.call_count = 0
+        self._random = random.Random(seed)
+        # random.Random is not safe to share between benchmark threads
+        self._lock = threading.Lock()
+
+    def complete(self, prompt: str, max_tokens: int) -> LLMResponse:
+        with self._lock:
+            self.call_count += 1
+            latency = max(0.0, self._random.gauss(self.latency_mean, self.latency_stddev))
+            fail = self._random.random() < self.error_rate
+
+        time.sleep(latency)
+
+        if fail:
+            raise FakeBackendError("Injected fake backend error")
+
+        text = self.canned_response or self._echo_bullets(prompt)
+
+        return LLMResponse(
+            text=text,
+            input_tokens=estimate_tokens(prompt),
+            output_tokens=min(self.output_tokens, max_tokens),
+            model=self.model
+        )
+
+    def _echo_bullets(self, prompt: str) -> str:
+        """Build a bullets JSON reply from the bullet lines in the prompt"""
+        match = re.search(r"approximately (\d+) bullets", prompt)
+        target_count = int(match.group(1)) if match else 5
+
+        # Only look past the job description, which may contain "- " lines of its own
+        bullet_section = prompt.split("AVAILABLE EXPERIENCE BULLETS")[-1]
+        bullets = [line[2:].strip() for line in bullet_section.split('\n') if line.startswith("- ")]
+        return json.dumps({"bullets": bullets[:target_count]})
+
+
+def get_backend(api_key: str = config.ANTHROPIC_API_KEY) -> LLMBackend:
+    """Create the backend selected by config.LLM_BACKEND"""
+    if config.LLM_BACKEND == "fake":
+        seed = int(config.FAKE_LLM_SEED) if config.FAKE_LLM_SEED else None
+        return FakeBackend(seed=seed)
+    if config.LLM_BACKEND == "anthropic":
+        return AnthropicBackend(api_key)
+    raise ValueError(f"Unknown LLM backend: {config.LLM_BACKEND}")
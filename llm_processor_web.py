@@ -1,23 +1,39 @@
 """
 LLM Processor for Web App - Simplified for dynamic work experiences
 """
-from anthropic import Anthropic
-from typing import List
+from typing import List, Optional
 import json
+import config
+from llm_backends import LLMBackend, get_backend
+from token_budget import TrimmedJobDescription, trim_job_description
+from tracing import span, traced
+import metrics
 
 
 class ResumeOptimizer:
     """Handle AI-powered resume optimization"""
 
-    def __init__(self, api_key: str):
-        self.client = Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, backend: Optional[LLMBackend] = None):
+        # Backend is chosen by config.LLM_BACKEND unless one is passed in explicitly
+        self.backend = backend or get_backend(api_key)
+
+    @traced("llm.trim_job_description")
+    def prepare_job_description(self, job_description: str) -> TrimmedJobDescription:
+        """
+        Strip boilerplate (EEO, benefits, about us, legal) from a job description
+        and fit it to config.JOB_DESCRIPTION_TOKEN_BUDGET
+
+        Call once per generation and pass the trimmed text to generate_bullets.
+        """
+        return trim_job_description(job_description, config.JOB_DESCRIPTION_TOKEN_BUDGET)
 
     def generate_bullets(
         self,
         job_description: str,
         experience_bullets: List[str],
         target_count: int = 5,
-        context: str = ""
+        context: str = "",
+        example_bullets: Optional[List[str]] = None
     ) -> List[str]:
         """
         Generate optimized bullets for a single work experience
@@ -27,6 +43,7 @@ class ResumeOptimizer:
             experience_bullets: Available bullets for this experience
             target_count: Number of bullets to generate (default 5)
             context: Additional context (e.g., "Position: Consultant at McKinsey")
+            example_bullets: Bullets tailored for a similar job earlier, shown as a starting point
 
         Returns:
             List of optimized bullets
@@ -34,12 +51,71 @@ class ResumeOptimizer:
         if not experience_bullets:
             return []
 
-        # Build prompt
-        prompt = f"""You are a professional resume writer helping to optimize resume bullets for a specific job application.
+        prompt = self._build_prompt(job_description, experience_bullets, target_count, context,
+                                    example_bullets or [])
+
+        backend_name = self.backend.name
+        try:
+            # Call the configured LLM backend
+            with span("llm.call", backend=backend_name) as llm_span, \
+                    metrics.LLM_CALL_SECONDS.time(backend=backend_name):
+                message = self.backend.complete(prompt, max_tokens=config.LLM_MAX_TOKENS)
+                llm_span.set_attribute("input_tokens", message.input_tokens)
+                llm_span.set_attribute("output_tokens", message.output_tokens)
+        except Exception as e:
+            print(f"Error generating bullets: {str(e)}")
+            metrics.LLM_CALLS.inc(backend=backend_name, outcome="error")
+            metrics.LLM_FALLBACKS.inc(reason="api_error")
+            # Fallback: return first N bullets
+            return experience_bullets[:target_count]
+
+        metrics.LLM_TOKENS.inc(message.input_tokens, backend=backend_name, direction="input")
+        metrics.LLM_TOKENS.inc(message.output_tokens, backend=backend_name, direction="output")
+
+        try:
+            with span("llm.parse_json"):
+                # Parse response
+                response_text = message.text.strip()
+
+                # Extract JSON if wrapped in markdown
+                if "```json" in response_text:
+                    response_text = response_text.split("```json")[1].split("```")[0].strip()
+                elif "```" in response_text:
+                    response_text = response_text.split("```")[1].split("```")[0].strip()
+
+                result = json.loads(response_text)
+            bullets = result.get('bullets', [])
+
+        except Exception as e:
+            print(f"Error parsing generated bullets: {str(e)}")
+            metrics.LLM_CALLS.inc(backend=backend_name, outcome="parse_error")
+            metrics.LLM_FALLBACKS.inc(reason="parse_error")
+            # Fallback: return first N bullets
+            return experience_bullets[:target_count]
+
+        metrics.LLM_CALLS.inc(backend=backend_name, outcome="success")
+        return bullets
+
+    @traced("llm.prompt_build")
+    def _build_prompt(
+        self,
+        job_description: str,
+        experience_bullets: List[str],
+        target_count: int,
+        context: str,
+        example_bullets: List[str] = ()
+    ) -> str:
+        """Build the bullet tailoring prompt for one work experience"""
+        # Ahead of the available bullets, which FakeBackend echoes back
+        examples = f"""
+BULLETS TAILORED EARLIER FOR A SIMILAR JOB (a starting point; adjust them to this job):
+{self._format_bullets(example_bullets[:target_count])}
+""" if example_bullets else ""
+        return f"""You are a professional resume writer helping to optimize resume bullets for a specific job application.
 
 JOB DESCRIPTION:
 {job_description}
-
+{examples}
 AVAILABLE EXPERIENCE BULLETS{' (' + context + ')' if context else ''}:
 {self._format_bullets(experience_bullets)}
 
@@ -53,6 +129,7 @@ GUIDELINES:
 4. Start each bullet with a strong action verb
 5. Include metrics and quantifiable achievements when available
 6. Ensure bullets are relevant to the target role
+7. List bullets from most to least relevant; the last ones are dropped first if the resume runs long
 
 Return your response as a JSON object with this exact structure:
 {{
@@ -65,34 +142,6 @@ Return your response as a JSON object with this exact structure:
 
 IMPORTANT: Return ONLY the JSON object, no other text."""
 
-        try:
-            # Call Claude API
-            message = self.client.messages.create(
-                model="claude-sonnet-4-20250514",
-                max_tokens=2000,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }]
-            )
-
-            # Parse response
-            response_text = message.content[0].text.strip()
-
-            # Extract JSON if wrapped in markdown
-            if "```json" in response_text:
-                response_text = response_text.split("```json")[1].split("```")[0].strip()
-            elif "```" in response_text:
-                response_text = response_text.split("```")[1].split("```")[0].strip()
-
-            result = json.loads(response_text)
-            return result.get('bullets', [])
-
-        except Exception as e:
-            print(f"Error generating bullets: {str(e)}")
-            # Fallback: return first N bullets
-            return experience_bullets[:target_count]
-
     def _format_bullets(self, bullets: List[str]) -> str:
         """Format bullet list for prompt"""
         return "\n".join([f"- {bullet}" for bullet in bullets])
@@ -0,0 +1,291 @@
+"""
+In-process metrics registry with Prometheus text exposition
+
+Counters and histograms are updated from the LLM optimizer, the scraper, the PDF
+step in finalize_resume and (through tracing spans) every Database method. The
+registry is rendered in the Prometheus text format and served on a side port
+(config.METRICS_PORT) and/or written periodically to a file (config.METRICS_FILE)
+for a node-exporter style textfile collector.
+"""
+import bisect
+import os
+import threading
+import time
+from contextlib import ContextDecorator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Sequence, Tuple
+import config
+import tracing
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Tuple, extra: str = "") -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    """Shared label handling for counters and histograms"""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.label_names):
+            raise ValueError(f"{self.name} expects labels {self.label_names}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count"""
+
+    type_name = "counter"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = ()):
+        super().__init__(name, documentation, label_names)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.label_names, key)} {value:g}" for key, value in items
+        ]
+
+
+class _Timer(ContextDecorator):
+    """Observe elapsed seconds into a histogram; usable as `with` or as a decorator"""
+
+    def __init__(self, histogram: "Histogram", labels: Dict):
+        self.histogram = histogram
+        self.labels = labels
+
+    def _recreate_cm(self):
+        # Each decorated call gets its own start time; one instance is shared by every caller
+        return _Timer(self.histogram, self.labels)
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self._start, **self.labels)
+        return False
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: Dict[Tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0, 0])
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def time(self, **labels) -> _Timer:
+        return _Timer(self, labels)
+
+    def count(self, **labels) -> int:
+        with self._lock:
+            state = self._values.get(self._key(labels))
+            return state[2] if state else 0
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+
+        lines = self.header()
+        for key, (bucket_counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), bucket_counts):
+                cumulative += bucket_count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                labels = _format_labels(self.label_names, key, 'le="' + le + '"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.label_names, key)} {total:g}")
+            lines.append(f"{self.name}_count{_format_labels(self.label_names, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Collection of named metrics rendered together"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric already registered: {metric.name}")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, label_names))
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALLS = REGISTRY.counter(
+    "resume_llm_calls_total", "LLM calls by backend and outcome", ["backend", "outcome"])
+LLM_TOKENS = REGISTRY.counter(
+    "resume_llm_tokens_total", "LLM tokens by backend and direction", ["backend", "direction"])
+LLM_FALLBACKS = REGISTRY.counter(
+    "resume_llm_fallbacks_total", "Generations that fell back to untailored bullets", ["reason"])
+LLM_CALLS_AVOIDED = REGISTRY.counter(
+    "resume_llm_calls_avoided_total", "Experiences given bullets reused from a similar earlier job")
+LLM_PROMPTS_SEEDED = REGISTRY.counter(
+    "resume_llm_prompts_seeded_total", "LLM prompts that included bullets from a similar earlier job")
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "resume_llm_call_seconds", "LLM call latency", ["backend"])
+SCRAPES = REGISTRY.counter(
+    "resume_scrapes_total", "Job description scrapes by outcome", ["outcome"])
+SCRAPE_CACHE = REGISTRY.counter(
+    "resume_scrape_cache_total", "Scrape cache lookups by result", ["result"])
+SCRAPE_EXTRACTORS = REGISTRY.counter(
+    "resume_scrape_extractor_total", "Descriptions found by a site-specific or JSON-LD extractor", ["extractor"])
+SCRAPE_QUEUE_SECONDS = REGISTRY.histogram(
+    "resume_scrape_queue_seconds", "Time waiting for a per-host scrape slot")
+SCRAPE_SECONDS = REGISTRY.histogram(
+    "resume_scrape_seconds", "Job description scrape latency")
+PDF_RENDERS = REGISTRY.counter(
+    "resume_pdf_renders_total", "PDF renders by outcome", ["outcome"])
+PDF_RENDER_SECONDS = REGISTRY.histogram(
+    "resume_pdf_render_seconds", "HTML to PDF conversion latency")
+PDF_FIT_RENDERS = REGISTRY.histogram(
+    "resume_pdf_fit_renders", "PDF renders needed to fit a resume on one page",
+    buckets=(1, 2, 3, 4, 5))
+RESUMES_GENERATED = REGISTRY.counter(
+    "resume_generated_total", "Resumes saved after a successful PDF render")
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "resume_db_query_seconds", "Database method latency", ["method"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0))
+DB_CACHE_REQUESTS = REGISTRY.counter(
+    "resume_db_cache_requests_total", "Database read cache lookups", ["result"])
+
+
+def _observe_db_span(span: tracing.Span):
+    """Database methods are already traced as db.<method>; reuse those timings"""
+    if span.name.startswith("db."):
+        DB_QUERY_SECONDS.observe(span.duration_ns / 1e9, method=span.name[3:])
+
+
+tracing.add_span_listener(_observe_db_span)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the app log
+        pass
+
+
+def start_http_server(port: int, addr: str = "0.0.0.0") -> ThreadingHTTPServer:
+    """Serve /metrics on a side port from a daemon thread"""
+    server = ThreadingHTTPServer((addr, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def write_textfile(path: str):
+    """Write the current metrics to a file atomically"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(REGISTRY.render())
+    os.replace(tmp_path, path)
+
+
+def _textfile_loop(path: str, interval: float):
+    while True:
+        try:
+            write_textfile(path)
+        except OSError as e:
+            print(f"Error writing metrics file {path}: {str(e)}")
+        time.sleep(interval)
+
+
+_exporter_lock = threading.Lock()
+_exporter_started = False
+
+
+def start_exporter():
+    """Start the side-port server and/or textfile writer configured in config.py (once per process)"""
+    global _exporter_started
+    with _exporter_lock:
+        if _exporter_started:
+            return
+        _exporter_started = True
+
+    if config.METRICS_PORT:
+        try:
+            start_http_server(config.METRICS_PORT)
+        except OSError as e:
+            print(f"Metrics server could not bind port {config.METRICS_PORT}: {str(e)}")
+
+    if config.METRICS_FILE:
+        threading.Thread(
+            target=_textfile_loop,
+            args=(config.METRICS_FILE, config.METRICS_FILE_INTERVAL),
+            name="metrics-textfile",
+            daemon=True
+        ).start()
@@ -0,0 +1,344 @@
+"""
+Resume rendering - HTML building and PDF conversion shared by the web app and API
+"""
+import functools
+import hashlib
+import io
+import os
+import re
+import threading
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+from jinja2 import Environment, FileSystemLoader
+import layout_estimator
+import metrics
+from tracing import span
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+
+# Selectable resume layouts: template name -> label shown to users
+RESUME_TEMPLATES = {
+    "classic": "Classic",
+    "compact": "Compact",
+}
+DEFAULT_TEMPLATE = "classic"
+
+# Sizes (CSS px) each template is rendered with before any fitting.
+# header_lines is how many lines the company/title/dates block takes above the bullets.
+TEMPLATE_STYLES = {
+    "classic": {
+        "font_size": 11, "name_size": 24, "contact_size": 12, "heading_size": 12,
+        "line_height": 1.3, "header_gap": 20, "section_gap": 16, "heading_gap": 8,
+        "job_gap": 12, "bullet_gap": 3, "bullet_indent": 18, "page_margin": 40, "header_lines": 3,
+    },
+    "compact": {
+        "font_size": 13.33, "name_size": 26.67, "contact_size": 12, "heading_size": 16,
+        "line_height": 1.3, "header_gap": 14, "section_gap": 14, "heading_gap": 6,
+        "job_gap": 10, "bullet_gap": 4, "bullet_indent": 20, "page_margin": 40, "header_lines": 1,
+    },
+}
+
+_FONT_KEYS = ("font_size", "name_size", "contact_size", "heading_size")
+# Line height is left alone: xhtml2pdf sets some lines (e.g. classic's job header) at fixed leading
+_SPACING_KEYS = ("header_gap", "section_gap", "heading_gap", "job_gap", "bullet_gap")
+
+# Fit steps tried in order before any bullet is dropped: (font scale, spacing scale)
+FIT_STEPS = ((1.0, 1.0), (1.0, 0.6), (0.95, 0.5), (0.9, 0.4))
+
+# Bullets the fit loop always leaves on each experience
+MIN_BULLETS_PER_EXPERIENCE = 2
+
+# Renders the fit loop may spend when the estimate turns out optimistic
+MAX_FIT_RENDERS = 4
+
+_env = Environment(
+    loader=FileSystemLoader(TEMPLATE_DIR),
+    autoescape=True,
+    trim_blocks=True,
+    lstrip_blocks=True
+)
+
+# Compile every template once at import; rendering then only runs generated Python
+_compiled_templates = {name: _env.get_template(f"{name}.html") for name in RESUME_TEMPLATES}
+
+# The templates' experience() and stylesheet() macros, callable on their own
+_template_macros = {name: template.make_module({'profile': {}}) for name, template in _compiled_templates.items()}
+
+# Recent PDFs by HTML digest, so finalizing an unchanged resume again skips xhtml2pdf
+PDF_CACHE_SIZE = 32
+_pdf_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_pdf_cache_lock = threading.Lock()
+
+
+def generate_output_filename(user_id: int) -> str:
+    """Stored file name (without extension), unique per resume so no file is ever overwritten"""
+    return f"resume_{user_id}_{uuid.uuid4().hex}"
+
+
+def download_filename(full_name: Optional[str], company_name: str, created: Optional[str] = None) -> str:
+    """
+    Friendly name offered when a resume is downloaded: {Name}_Resume_{Company}_{YYMMDD}
+
+    Args:
+        full_name: The user's name from their profile (left out if empty)
+        company_name: Target job company
+        created: created_at timestamp of the resume row (default: today)
+    """
+    date = datetime.strptime(created[:10], "%Y-%m-%d") if created else datetime.now()
+    parts = [full_name or "", "Resume", company_name, date.strftime("%y%m%d")]
+    cleaned = [re.sub(r"[^A-Za-z0-9-]+", "_", part).strip("_") for part in parts]
+    return "_".join(part for part in cleaned if part)
+
+
+def scale_style(template: str, font_scale: float = 1.0, spacing_scale: float = 1.0) -> Dict:
+    """Template style with font sizes and vertical spacing scaled"""
+    style = dict(TEMPLATE_STYLES[template])
+    for key in _FONT_KEYS:
+        style[key] = round(style[key] * font_scale, 2)
+    for key in _SPACING_KEYS:
+        style[key] = round(style[key] * spacing_scale, 2)
+    return style
+
+
+def build_resume_html(profile, experiences, generated_bullets, template: str = DEFAULT_TEMPLATE,
+                      style: Optional[Dict] = None):
+    """
+    Build complete HTML resume with professional formatting
+
+    Args:
+        profile: User profile dict (from Database.get_profile)
+        experiences: Work experience dicts in display order
+        generated_bullets: Bullets to show, keyed by experience id
+        template: Name of a template in RESUME_TEMPLATES
+        style: Sizes to render with (default: the template's TEMPLATE_STYLES entry)
+
+    Returns:
+        HTML string with every user-provided field escaped
+    """
+    if template not in _compiled_templates:
+        raise ValueError(f"Unknown resume template: {template}")
+
+    style = style or TEMPLATE_STYLES[template]
+    return _compiled_templates[template].render(
+        profile=profile,
+        css=_render_stylesheet(template, tuple(sorted(style.items()))),
+        experience_sections=[
+            _render_experience(
+                template,
+                exp['company_name'],
+                exp['job_title'],
+                exp['start_date'],
+                exp['end_date'],
+                tuple(generated_bullets.get(exp['id'], []))
+            )
+            for exp in experiences
+        ]
+    )
+
+
+# Sections are memoized on their content, so re-rendering after a bullet edit only
+# re-renders the experience that changed. Results are escaped Markup.
+
+@functools.lru_cache(maxsize=1024)
+def _render_experience(template, company_name, job_title, start_date, end_date, bullets):
+    return _template_macros[template].experience({
+        'company_name': company_name,
+        'job_title': job_title,
+        'start_date': start_date,
+        'end_date': end_date,
+        'bullets': bullets,
+    })
+
+
+@functools.lru_cache(maxsize=64)
+def _render_stylesheet(template, style_items):
+    return _template_macros[template].stylesheet(dict(style_items))
+
+
+def clear_render_caches():
+    """Forget memoized sections, stylesheets, line measurements and PDFs"""
+    _render_experience.cache_clear()
+    _render_stylesheet.cache_clear()
+    layout_estimator.count_lines.cache_clear()
+    with _pdf_cache_lock:
+        _pdf_cache.clear()
+
+
+def _with_bullets(experiences, generated_bullets) -> List[Dict]:
+    return [dict(exp, bullets=generated_bullets.get(exp['id'], [])) for exp in experiences]
+
+
+def render_pdf_bytes(html_content: str) -> Optional[bytes]:
+    """
+    Convert resume HTML to PDF bytes with xhtml2pdf
+
+    Identical HTML (e.g. finalizing the same bullets twice) reuses the earlier PDF.
+
+    Returns:
+        The PDF, or None if xhtml2pdf reported errors
+    """
+    digest = hashlib.sha256(html_content.encode('utf-8')).hexdigest()
+    with _pdf_cache_lock:
+        cached = _pdf_cache.get(digest)
+        if cached is not None:
+            _pdf_cache.move_to_end(digest)
+    if cached is not None:
+        metrics.PDF_RENDERS.inc(outcome="cached")
+        return cached
+
+    from xhtml2pdf import pisa
+
+    pdf_buffer = io.BytesIO()
+    try:
+        with span("render.pdf"), metrics.PDF_RENDER_SECONDS.time():
+            # Convert HTML to PDF
+            pisa_status = pisa.CreatePDF(
+                html_content,
+                dest=pdf_buffer
+            )
+    except Exception:
+        metrics.PDF_RENDERS.inc(outcome="exception")
+        raise
+
+    # Check if PDF was created successfully
+    success = not pisa_status.err
+    metrics.PDF_RENDERS.inc(outcome="success" if success else "error")
+    if not success:
+        return None
+
+    pdf_bytes = pdf_buffer.getvalue()
+    with _pdf_cache_lock:
+        _pdf_cache[digest] = pdf_bytes
+        while len(_pdf_cache) > PDF_CACHE_SIZE:
+            _pdf_cache.popitem(last=False)
+    return pdf_bytes
+
+
+def warm_up_pdf_renderer():
+    """
+    Load xhtml2pdf and reportlab and render a tiny resume
+
+    The first conversion in a process also sets up fonts (Helvetica and its bold and
+    italic faces) and xhtml2pdf's CSS defaults; doing it here keeps that cost out of
+    the first user's PDF. Not counted in metrics and not cached.
+    """
+    from xhtml2pdf import pisa
+
+    html_content = build_resume_html(
+        {'full_name': 'Warm Up', 'education': [{'degree': 'B.S.', 'school': 'School', 'year': '2020'}], 'skills': ['SQL']},
+        [{'id': 0, 'company_name': 'Company', 'job_title': 'Title', 'start_date': '2020', 'end_date': None}],
+        {0: ['Bullet']}
+    )
+    pisa.CreatePDF(html_content, dest=io.BytesIO())
+
+
+_PAGE_OBJECT = re.compile(rb"/Type\s*/Page\b(?!s)")
+
+
+def count_pdf_pages(pdf_bytes: bytes) -> int:
+    """Count page objects in a PDF written by reportlab (page objects are never compressed)"""
+    return len(_PAGE_OBJECT.findall(pdf_bytes))
+
+
+def _drop_lowest_ranked(bullets: Dict[int, List[str]], display_order: Dict[int, int]) -> bool:
+    """
+    Remove the last (least relevant) bullet from the experience with the most bullets
+
+    Ties go to the experience shown later (display_order maps experience id to its
+    position), which is the older role. Returns False when every experience is down
+    to MIN_BULLETS_PER_EXPERIENCE.
+    """
+    candidates = [exp_id for exp_id, items in bullets.items() if len(items) > MIN_BULLETS_PER_EXPERIENCE]
+    if not candidates:
+        return False
+    exp_id = max(candidates, key=lambda exp_id: (len(bullets[exp_id]), display_order.get(exp_id, -1)))
+    bullets[exp_id] = bullets[exp_id][:-1]
+    return True
+
+
+def _fit_candidates(profile, experiences, generated_bullets, template):
+    """
+    Yield (style, bullets, fits) from least to most aggressive
+
+    Scaled styles come first, then bullets are dropped at the smallest style. `fits` is
+    the layout estimate, so candidates predicted to overflow cost no PDF render.
+    """
+    page_height = layout_estimator.available_height()
+    header_lines = TEMPLATE_STYLES[template]["header_lines"]
+
+    def fits(style, bullets):
+        height = layout_estimator.estimate_height(
+            profile, _with_bullets(experiences, bullets), style, header_lines)
+        return height <= page_height
+
+    for font_scale, spacing_scale in FIT_STEPS:
+        style = scale_style(template, font_scale, spacing_scale)
+        yield style, generated_bullets, fits(style, generated_bullets)
+
+    bullets = {exp_id: list(items) for exp_id, items in generated_bullets.items()}
+    display_order = {exp['id']: position for position, exp in enumerate(experiences)}
+    while _drop_lowest_ranked(bullets, display_order):
+        yield style, {exp_id: list(items) for exp_id, items in bullets.items()}, fits(style, bullets)
+
+
+def fit_resume(profile, experiences, generated_bullets, template: str = DEFAULT_TEMPLATE) -> Optional[Dict]:
+    """
+    Render a resume that fits on one page, shrinking it only as much as needed
+
+    Tries the template's normal sizes first, then tighter spacing and smaller fonts,
+    then drops the lowest-ranked bullets (the last in each list). Each candidate is
+    checked with the layout estimator before it is rendered, and the rendered page
+    count confirms the fit.
+
+    Returns:
+        Dict with html_content, pdf_bytes, pages, bullets (as rendered), dropped_bullets,
+        style and renders, or None if the PDF could not be generated
+    """
+    if template not in _compiled_templates:
+        raise ValueError(f"Unknown resume template: {template}")
+
+    total_bullets = sum(len(items) for items in generated_bullets.values())
+    renders = 0
+    result = None
+
+    def render(style, bullets) -> Optional[Dict]:
+        html_content = build_resume_html(profile, experiences, bullets, template, style)
+        pdf_bytes = render_pdf_bytes(html_content)
+        if pdf_bytes is None:
+            return None
+        return {
+            'html_content': html_content,
+            'pdf_bytes': pdf_bytes,
+            'pages': count_pdf_pages(pdf_bytes),
+            'bullets': bullets,
+            'dropped_bullets': total_bullets - sum(len(items) for items in bullets.values()),
+            'style': style,
+        }
+
+    with span("render.fit", template=template) as fit_span:
+        for style, bullets, predicted_fit in _fit_candidates(profile, experiences, generated_bullets, template):
+            if renders >= MAX_FIT_RENDERS:
+                break
+            if not predicted_fit:
+                continue
+            result = render(style, bullets)
+            renders += 1
+            if result is None or result['pages'] <= 1:
+                break
+
+        if renders == 0:
+            # Nothing was predicted to fit: render the most compact candidate anyway
+            result = render(style, bullets)
+            renders += 1
+
+        fit_span.set_attribute("renders", renders)
+        if result is None:
+            return None
+        result['renders'] = renders
+        fit_span.set_attribute("pages", result['pages'])
+        fit_span.set_attribute("dropped_bullets", result['dropped_bullets'])
+
+    metrics.PDF_FIT_RENDERS.observe(renders)
+    return result
@@ -0,0 +1,254 @@
+"""
+Resume generation workflow shared by the Streamlit app and the REST API
+"""
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+import config
+from database import Database
+from llm_processor_web import ResumeOptimizer
+from resume_renderer import DEFAULT_TEMPLATE, download_filename, fit_resume, generate_output_filename
+from token_budget import TrimmedJobDescription
+from tracing import span, traced
+import metrics
+
+OUTPUT_DIR = "output"
+
+# Most relevant bullets per experience sent to the LLM; the rest of a large bank is left out
+MAX_PROMPT_BULLETS = 25
+
+
+class ResumeLimitReached(Exception):
+    """The user has no resumes left under their limit"""
+
+
+def build_bullet_bank(db: Database, user_id: int, job_description: Optional[str] = None) -> Dict[int, Dict]:
+    """
+    Collect every work experience with its active bullets, keyed by experience id
+
+    With a job description, each experience's bullets are ordered by similarity to
+    it and capped at MAX_PROMPT_BULLETS.
+    """
+    if job_description:
+        ranked = rank_bullets(db, user_id, [job_description])[0]
+    bullet_bank = {}
+    for exp in db.get_work_experiences(user_id):
+        if job_description:
+            bullets = [b['bullet_text'] for b, _ in ranked if b['work_experience_id'] == exp['id']]
+            bullets = bullets[:MAX_PROMPT_BULLETS]
+        else:
+            bullets = [b['bullet_text'] for b in db.get_bullets(exp['id'])]
+        bullet_bank[exp['id']] = {
+            'company': exp['company_name'],
+            'title': exp['job_title'],
+            'bullets': bullets
+        }
+    return bullet_bank
+
+
+@traced("generate.rank_bullets")
+def rank_bullets(db: Database, user_id: int, job_descriptions: List[str]) -> List[List[Tuple[Dict, float]]]:
+    """
+    Rank every bullet in the user's bank against each job description, without the LLM
+
+    Returns:
+        For each job description, (bullet dict, cosine similarity) pairs, most similar first
+    """
+    import embeddings
+
+    bullets, bullet_vectors = db.get_bullet_vectors(user_id)
+    scores = embeddings.similarity(bullet_vectors, embeddings.embed(job_descriptions))
+    ranked = []
+    for column in scores.T:
+        # Ties keep bank order
+        order = (-column).argsort(kind="stable")
+        ranked.append([(bullets[i], float(column[i])) for i in order])
+    return ranked
+
+
+@traced("generate.similar_job_groups")
+def similar_job_groups(db: Database, user_id: int, threshold: Optional[float] = None) -> List[List[Dict]]:
+    """
+    Group the user's target jobs whose descriptions are near-identical
+
+    Returns:
+        Groups of two or more job dicts (id, company_name, job_title), largest group first
+    """
+    import job_clustering
+
+    jobs, vectors = db.get_job_vectors(user_id)
+    groups = job_clustering.cluster(vectors, threshold or job_clustering.SIMILARITY_THRESHOLD)
+    return [[jobs[i] for i in group] for group in groups]
+
+
+@traced("generate.similar_jobs")
+def similar_jobs(db: Database, user_id: int, job_id: int, threshold: Optional[float] = None) -> List[Dict]:
+    """
+    Other target jobs whose descriptions are near-identical to job_id's, which can reuse its bullets
+
+    Only direct matches count: a job similar to a similar job is not returned.
+
+    Returns:
+        Job dicts (id, company_name, job_title), most similar first
+    """
+    import job_clustering
+
+    jobs, vectors = db.get_job_vectors(user_id)
+    row = next((i for i, job in enumerate(jobs) if job['id'] == job_id), None)
+    if row is None:
+        return []
+    return [jobs[i] for i in job_clustering.neighbours(vectors, row, threshold or job_clustering.SIMILARITY_THRESHOLD)]
+
+
+@traced("generate.find_prior")
+def find_prior_generation(db: Database, user_id: int, job_id: int, job_description: str) -> Optional[Dict]:
+    """
+    The user's latest resume for the other target job most similar to this description
+
+    Returns:
+        Dict with job_id, similarity and bullets (keyed by experience id), or None
+    """
+    import embeddings
+
+    generations, vectors = db.get_prior_generations(user_id)
+    others = [i for i, generation in enumerate(generations) if generation['target_job_id'] != job_id]
+    if not others:
+        return None
+
+    scores = vectors[others] @ embeddings.embed([job_description])[0]
+    best = int(scores.argmax())
+    generation = generations[others[best]]
+    return {
+        'job_id': generation['target_job_id'],
+        'similarity': float(scores[best]),
+        'bullets': {int(exp_id): bullets for exp_id, bullets
+                    in json.loads(generation['generated_bullets_json'] or "{}").items()}
+    }
+
+
+@traced("generate.tailor_bullets")
+def generate_tailored_bullets(
+    db: Database,
+    optimizer: ResumeOptimizer,
+    user_id: int,
+    job: Dict,
+    target_count: int = 5
+) -> Tuple[Dict[int, List[str]], TrimmedJobDescription, Optional[Dict]]:
+    """
+    Select and tailor bullets from every work experience for one target job
+
+    Bullets from the most similar earlier job are reused without an LLM call when
+    its description is near-identical (config.PRIOR_REUSE_SIMILARITY), or shown to
+    the LLM as an example when it is close (config.PRIOR_SEED_SIMILARITY).
+
+    Returns:
+        (generated bullets keyed by experience id, trimmed job description,
+         dict with job_id, similarity, calls_avoided and prompts_seeded if an
+         earlier job was used, else None)
+    """
+    # Strip boilerplate once; every per-experience prompt reuses the trimmed text
+    trimmed = optimizer.prepare_job_description(job['job_description'])
+
+    # Most relevant bullets first, so a large bank does not bloat every prompt
+    bullet_bank = build_bullet_bank(db, user_id, trimmed.text)
+
+    prior = find_prior_generation(db, user_id, job['id'], trimmed.text)
+    similarity = prior['similarity'] if prior else 0.0
+    reuse = {'job_id': prior and prior['job_id'], 'similarity': similarity, 'calls_avoided': 0, 'prompts_seeded': 0}
+
+    generated_bullets = {}
+    for exp_id, exp_data in bullet_bank.items():
+        prior_bullets = prior['bullets'].get(exp_id) if prior and exp_data['bullets'] else None
+
+        if prior_bullets and similarity >= config.PRIOR_REUSE_SIMILARITY:
+            generated_bullets[exp_id] = prior_bullets
+            reuse['calls_avoided'] += 1
+            metrics.LLM_CALLS_AVOIDED.inc()
+            continue
+
+        example_bullets = prior_bullets if prior_bullets and similarity >= config.PRIOR_SEED_SIMILARITY else None
+        if example_bullets:
+            reuse['prompts_seeded'] += 1
+            metrics.LLM_PROMPTS_SEEDED.inc()
+
+        # Use AI to select and tailor bullets
+        generated_bullets[exp_id] = optimizer.generate_bullets(
+            job_description=trimmed.text,
+            experience_bullets=exp_data['bullets'],
+            target_count=target_count,
+            context=f"Position: {exp_data['title']} at {exp_data['company']}",
+            example_bullets=example_bullets
+        )
+
+    used_prior = reuse['calls_avoided'] or reuse['prompts_seeded']
+    return generated_bullets, trimmed, reuse if used_prior else None
+
+
+def create_resume(
+    db: Database,
+    user_id: int,
+    job: Dict,
+    bullets: Dict[int, List[str]],
+    output_dir: str = OUTPUT_DIR,
+    template: str = DEFAULT_TEMPLATE
+) -> Optional[Dict]:
+    """
+    Render the resume HTML and PDF, save the resume record and count it against the quota
+
+    The resume is fitted to one page, which may tighten its spacing or drop the
+    lowest-ranked bullets; the saved record holds the bullets actually shown.
+
+    Returns:
+        Dict with resume_id, filename (the name to download the PDF as), html_path,
+        pdf_path, html_content, bullets, pages and dropped_bullets, or None if the
+        PDF could not be generated
+
+    Raises:
+        ResumeLimitReached: if the user is at their resume limit
+    """
+    # Get user profile and experiences
+    profile = db.get_profile(user_id)
+    experiences = db.get_work_experiences(user_id)
+
+    # Render with the user's profile and edited bullets, shrunk to one page if needed
+    fit = fit_resume(profile, experiences, bullets, template)
+    if fit is None:
+        return None
+    html_content = fit['html_content']
+    bullets = fit['bullets']
+
+    output_filename = generate_output_filename(user_id)
+    os.makedirs(output_dir, exist_ok=True)
+
+    html_path = os.path.join(output_dir, f"{output_filename}.html")
+    pdf_path = os.path.join(output_dir, f"{output_filename}.pdf")
+
+    # Files, quota and resume row are committed together or not at all
+    with span("render.save"), db.unit_of_work() as uow:
+        uow.stage_file(html_path, html_content)
+        uow.stage_file(pdf_path, fit['pdf_bytes'])
+
+        # The conditional UPDATE keeps parallel generations from overshooting the limit
+        if uow.reserve_resume_slot(user_id) is None:
+            raise ResumeLimitReached(f"User {user_id} has reached their resume limit")
+
+        resume_id = uow.save_generated_resume(
+            user_id,
+            job['id'],
+            json.dumps(bullets),
+            html_content,
+            output_filename
+        )
+
+    metrics.RESUMES_GENERATED.inc()
+
+    return {
+        'resume_id': resume_id,
+        'filename': download_filename(profile.get('full_name'), job['company_name']),
+        'html_path': html_path,
+        'pdf_path': pdf_path,
+        'html_content': html_content,
+        'bullets': bullets,
+        'pages': fit['pages'],
+        'dropped_bullets': fit['dropped_bullets']
+    }
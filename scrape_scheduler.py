@@ -0,0 +1,133 @@
+"""
+Per-host politeness for the scraper
+
+Every fetch takes a slot from HostScheduler first. For each host it allows at
+most config.SCRAPE_HOST_CONCURRENCY fetches at once, starts them at least
+config.SCRAPE_HOST_DELAY seconds apart and waits out any Retry-After the host
+sent. Requests waiting for the same host are served round-robin by user, so one
+user's bulk import cannot starve everyone else. Different hosts never wait on
+each other.
+"""
+import email.utils
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from typing import Optional
+from urllib.parse import urlsplit
+import config
+import metrics
+
+
+class SlotTimeout(Exception):
+    """No fetch slot for the host came free in time"""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta seconds or HTTP date), None if absent or invalid"""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class _Host:
+    """Queue and pacing state for one host"""
+
+    def __init__(self):
+        self.active = 0
+        self.next_start = 0.0
+        self.blocked_until = 0.0
+        # user -> their waiting tickets; the first user is served next
+        self.waiting = OrderedDict()
+
+
+class HostScheduler:
+    """Grants fetch slots per host: concurrency limit, minimum spacing, Retry-After and fair queueing"""
+
+    def __init__(self, concurrency: int = config.SCRAPE_HOST_CONCURRENCY, delay: float = config.SCRAPE_HOST_DELAY,
+                 queue_timeout: float = config.SCRAPE_QUEUE_TIMEOUT):
+        self.concurrency = concurrency
+        self.delay = delay
+        self.queue_timeout = queue_timeout
+        self._hosts = {}
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        host = urlsplit(url).netloc.lower()
+        return host[4:] if host.startswith("www.") else host
+
+    @contextmanager
+    def slot(self, url: str, user: Optional[int] = None):
+        """
+        Hold a fetch slot for url's host for the duration of the block
+
+        Raises:
+            SlotTimeout: if no slot came free within queue_timeout seconds
+        """
+        host_name = self.host_of(url)
+        ticket = object()
+        queued_at = time.monotonic()
+        deadline = queued_at + self.queue_timeout
+
+        with self._condition:
+            host = self._hosts.setdefault(host_name, _Host())
+            host.waiting.setdefault(user, deque()).append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    tickets = next(iter(host.waiting.values()))
+                    start_at = max(host.next_start, host.blocked_until)
+                    if tickets[0] is ticket and host.active < self.concurrency and now >= start_at:
+                        break
+                    if now >= deadline:
+                        raise SlotTimeout(f"No scrape slot for {host_name} within {self.queue_timeout:.0f}s")
+                    # Woken early by releases; otherwise sleep until this host may start again
+                    wait = start_at - now if host.active < self.concurrency and start_at > now else deadline - now
+                    self._condition.wait(min(wait, deadline - now))
+            except BaseException:
+                self._leave_queue(host, user, ticket)
+                self._condition.notify_all()
+                raise
+
+            # Served: move this user behind the others still waiting for the host
+            self._leave_queue(host, user, ticket)
+            if user in host.waiting:
+                host.waiting.move_to_end(user)
+            host.active += 1
+            host.next_start = now + self.delay
+            self._condition.notify_all()
+
+        metrics.SCRAPE_QUEUE_SECONDS.observe(time.monotonic() - queued_at)
+        try:
+            yield
+        finally:
+            with self._condition:
+                host.active -= 1
+                self._condition.notify_all()
+
+    def retry_after(self, url: str, seconds: float):
+        """Hold every fetch to url's host for the next `seconds`"""
+        with self._condition:
+            host = self._hosts.setdefault(self.host_of(url), _Host())
+            host.blocked_until = max(host.blocked_until, time.monotonic() + seconds)
+            self._condition.notify_all()
+
+    @staticmethod
+    def _leave_queue(host: _Host, user: Optional[int], ticket: object):
+        tickets = host.waiting.get(user)
+        if tickets is not None:
+            tickets.remove(ticket)
+            if not tickets:
+                del host.waiting[user]
+
+
+# Shared by the app's and the API's worker threads
+SCHEDULER = HostScheduler()
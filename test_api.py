@@ -0,0 +1,115 @@
+"""
+Test the REST API's resume downloads and request validation
+"""
+import asyncio
+import base64
+import json
+import os
+import tempfile
+import api
+from database import Database
+
+
+def call(method: str, path: str, user: str, body=None):
+    """Send one request straight to the ASGI app; returns (status, headers, body bytes)"""
+    credentials = base64.b64encode(f"{user}:secret".encode()).decode()
+    payload = json.dumps(body).encode() if body is not None else b""
+    scope = {
+        "type": "http", "http_version": "1.1", "method": method, "scheme": "http",
+        "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "server": ("testserver", 80), "client": ("127.0.0.1", 1),
+        "headers": [(b"host", b"testserver"), (b"content-type", b"application/json"),
+                    (b"authorization", f"Basic {credentials}".encode())],
+    }
+    requests = [{"type": "http.request", "body": payload, "more_body": False}]
+    sent = []
+
+    async def receive():
+        if requests:
+            return requests.pop(0)
+        # The client stays connected until the response is sent
+        await asyncio.Event().wait()
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(api.app(scope, receive, send))
+    start = next(message for message in sent if message["type"] == "http.response.start")
+    headers = {key.decode().lower(): value.decode() for key, value in start["headers"]}
+    body = b"".join(message.get("body", b"") for message in sent if message["type"] == "http.response.body")
+    return start["status"], headers, body
+
+
+def add_user(db: Database, name: str) -> tuple:
+    user_id = db.create_user(name, "secret")
+    db.update_profile(user_id, {'full_name': f"{name.title()} Example"})
+    exp_id = db.add_work_experience(user_id, "Initech", "Analyst", "2020", None, True,
+                                    [f"Built dashboards as {name}"])
+    job_id = db.add_target_job(user_id, "Acme", "Analyst", None, "Senior analyst role")
+    return exp_id, job_id
+
+
+def test_same_company_same_day_downloads_stay_separate():
+    with tempfile.TemporaryDirectory() as tmp:
+        api.db, api.OUTPUT_DIR = Database(os.path.join(tmp, "api_test.db")), os.path.join(tmp, "output")
+        resumes = {}
+        for name in ("alice", "bob"):
+            exp_id, job_id = add_user(api.db, name)
+            status, _, body = call("POST", f"/jobs/{job_id}/generate", name,
+                                   {"bullets": {str(exp_id): [f"Led reporting for {name}"]}})
+            assert status == 201, body
+            resumes[name] = json.loads(body)
+
+        assert resumes["alice"]["filename"] == resumes["bob"]["filename"].replace("Bob", "Alice")
+        for name, resume in resumes.items():
+            status, headers, pdf = call("GET", f"/resumes/{resume['resume_id']}/pdf", name)
+            assert status == 200 and pdf.startswith(b"%PDF")
+            assert f'filename="{name.title()}_Example_Resume_Acme_' in headers["content-disposition"]
+        assert len(os.listdir(api.OUTPUT_DIR)) == 4
+
+        # Another user's resume id is not found
+        assert call("GET", f"/resumes/{resumes['alice']['resume_id']}/pdf", "bob")[0] == 404
+
+
+def test_bad_input_is_400():
+    with tempfile.TemporaryDirectory() as tmp:
+        api.db = Database(os.path.join(tmp, "api_test.db"))
+        _, job_id = add_user(api.db, "alice")
+        for body in ({"target_count": "five"}, {"target_count": 0},
+                     {"similar_job_ids": ["x"]}, {"similar_job_ids": 3},
+                     {"bullets": {"1": 5}}, {"bullets": {"1": "Led a team"}}, {"bullets": {"1": [3]}},
+                     {"bullets": ["Led a team"]}, {"create_pdf": "false"}):
+            status, _, response = call("POST", f"/jobs/{job_id}/generate", "alice", body)
+            assert status == 400, (body, response)
+
+
+def test_profile_update_keeps_omitted_fields():
+    with tempfile.TemporaryDirectory() as tmp:
+        api.db = Database(os.path.join(tmp, "api_test.db"))
+        add_user(api.db, "alice")
+        status, _, _ = call("PUT", "/profile", "alice", {"email": "alice@example.com", "skills": ["SQL"]})
+        assert status == 200
+
+        status, _, _ = call("PUT", "/profile", "alice", {"phone": "555-0100"})
+        profile = json.loads(call("GET", "/profile", "alice")[2])
+        assert status == 200 and profile['phone'] == "555-0100"
+        assert profile['full_name'] == "Alice Example" and profile['email'] == "alice@example.com"
+        assert profile['skills'] == ["SQL"]
+
+
+def test_metrics_require_login():
+    with tempfile.TemporaryDirectory() as tmp:
+        api.db = Database(os.path.join(tmp, "api_test.db"))
+        add_user(api.db, "alice")
+        assert call("GET", "/metrics", "mallory")[0] == 401
+        status, _, body = call("GET", "/metrics", "alice")
+        assert status == 200 and b"resume_llm_calls_total" in body
+        assert call("GET", "/health", "mallory")[0] == 200
+
+
+if __name__ == "__main__":
+    test_same_company_same_day_downloads_stay_separate()
+    test_bad_input_is_400()
+    test_profile_update_keeps_omitted_fields()
+    test_metrics_require_login()
+    print("+ All API tests passed!")
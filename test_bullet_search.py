@@ -0,0 +1,90 @@
+"""
+Test full-text bullet search in Database
+"""
+import os
+import sqlite3
+import tempfile
+from database import Database
+
+
+def test_search_follows_bullet_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "search_test.db"))
+        alice = db.create_user("alice", "secret")
+        bob = db.create_user("bob", "secret")
+        exp_id = db.add_work_experience(alice, "Acme", "Analyst", "2020", None, True, [
+            "Built Tableau dashboards for sales leadership",
+            "Led analysis of pricing experiments",
+        ])
+        db.add_work_experience(bob, "Globex", "Lead", "2021", None, True, ["Built dashboards in Looker"])
+
+        results = db.search_bullets(alice, "dashboard")
+        assert [r['bullet_text'] for r in results] == ["Built Tableau dashboards for sales leadership"]
+        assert results[0]['snippet'] == "Built Tableau **dashboards** for sales leadership"
+        assert results[0]['company_name'] == "Acme"
+
+        # Query syntax is never passed through to FTS5
+        assert db.search_bullets(alice, 'pricing AND "analy') == []
+        assert len(db.search_bullets(alice, "pricing analy")) == 1
+        assert db.search_bullets(alice, "  ") == []
+
+        bullet_id = results[0]['id']
+        db.update_bullet(bullet_id, "Designed weekly revenue reports")
+        assert db.search_bullets(alice, "dashboards") == []
+        assert [r['id'] for r in db.search_bullets(alice, "revenue")] == [bullet_id]
+
+        db.delete_work_experience(exp_id)
+        assert db.search_bullets(alice, "pricing") == []
+        assert len(db.search_bullets(bob, "dashboards")) == 1
+
+
+def test_snippets_escape_markdown():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "search_test.db"))
+        user_id = db.create_user("alice", "secret")
+        db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True,
+                               ["Cut *cloud* spend by $2M in fy_2023 as #1 priority"])
+
+        snippet = db.search_bullets(user_id, "cloud")[0]['snippet']
+        assert snippet == r"Cut \***cloud**\* spend by \$2M in fy\_2023 as \#1 priority"
+
+
+def test_existing_bullets_are_indexed():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "search_test.db")
+        db = Database(path)
+        user_id = db.create_user("alice", "secret")
+        db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True, ["Automated SQL pipelines"])
+
+        # Simulate a database created before the search index existed
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            DROP TRIGGER experience_bullets_fts_insert;
+            DROP TRIGGER experience_bullets_fts_delete;
+            DROP TRIGGER experience_bullets_fts_update;
+            DROP TABLE experience_bullets_fts;
+        """)
+        conn.close()
+
+        db = Database(path)
+        assert len(db.search_bullets(user_id, "sql")) == 1
+
+        # An index built before it had the owner column is rebuilt
+        conn = sqlite3.connect(path)
+        conn.executescript("""
+            DROP TABLE experience_bullets_fts;
+            CREATE VIRTUAL TABLE experience_bullets_fts USING fts5(
+                bullet_text, content='experience_bullets', content_rowid='id'
+            );
+        """)
+        conn.close()
+
+        db = Database(path)
+        assert len(db.search_bullets(user_id, "sql")) == 1
+
+
+if __name__ == "__main__":
+    test_search_follows_bullet_writes()
+    test_snippets_escape_markdown()
+    test_existing_bullets_are_indexed()
+    print("+ All bullet search tests passed!")
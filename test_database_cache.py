@@ -0,0 +1,116 @@
+"""
+Test the Database read cache and its write-through invalidation
+"""
+import os
+import tempfile
+from database import Database, ReadCache
+
+
+class CountingDatabase(Database):
+    """Database that counts connections opened (one per query method)"""
+
+    def __init__(self, *args, **kwargs):
+        self.connections = 0
+        super().__init__(*args, **kwargs)
+
+    def get_connection(self):
+        self.connections += 1
+        return super().get_connection()
+
+
+def make_db(tmp: str) -> CountingDatabase:
+    return CountingDatabase(os.path.join(tmp, "cache_test.db"), cache_size=100)
+
+
+def test_repeated_reads_cost_no_queries():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(tmp)
+        user_id = db.create_user("alice", "secret")
+        exp_id = db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True)
+        db.add_bullets_bulk(exp_id, ["Built dashboards", "Led analysis"])
+
+        db.get_profile(user_id)
+        db.get_work_experiences(user_id)
+        db.get_bullets(exp_id)
+        before = db.connections
+
+        # A rerun that changes nothing
+        db.get_profile(user_id)
+        db.get_work_experiences(user_id)
+        db.get_bullets(exp_id)
+        assert db.connections == before
+
+
+def test_writes_invalidate_matching_reads():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(tmp)
+        user_id = db.create_user("alice", "secret")
+        exp_id = db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True)
+        db.add_bullets_bulk(exp_id, ["Built dashboards", "Led analysis"])
+
+        bullets = db.get_bullets(exp_id)
+        db.update_bullet(bullets[0]['id'], "Built executive dashboards")
+        assert db.get_bullets(exp_id)[0]['bullet_text'] == "Built executive dashboards"
+
+        db.delete_bullet(bullets[1]['id'])
+        assert len(db.get_bullets(exp_id)) == 1
+
+        db.update_profile(user_id, {'full_name': "Alice Smith"})
+        assert db.get_profile(user_id)['full_name'] == "Alice Smith"
+
+        assert db.get_user_info(user_id)['resume_count'] == 0
+        assert db.reserve_resume_slot(user_id) == 1
+        assert db.get_user_info(user_id)['resume_count'] == 1
+
+
+def test_cached_values_are_copies():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = make_db(tmp)
+        user_id = db.create_user("alice", "secret")
+        db.get_profile(user_id)['full_name'] = "Mutated"
+        assert db.get_profile(user_id)['full_name'] is None
+
+
+def test_writes_from_another_process_empty_the_cache():
+    with tempfile.TemporaryDirectory() as tmp:
+        app_db = make_db(tmp)
+        # A second Database on the same file stands in for an API worker process
+        api_db = Database(os.path.join(tmp, "cache_test.db"))
+        user_id = app_db.create_user("alice", "secret")
+        assert app_db.get_profile(user_id)['full_name'] is None
+
+        api_db.update_profile(user_id, {'full_name': "Alice Smith"})
+        assert app_db.get_profile(user_id)['full_name'] == "Alice Smith"
+
+        # With nothing written since, reads are served from the cache again
+        before = app_db.connections
+        app_db.get_profile(user_id)
+        assert app_db.connections == before
+
+
+def test_read_overtaken_by_write_is_not_stored():
+    cache = ReadCache(10)
+    key = ("profile", 1)
+    # A reader misses and queries; a writer commits and invalidates before the reader stores
+    generation = cache.generation(key)
+    cache.invalidate(key)
+    cache.set(key, {'full_name': "Stale"}, generation=generation)
+    assert cache.get(key) == (False, None)
+
+    cache.set(key, {'full_name': "Fresh"}, generation=cache.generation(key))
+    assert cache.get(key) == (True, {'full_name': "Fresh"})
+
+    # Clearing for another process's write also drops reads already in flight
+    generation = cache.generation(("bullets", 2))
+    cache.clear()
+    cache.set(("bullets", 2), [], generation=generation)
+    assert cache.get(("bullets", 2)) == (False, None)
+
+
+if __name__ == "__main__":
+    test_repeated_reads_cost_no_queries()
+    test_writes_invalidate_matching_reads()
+    test_cached_values_are_copies()
+    test_writes_from_another_process_empty_the_cache()
+    test_read_overtaken_by_write_is_not_stored()
+    print("+ All database cache tests passed!")
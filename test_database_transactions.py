@@ -0,0 +1,160 @@
+"""
+Test quota reservation and transactional writes in Database
+"""
+import os
+import sqlite3
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Tuple
+import resume_service
+from database import Database
+
+
+def make_db(tmp: str, limit: int = 50) -> Tuple[Database, int]:
+    db = Database(os.path.join(tmp, "transactions_test.db"), cache_size=100)
+    user_id = db.create_user("alice", "secret")
+    conn = sqlite3.connect(db.db_path)
+    conn.execute("UPDATE users SET resume_limit = ? WHERE id = ?", (limit, user_id))
+    conn.commit()
+    conn.close()
+    return db, user_id
+
+
+def test_parallel_reservations_stop_at_limit():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = make_db(tmp, limit=5)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda _: db.reserve_resume_slot(user_id), range(20)))
+
+        assert sorted(r for r in results if r is not None) == [1, 2, 3, 4, 5]
+        assert results.count(None) == 15
+        assert db.get_user_info(user_id)['resume_count'] == 5
+        assert not db.can_generate_resume(user_id)
+
+
+def test_failed_render_consumes_no_slot():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = make_db(tmp, limit=1)
+        job_id = db.add_target_job(user_id, "Acme", "Analyst", None, "Analyze things")
+
+        original = resume_service.fit_resume
+        resume_service.fit_resume = lambda *args: None
+        try:
+            assert resume_service.create_resume(db, user_id, db.get_target_job(job_id), {}, tmp) is None
+        finally:
+            resume_service.fit_resume = original
+
+        assert db.get_user_info(user_id)['resume_count'] == 0
+        assert db.get_user_resumes(user_id) == []
+
+
+def test_unit_of_work_rolls_back_rows_and_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = make_db(tmp, limit=5)
+        job_id = db.add_target_job(user_id, "Acme", "Analyst", None, "Analyze things")
+        pdf_path = os.path.join(tmp, "resume.pdf")
+
+        try:
+            with db.unit_of_work() as uow:
+                uow.stage_file(pdf_path, b"%PDF-1.4")
+                assert uow.reserve_resume_slot(user_id) == 1
+                uow.save_generated_resume(user_id, job_id, "{}", "<html></html>", "resume")
+                raise RuntimeError("disk full")
+        except RuntimeError:
+            pass
+
+        assert os.listdir(tmp) == ["transactions_test.db"]
+        assert db.get_user_info(user_id)['resume_count'] == 0
+        assert db.get_user_resumes(user_id) == []
+
+        with db.unit_of_work() as uow:
+            uow.stage_file(pdf_path, b"%PDF-1.4")
+            uow.reserve_resume_slot(user_id)
+            uow.save_generated_resume(user_id, job_id, "{}", "<html></html>", "resume")
+
+        assert sorted(os.listdir(tmp)) == ["resume.pdf", "transactions_test.db"]
+        assert db.get_user_info(user_id)['resume_count'] == 1
+        assert len(db.get_user_resumes(user_id)) == 1
+
+
+def test_failed_commit_restores_replaced_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = make_db(tmp)
+        pdf_path = os.path.join(tmp, "resume.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"old")
+
+        # A deferred foreign key check makes the commit itself fail, after the files are renamed
+        try:
+            with db.unit_of_work() as uow:
+                uow.stage_file(pdf_path, b"new")
+                uow.cursor.execute("PRAGMA foreign_keys = ON")
+                uow.reserve_resume_slot(user_id)
+                # Only lasts for the transaction the reservation began
+                uow.cursor.execute("PRAGMA defer_foreign_keys = ON")
+                uow.save_generated_resume(user_id, 9999, "{}", "<html></html>", "resume")
+        except sqlite3.IntegrityError:
+            pass
+
+        with open(pdf_path, "rb") as f:
+            assert f.read() == b"old"
+        assert sorted(os.listdir(tmp)) == ["resume.pdf", "transactions_test.db"]
+        assert db.get_user_resumes(user_id) == []
+        assert db.get_user_info(user_id)['resume_count'] == 0
+
+        with db.unit_of_work() as uow:
+            uow.stage_file(pdf_path, b"new")
+        with open(pdf_path, "rb") as f:
+            assert f.read() == b"new"
+        assert sorted(os.listdir(tmp)) == ["resume.pdf", "transactions_test.db"]
+
+
+def test_limit_reached_writes_no_files():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = make_db(tmp, limit=0)
+        job_id = db.add_target_job(user_id, "Acme", "Analyst", None, "Analyze things")
+        output_dir = os.path.join(tmp, "output")
+
+        try:
+            resume_service.create_resume(db, user_id, db.get_target_job(job_id), {}, output_dir)
+            assert False, "expected ResumeLimitReached"
+        except resume_service.ResumeLimitReached:
+            pass
+
+        assert os.listdir(output_dir) == []
+        assert db.get_user_resumes(user_id) == []
+
+
+def test_import_is_all_or_nothing():
+    with tempfile.TemporaryDirectory() as tmp:
+        db, user_id = make_db(tmp)
+        experiences = [
+            {'company_name': "Acme", 'job_title': "Analyst", 'start_date': "2020",
+             'bullets': ["Built dashboards", "  ", "Led analysis"]},
+            {'company_name': "Globex", 'job_title': "Lead", 'start_date': "2022", 'is_current': True,
+             'bullets': ["Ran experiments"]},
+        ]
+
+        # A malformed entry (no job_title) fails the whole import
+        try:
+            db.import_work_experiences(user_id, experiences + [{'company_name': "Initech"}])
+            assert False, "expected KeyError"
+        except KeyError:
+            pass
+        assert db.get_work_experiences(user_id) == []
+
+        acme_id, globex_id = db.import_work_experiences(user_id, experiences)
+        assert [exp['company_name'] for exp in db.get_work_experiences(user_id)] == ["Acme", "Globex"]
+        assert [b['bullet_text'] for b in db.get_bullets(acme_id)] == ["Built dashboards", "Led analysis"]
+        assert len(db.get_bullets(globex_id)) == 1
+
+
+if __name__ == "__main__":
+    test_parallel_reservations_stop_at_limit()
+    test_failed_render_consumes_no_slot()
+    test_unit_of_work_rolls_back_rows_and_files()
+    test_failed_commit_restores_replaced_files()
+    test_limit_reached_writes_no_files()
+    test_import_is_all_or_nothing()
+    print("+ All database transaction tests passed!")
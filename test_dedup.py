@@ -0,0 +1,50 @@
+"""
+Test near-duplicate bullet detection
+"""
+import os
+import tempfile
+import dedup
+from database import Database
+
+BULLET = "Led cross-functional team of 12 to deliver $2M project 2 weeks ahead of schedule"
+REWORDED = "Led a cross-functional team of 12 to deliver a $2M project two weeks ahead of schedule."
+UNRELATED = "Built Tableau dashboards for sales leadership"
+
+
+def test_duplicate_groups():
+    bullets = [
+        {'id': 1, 'bullet_text': BULLET},
+        {'id': 2, 'bullet_text': UNRELATED},
+        {'id': 3, 'bullet_text': REWORDED},
+        {'id': 4, 'bullet_text': BULLET.upper()},
+    ]
+    groups = dedup.find_duplicate_groups(bullets)
+    assert [[b['id'] for b in group] for group in groups] == [[1, 3, 4]]
+    assert dedup.find_duplicate_groups(bullets, threshold=0.95) != groups
+
+
+def test_insert_skips_near_duplicates():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "dedup_test.db"))
+        user_id = db.create_user("alice", "secret")
+        other_id = db.create_user("bob", "secret")
+        first = db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, False, [BULLET])
+        second = db.add_work_experience(user_id, "Globex", "Lead", "2022", None, True)
+        db.add_work_experience(other_id, "Initech", "Analyst", "2021", None, True, [BULLET])
+
+        # Duplicates of the bank (any experience) and within the batch are skipped
+        assert db.add_bullets_bulk(second, [REWORDED, UNRELATED, UNRELATED + "."]) == 1
+        assert [b['bullet_text'] for b in db.get_bullets(second)] == [UNRELATED]
+        assert db.add_bullets_bulk(second, [REWORDED], skip_duplicates=False) == 1
+
+        # Editing a bullet re-indexes it under its new text
+        db.update_bullet(db.get_bullets(first)[0]['id'], "Negotiated vendor contracts saving $400K a year")
+        db.delete_bullet(db.get_bullets(second)[1]['id'])
+        assert db.add_bullets_bulk(second, [BULLET]) == 1
+        assert db.add_bullets_bulk(second, ["Negotiated vendor contracts, saving $400K a year"]) == 0
+
+
+if __name__ == "__main__":
+    test_duplicate_groups()
+    test_insert_skips_near_duplicates()
+    print("+ All dedup tests passed!")
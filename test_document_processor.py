@@ -0,0 +1,71 @@
+"""
+Test slot parsing and single-pass filling in DocumentProcessor
+"""
+import os
+import tempfile
+from document_processor import DocumentProcessor
+
+TEMPLATE = """<html><body>
+<h1><!-- SLOT:name --></h1>
+            <div>
+                <!-- ARYA_BULLETS_START -->
+                <ul><li>XX</li></ul>
+                <!-- ARYA_BULLETS_END -->
+            </div>
+<!-- SLOT:experience_1 --><!-- SLOT:experience_2 -->
+</body></html>"""
+
+
+def make_processor():
+    fd, path = tempfile.mkstemp(suffix=".html")
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(TEMPLATE)
+    processor = DocumentProcessor(path)
+    os.remove(path)
+    return processor
+
+
+def test_parses_slots_in_order():
+    processor = make_processor()
+    assert processor.slots == ["name", "arya_bullets", "experience_1", "experience_2"]
+
+
+def test_fills_sections_in_one_pass():
+    """Lists become escaped <ul> blocks, strings are inserted as-is, START/END markers stay"""
+    html = make_processor().render({
+        "name": "Jane Doe",
+        "arya_bullets": ["Cut costs <20%> & more"],
+        "experience_2": "<p>Second</p>",
+    })
+
+    assert "<h1>Jane Doe</h1>" in html
+    assert "<li>Cut costs &lt;20%&gt; &amp; more</li>" in html
+    assert "XX" not in html
+    assert "<!-- ARYA_BULLETS_START -->" in html and "<!-- ARYA_BULLETS_END -->" in html
+    assert "\n<p>Second</p>\n</body>" in html
+
+
+def test_unfilled_slots_keep_defaults():
+    processor = make_processor()
+    html = processor.render({})
+    assert "<ul><li>XX</li></ul>" in html
+    assert "SLOT:" not in html
+    # Rendering the legacy block's default reproduces the template exactly
+    assert html == TEMPLATE.replace("<!-- SLOT:name -->", "").replace(
+        "<!-- SLOT:experience_1 --><!-- SLOT:experience_2 -->", "")
+
+
+def test_unknown_slot_is_rejected():
+    try:
+        make_processor().render({"missing": ["x"]})
+    except KeyError:
+        return
+    assert False, "expected KeyError for an unknown slot"
+
+
+if __name__ == "__main__":
+    test_parses_slots_in_order()
+    test_fills_sections_in_one_pass()
+    test_unfilled_slots_keep_defaults()
+    test_unknown_slot_is_rejected()
+    print("+ All document processor tests passed!")
@@ -0,0 +1,83 @@
+"""
+Test local embeddings and bullet-to-job ranking
+"""
+import os
+import tempfile
+import numpy as np
+import embeddings
+import resume_service
+from database import Database
+
+DATA_JOB = "Data analyst building Tableau dashboards and SQL reporting for executives"
+PROCUREMENT_JOB = "Procurement manager negotiating supplier and vendor contracts"
+
+
+def test_vectors_are_unit_length():
+    vectors = embeddings.embed(["Built SQL dashboards", "", "Built SQL dashboards"])
+    assert vectors.dtype == np.float32 and vectors.shape == (3, embeddings.DIMENSIONS)
+    assert abs(np.linalg.norm(vectors[0]) - 1) < 1e-5
+    assert not vectors[1].any()
+    assert abs(embeddings.similarity(vectors[:1], vectors[2:])[0, 0] - 1) < 1e-5
+
+
+def test_rank_follows_bullet_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "embeddings_test.db"))
+        user_id = db.create_user("alice", "secret")
+        exp_id = db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True, [
+            "Negotiated vendor contracts saving $400K a year",
+            "Built Tableau dashboards for the executive team",
+        ])
+
+        data_ranking, procurement_ranking = resume_service.rank_bullets(db, user_id, [DATA_JOB, PROCUREMENT_JOB])
+        assert data_ranking[0][0]['bullet_text'].startswith("Built Tableau")
+        assert procurement_ranking[0][0]['bullet_text'].startswith("Negotiated")
+        assert data_ranking[0][1] > data_ranking[1][1]
+
+        # Edited bullets are re-embedded
+        vendor_bullet = db.get_bullets(exp_id)[0]
+        db.update_bullet(vendor_bullet['id'], "Automated SQL reporting behind executive dashboards")
+        bank = resume_service.build_bullet_bank(db, user_id, DATA_JOB)
+        assert bank[exp_id]['bullets'][0].startswith("Automated SQL")
+
+        db.delete_bullet(vendor_bullet['id'])
+        bullets, vectors = db.get_bullet_vectors(user_id)
+        assert len(bullets) == 1 and vectors.shape == (1, embeddings.DIMENSIONS)
+
+
+def test_bullets_are_embedded_on_first_read():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "embeddings_test.db"))
+        user_id = db.create_user("alice", "secret")
+        exp_id = db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True,
+                                        ["Built Tableau dashboards", "Led pricing analysis"])
+
+        def stored():
+            conn = db.get_connection()
+            count = conn.execute("SELECT COUNT(*) FROM bullet_embeddings").fetchone()[0]
+            conn.close()
+            return count
+
+        # Writes leave embedding to the first ranking
+        assert stored() == 0
+        _, vectors = db.get_bullet_vectors(user_id)
+        assert stored() == 2 and np.allclose(vectors, db.get_bullet_vectors(user_id)[1])
+
+        bullet = db.get_bullets(exp_id)[0]
+        db.update_bullet(bullet['id'], "Automated SQL reporting")
+        assert stored() == 1
+
+        # A vector computed from text that has since been edited is not kept
+        with db.unit_of_work() as uow:
+            uow.embed_bullets([bullet['id']], ["Built Tableau dashboards"])
+        assert stored() == 1
+        bullets, vectors = db.get_bullet_vectors(user_id)
+        assert stored() == 2
+        assert np.allclose(vectors[0], embeddings.embed(["Automated SQL reporting"])[0])
+
+
+if __name__ == "__main__":
+    test_vectors_are_unit_length()
+    test_rank_follows_bullet_writes()
+    test_bullets_are_embedded_on_first_read()
+    print("+ All embedding tests passed!")
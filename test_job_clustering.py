@@ -0,0 +1,77 @@
+"""
+Test grouping near-identical target jobs
+"""
+import os
+import tempfile
+import numpy as np
+import job_clustering
+import resume_service
+from database import Database
+
+ANALYST_JOB = """Senior Data Analyst
+About Us:
+{company} is a leading innovator in retail technology, serving millions of customers worldwide.
+Responsibilities:
+- Build Tableau dashboards and SQL reporting for executive stakeholders
+- Partner with product managers to design and analyze A/B tests
+- Own forecasting models for {cadence} demand planning
+Requirements:
+- 5+ years of experience with SQL and Python
+Benefits:
+- Competitive salary, 401k match, unlimited PTO"""
+PROCUREMENT_JOB = """Procurement Manager
+Responsibilities:
+- Negotiate supplier and vendor contracts
+- Manage purchasing budgets across regions
+Requirements:
+- 7+ years in procurement or sourcing"""
+
+
+def test_cluster_links_transitively():
+    vectors = np.array([[1, 0], [0.9, 0.436], [0.1, 1], [0.6, 0.8], [-1, 0]], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    # 0-1 and 1-3 are similar, 0-3 is not; 2-3 is similar too
+    assert job_clustering.cluster(vectors, threshold=0.8) == [[0, 1, 2, 3]]
+    assert job_clustering.cluster(vectors, threshold=0.99) == []
+    # Neighbours are direct matches only, most similar first
+    assert job_clustering.neighbours(vectors, 0, threshold=0.8) == [1]
+    assert job_clustering.neighbours(vectors, 3, threshold=0.8) == [1, 2]
+
+    # Blocks give the same pairs as one full matrix
+    rng = np.random.default_rng(1)
+    vectors = rng.normal(size=(300, 8)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    full = vectors @ vectors.T
+    expected = {(i, j) for i, j in zip(*np.nonzero(full >= 0.8)) if i < j}
+    block_size, job_clustering.BLOCK_SIZE = job_clustering.BLOCK_SIZE, 64
+    try:
+        assert set(map(tuple, job_clustering.similar_pairs(vectors, 0.8).tolist())) == expected
+    finally:
+        job_clustering.BLOCK_SIZE = block_size
+
+
+def test_similar_jobs_follow_job_writes():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "clustering_test.db"))
+        user_id = db.create_user("alice", "secret")
+        acme = db.add_target_job(user_id, "Acme", "Analyst", None, ANALYST_JOB.format(company="Acme", cadence="weekly"))
+        globex = db.add_target_job(user_id, "Globex", "Analyst", None,
+                                   ANALYST_JOB.format(company="Globex", cadence="monthly"))
+        db.add_target_job(user_id, "Initech", "Buyer", None, PROCUREMENT_JOB)
+
+        assert [job['id'] for job in resume_service.similar_jobs(db, user_id, acme)] == [globex]
+        assert [[job['company_name'] for job in group]
+                for group in resume_service.similar_job_groups(db, user_id)] == [["Globex", "Acme"]]
+
+        # Edited descriptions are re-embedded; deleted jobs drop out
+        db.update_job_description(globex, PROCUREMENT_JOB)
+        assert resume_service.similar_jobs(db, user_id, acme) == []
+        db.delete_target_job(globex)
+        jobs, vectors = db.get_job_vectors(user_id)
+        assert len(jobs) == 2 and vectors.shape[0] == 2
+
+
+if __name__ == "__main__":
+    test_cluster_links_transitively()
+    test_similar_jobs_follow_job_writes()
+    print("+ All job clustering tests passed!")
@@ -0,0 +1,70 @@
+"""
+Test site-specific job description extractors against saved job board pages
+"""
+import glob
+import os
+import re
+import job_extractors
+import metrics
+from web_scraper import extract_description
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "job_pages")
+
+# fixture -> (extractor expected to answer, first line, a duty line, page noise that must be left out)
+EXPECTED = {
+    "greenhouse.html": ("greenhouse", "Senior Data Analyst", "Own forecasting models for weekly demand planning",
+                        "Submit Application"),
+    "lever.html": ("lever", "Analytics Engineer", "Review SQL from analysts and raise the bar on testing",
+                   "Apply for this job"),
+    "workday.html": ("json_ld_job_posting", "Procurement Manager", "Run RFP processes with legal and engineering",
+                     "JavaScript"),
+    "linkedin.html": ("linkedin", "Product Analyst", "Build self-serve Looker dashboards for the search organization",
+                      "Similar jobs"),
+    "generic_jsonld.html": ("json_ld_job_posting", "Clinical Data Manager", "Coordinate database lock with biostatistics",
+                            "parental leave"),
+}
+
+
+def load_page(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        content = f.read()
+    return content, re.search(rb'rel="canonical" href="([^"]+)"', content).group(1).decode()
+
+
+def test_dispatch_by_hostname():
+    names = lambda url: [func.__name__ for func in job_extractors.extractors_for(url)]
+    assert names("https://boards.greenhouse.io/acme/jobs/1") == ["greenhouse", "json_ld_job_posting"]
+    assert names("https://initech.wd5.myworkdayjobs.com/Careers/job/1") == ["workday", "json_ld_job_posting"]
+    assert names("https://notgreenhouse.io/jobs/1") == ["json_ld_job_posting"]
+
+
+def test_fixtures_extract_only_the_posting():
+    assert sorted(EXPECTED) == sorted(os.path.basename(path) for path in glob.glob(os.path.join(FIXTURES, "*.html")))
+    for name, (extractor, title, duty, noise) in EXPECTED.items():
+        content, url = load_page(name)
+        answered = metrics.SCRAPE_EXTRACTORS.value(extractor=extractor)
+        text = extract_description(content, url)
+        assert metrics.SCRAPE_EXTRACTORS.value(extractor=extractor) == answered + 1, name
+        assert text.split("\n")[0] == title, name
+        assert duty in text.split("\n") and noise not in text, name
+        assert len(text) > 200, name
+
+
+def test_failing_extractor_is_skipped():
+    @job_extractors.register("example.test")
+    def broken(soup):
+        raise AttributeError("'NoneType' object has no attribute 'get_text'")
+
+    try:
+        content, _ = load_page("generic_jsonld.html")
+        text = extract_description(content, "https://jobs.example.test/1")
+        assert text.split("\n")[0] == "Clinical Data Manager"
+    finally:
+        del job_extractors.EXTRACTORS["example.test"]
+
+
+if __name__ == "__main__":
+    test_dispatch_by_hostname()
+    test_fixtures_extract_only_the_posting()
+    test_failing_extractor_is_skipped()
+    print("+ All job extractor tests passed!")
@@ -0,0 +1,68 @@
+"""
+Test the Prometheus text rendering of the metrics registry
+"""
+import threading
+import time
+from metrics import MetricsRegistry
+
+
+def test_counter_and_histogram_render():
+    """Counters render per label set; histogram buckets are cumulative"""
+    registry = MetricsRegistry()
+    calls = registry.counter("test_calls_total", "Calls", ["outcome"])
+    latency = registry.histogram("test_latency_seconds", "Latency", buckets=(0.1, 1.0))
+
+    calls.inc(outcome="success")
+    calls.inc(2, outcome="success")
+    calls.inc(outcome="error")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5)
+
+    text = registry.render()
+
+    assert "# TYPE test_calls_total counter" in text
+    assert 'test_calls_total{outcome="success"} 3' in text
+    assert 'test_calls_total{outcome="error"} 1' in text
+    assert 'test_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'test_latency_seconds_bucket{le="1"} 2' in text
+    assert 'test_latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "test_latency_seconds_count 3" in text
+
+
+def test_label_mismatch_rejected():
+    registry = MetricsRegistry()
+    calls = registry.counter("test_calls_total", "Calls", ["outcome"])
+    try:
+        calls.inc(result="success")
+    except ValueError:
+        return
+    raise AssertionError("expected ValueError for unknown label")
+
+
+def test_timer_decorator_times_each_call():
+    """Overlapping calls of one decorated function each observe their own duration"""
+    registry = MetricsRegistry()
+    latency = registry.histogram("test_latency_seconds", "Latency", buckets=(0.25,))
+
+    @latency.time()
+    def work(seconds):
+        time.sleep(seconds)
+
+    slow = threading.Thread(target=work, args=(0.4,))
+    slow.start()
+    # Starts late in the slow call, so a shared start time would shorten it below 0.25s
+    time.sleep(0.3)
+    work(0)
+    slow.join()
+
+    text = registry.render()
+    assert 'test_latency_seconds_bucket{le="0.25"} 1' in text
+    assert "test_latency_seconds_count 2" in text
+
+
+if __name__ == "__main__":
+    test_counter_and_histogram_render()
+    test_label_mismatch_rejected()
+    test_timer_decorator_times_each_call()
+    print("+ All metrics tests passed!")
@@ -0,0 +1,103 @@
+"""
+Test the layout estimator and the one-page fit loop
+"""
+from layout_estimator import count_lines, text_width
+import metrics
+from resume_renderer import (
+    TEMPLATE_STYLES, _drop_lowest_ranked, _render_experience, build_resume_html,
+    clear_render_caches, fit_resume, scale_style
+)
+
+PROFILE = {
+    'full_name': 'Jane Doe',
+    'email': 'jane@example.com',
+    'education': [{'degree': 'B.S. Statistics', 'school': 'University of Texas', 'year': '2015'}],
+    'skills': ['SQL', 'Python'],
+}
+
+
+def make_resume(experiences: int, bullets: int):
+    exps = [
+        {'id': i, 'company_name': f"Company {i}", 'job_title': 'Analyst', 'start_date': '2020', 'end_date': None}
+        for i in range(experiences)
+    ]
+    text = "Built forecasting models in Python and SQL that cut inventory costs by 12% across regions"
+    return exps, {i: [f"{text} ({j})" for j in range(bullets)] for i in range(experiences)}
+
+
+def test_text_metrics():
+    assert text_width("iiii", 10) < text_width("MMMM", 10)
+    assert text_width("Sales", 10, bold=True) > text_width("Sales", 10)
+    assert count_lines("", 10, 100) == 1
+    assert count_lines("word " * 40, 10, 100) > count_lines("word " * 10, 10, 100)
+
+
+def test_scale_style():
+    style = scale_style("classic", font_scale=0.5, spacing_scale=0.5)
+    assert style['font_size'] == TEMPLATE_STYLES['classic']['font_size'] * 0.5
+    assert style['job_gap'] == TEMPLATE_STYLES['classic']['job_gap'] * 0.5
+    assert style['line_height'] == TEMPLATE_STYLES['classic']['line_height']
+
+
+def test_drops_last_bullet_of_longest_experience():
+    order = {1: 0, 2: 1, 3: 2}
+    bullets = {1: ["a", "b", "c"], 2: ["d", "e", "f"], 3: ["g", "h"]}
+    assert _drop_lowest_ranked(bullets, order)
+    assert bullets == {1: ["a", "b", "c"], 2: ["d", "e"], 3: ["g", "h"]}
+    assert _drop_lowest_ranked(bullets, order)
+    assert bullets[1] == ["a", "b"]
+    assert not _drop_lowest_ranked(bullets, order)
+
+    # Ties follow display order, not the order the bullets dict was built in
+    bullets = {2: ["d", "e", "f"], 1: ["a", "b", "c"]}
+    assert _drop_lowest_ranked(bullets, {2: 0, 1: 1})
+    assert bullets == {2: ["d", "e", "f"], 1: ["a", "b"]}
+
+
+def test_short_resume_renders_once_untouched():
+    experiences, bullets = make_resume(2, 3)
+    result = fit_resume(PROFILE, experiences, bullets)
+    assert result['pages'] == 1
+    assert result['renders'] == 1
+    assert result['dropped_bullets'] == 0
+    assert result['style'] == TEMPLATE_STYLES['classic']
+
+
+def test_long_resume_is_fitted_to_one_page():
+    experiences, bullets = make_resume(6, 10)
+    result = fit_resume(PROFILE, experiences, bullets)
+    assert result['pages'] == 1
+    assert result['dropped_bullets'] > 0
+    # Lowest-ranked bullets go first
+    assert all(result['bullets'][i] == bullets[i][:len(result['bullets'][i])] for i in bullets)
+
+
+def test_edit_rerenders_only_changed_section():
+    """Unchanged experiences come from the section cache; an unchanged resume reuses its PDF"""
+    clear_render_caches()
+    experiences, bullets = make_resume(3, 3)
+    build_resume_html(PROFILE, experiences, bullets)
+
+    edited = dict(bullets)
+    edited[1] = bullets[1][:-1] + ["Edited during review"]
+    before = _render_experience.cache_info()
+    build_resume_html(PROFILE, experiences, edited)
+    after = _render_experience.cache_info()
+    assert after.hits - before.hits == 2
+    assert after.misses - before.misses == 1
+
+    cached_before = metrics.PDF_RENDERS.value(outcome="cached")
+    first = fit_resume(PROFILE, experiences, edited)
+    second = fit_resume(PROFILE, experiences, edited)
+    assert second['pdf_bytes'] == first['pdf_bytes']
+    assert metrics.PDF_RENDERS.value(outcome="cached") == cached_before + 1
+
+
+if __name__ == "__main__":
+    test_text_metrics()
+    test_scale_style()
+    test_drops_last_bullet_of_longest_experience()
+    test_short_resume_renders_once_untouched()
+    test_long_resume_is_fitted_to_one_page()
+    test_edit_rerenders_only_changed_section()
+    print("+ All page fit tests passed!")
@@ -0,0 +1,76 @@
+"""
+Test reusing bullets generated earlier for similar target jobs
+"""
+import json
+import os
+import tempfile
+import config
+import resume_service
+from database import Database
+from llm_backends import FakeBackend
+from llm_processor_web import ResumeOptimizer
+from test_database_cache import CountingDatabase
+from test_job_clustering import ANALYST_JOB, PROCUREMENT_JOB
+
+ENGINEER_JOB = ANALYST_JOB.replace("Senior Data Analyst", "Data Engineer").replace(
+    "Build Tableau dashboards and SQL reporting for executive stakeholders",
+    "Design Spark streaming pipelines on Kafka"
+)
+TAILORED = ["Built executive Tableau dashboards on SQL reporting"]
+
+
+def test_prior_bullets_reused_or_seeded():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "prior_test.db"))
+        user_id = db.create_user("alice", "secret")
+        exp_id = db.add_work_experience(user_id, "Acme", "Analyst", "2020", None, True, [
+            "Built Tableau dashboards for the executive team",
+            "Negotiated vendor contracts saving $400K a year",
+        ])
+        first = db.add_target_job(user_id, "Acme", "Analyst", None, ANALYST_JOB.format(company="Acme", cadence="weekly"))
+        db.save_generated_resume(user_id, first, json.dumps({exp_id: TAILORED}), "<html></html>", "acme")
+
+        backend = FakeBackend(latency_mean=0, latency_stddev=0)
+        optimizer = ResumeOptimizer(api_key="", backend=backend)
+
+        def generate(company, description):
+            job = db.get_target_job(db.add_target_job(user_id, company, "Analyst", None, description))
+            return resume_service.generate_tailored_bullets(db, optimizer, user_id, job, target_count=2)
+
+        # Near-identical posting: the earlier bullets are used as they are
+        bullets, _, prior = generate("Globex", ANALYST_JOB.format(company="Globex", cadence="monthly"))
+        assert bullets == {exp_id: TAILORED} and backend.call_count == 0
+        assert prior['job_id'] == first and prior['calls_avoided'] == 1
+        assert prior['similarity'] >= config.PRIOR_REUSE_SIMILARITY
+
+        # Related role: the LLM is still called, with the earlier bullets as an example
+        bullets, _, prior = generate("Initech", ENGINEER_JOB.format(company="Initech", cadence="weekly"))
+        assert backend.call_count == 1 and len(bullets[exp_id]) == 2
+        assert prior['calls_avoided'] == 0 and prior['prompts_seeded'] == 1
+
+        # Unrelated role: no earlier job is used
+        _, _, prior = generate("Hooli", PROCUREMENT_JOB)
+        assert prior is None and backend.call_count == 2
+
+
+def test_prior_generations_follow_description_edits():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = CountingDatabase(os.path.join(tmp, "prior_test.db"), cache_size=100)
+        user_id = db.create_user("alice", "secret")
+        job_id = db.add_target_job(user_id, "Acme", "Analyst", None, ANALYST_JOB.format(company="Acme", cadence="weekly"))
+        db.save_generated_resume(user_id, job_id, json.dumps({1: TAILORED}), "<html></html>", "acme")
+
+        # Resume listings are cached; prior generations are read fresh every time
+        assert len(db.get_user_resumes(user_id)) == 1
+        connections = db.connections
+        assert len(db.get_user_resumes(user_id)) == 1
+        assert db.connections == connections
+        before = resume_service.find_prior_generation(db, user_id, None, PROCUREMENT_JOB)['similarity']
+        db.update_job_description(job_id, PROCUREMENT_JOB)
+        assert resume_service.find_prior_generation(db, user_id, None, PROCUREMENT_JOB)['similarity'] > before
+
+
+if __name__ == "__main__":
+    test_prior_bullets_reused_or_seeded()
+    test_prior_generations_follow_description_edits()
+    print("+ All prior generation tests passed!")
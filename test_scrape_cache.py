@@ -0,0 +1,91 @@
+"""
+Test the shared scrape cache
+"""
+import os
+import tempfile
+import requests
+import config
+import metrics
+import web_scraper
+from database import Database
+from web_scraper import normalize_url, scrape_job_description
+
+URL = "https://boards.greenhouse.io/acme/jobs/4012345?gh_jid=4012345"
+DESCRIPTION = "Senior Data Analyst\nBuild Tableau dashboards and SQL reporting for executives"
+
+
+def test_normalize_url():
+    assert normalize_url("HTTPS://www.Boards.Greenhouse.io/acme/jobs/4012345/?utm_source=linkedin&gh_jid=4012345"
+                         "&gh_src=abc#apply") == URL
+    assert normalize_url("https://jobs.lever.co/acme/1a2b?lever-source=LinkedIn") == "https://jobs.lever.co/acme/1a2b"
+    # Parameters that pick the job are kept, in a stable order
+    assert normalize_url("https://linkedin.com/jobs/search?keywords=analyst&currentJobId=99&trk=feed") == \
+        "https://linkedin.com/jobs/search?currentJobId=99&keywords=analyst"
+
+
+def test_cached_and_failed_scrapes_are_reused():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "scrape_cache_test.db"))
+        db.save_scrape(URL, DESCRIPTION, "success")
+        assert scrape_job_description(URL + "&utm_campaign=share", db) == DESCRIPTION
+
+        failed = "https://jobs.example.invalid/1"
+        db.save_scrape(failed, None, "not_found")
+        failure_hits = metrics.SCRAPE_CACHE.value(result="failure_hit")
+        assert scrape_job_description(failed, db) is None
+        assert metrics.SCRAPE_CACHE.value(result="failure_hit") == failure_hits + 1
+
+        # Entries older than the TTL are fetched again (.invalid never resolves)
+        expired = "https://jobs.example.invalid/2"
+        db.save_scrape(expired, DESCRIPTION, "success")
+        ttl, config.SCRAPE_CACHE_TTL = config.SCRAPE_CACHE_TTL, -1
+        try:
+            assert scrape_job_description(expired, db) is None
+        finally:
+            config.SCRAPE_CACHE_TTL = ttl
+        # The lookup failure is transient, so it does not replace the old entry
+        assert db.get_cached_scrape(expired)['status'] == "success"
+
+
+def fake_get(status_code):
+    def get(url, **kwargs):
+        response = requests.Response()
+        response.status_code = status_code
+        response.url = url
+        return response
+    return get
+
+
+def test_only_permanent_failures_are_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "scrape_cache_test.db"))
+        gone = "https://gone.example.invalid/1"
+        flaky = "https://flaky.example.invalid/1"
+        # A timeout cached by an older version is retried rather than served
+        db.save_scrape(flaky, None, "timeout")
+
+        real_get = web_scraper.requests.get
+        try:
+            web_scraper.requests.get = fake_get(404)
+            assert scrape_job_description(gone, db) is None
+            assert db.get_cached_scrape(gone)['status'] == "not_found"
+
+            web_scraper.requests.get = fake_get(502)
+            misses = metrics.SCRAPE_CACHE.value(result="miss")
+            assert scrape_job_description(flaky, db) is None
+            assert scrape_job_description(flaky, db) is None
+            assert metrics.SCRAPE_CACHE.value(result="miss") == misses + 2
+            assert db.get_cached_scrape(flaky)['status'] == "timeout"
+
+            # The 404 is served from the cache without a fetch
+            failure_hits = metrics.SCRAPE_CACHE.value(result="failure_hit")
+            assert scrape_job_description(gone, db) is None
+            assert metrics.SCRAPE_CACHE.value(result="failure_hit") == failure_hits + 1
+        finally:
+            web_scraper.requests.get = real_get
+
+if __name__ == "__main__":
+    test_normalize_url()
+    test_cached_and_failed_scrapes_are_reused()
+    test_only_permanent_failures_are_cached()
+    print("+ All scrape cache tests passed!")
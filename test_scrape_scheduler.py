@@ -0,0 +1,69 @@
+"""
+Test per-host scrape pacing and fair queueing
+"""
+import threading
+import time
+from scrape_scheduler import HostScheduler, SlotTimeout, parse_retry_after
+
+
+def run_fetches(scheduler, requests, hold=0.0):
+    """Take a slot for each (url, user) on its own thread; returns (url, user, start) in start order"""
+    starts, lock = [], threading.Lock()
+
+    def fetch(url, user):
+        with scheduler.slot(url, user):
+            with lock:
+                starts.append((url, user, time.monotonic()))
+            time.sleep(hold)
+
+    threads = []
+    for url, user in requests:
+        threads.append(threading.Thread(target=fetch, args=(url, user)))
+        threads[-1].start()
+        # Queue in a known order
+        time.sleep(0.005)
+    for thread in threads:
+        thread.join()
+    return starts
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after(None) is None and parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+
+def test_hosts_are_paced_and_users_take_turns():
+    scheduler = HostScheduler(concurrency=1, delay=0.1, queue_timeout=5)
+    board, other = "https://boards.greenhouse.io/a/jobs/1", "https://jobs.lever.co/b/2"
+    starts = run_fetches(scheduler, [(board, 1), (board, 1), (board, 1), (board, 2), (other, 3)])
+
+    # The other host does not wait behind the busy one
+    assert starts[1][0] == other
+    board_starts = [(user, start) for url, user, start in starts if url == board]
+    # User 2 queued last but is served before user 1's third request
+    assert [user for user, _ in board_starts] == [1, 1, 2, 1]
+    assert all(later - earlier >= 0.099 for (_, earlier), (_, later) in zip(board_starts, board_starts[1:]))
+
+
+def test_retry_after_and_queue_timeout():
+    scheduler = HostScheduler(concurrency=2, delay=0, queue_timeout=0.05)
+    url = "https://www.myworkday.com/acme/job/1"
+    scheduler.retry_after("https://myworkday.com/acme/job/2", 0.2)
+    try:
+        with scheduler.slot(url):
+            raise AssertionError("slot granted while the host asked us to wait")
+    except SlotTimeout:
+        pass
+
+    scheduler.queue_timeout = 1
+    start = time.monotonic()
+    with scheduler.slot(url, user=1):
+        assert time.monotonic() - start >= 0.1
+
+
+if __name__ == "__main__":
+    test_parse_retry_after()
+    test_hosts_are_paced_and_users_take_turns()
+    test_retry_after_and_queue_timeout()
+    print("+ All scrape scheduler tests passed!")
@@ -0,0 +1,19 @@
+"""
+Test that app.py starts without importing its heavy dependencies
+"""
+from benchmark_import_time import measure, startup_modules
+
+
+def test_app_startup_skips_heavy_dependencies():
+    modules = startup_modules()
+    assert "streamlit" in modules
+    assert "warmup" in modules
+    assert "web_scraper" not in modules
+
+    _, loaded = measure(modules)
+    assert loaded == [], f"loaded at startup: {loaded}"
+
+
+if __name__ == "__main__":
+    test_app_startup_skips_heavy_dependencies()
+    print("+ Startup import test passed!")
@@ -0,0 +1,66 @@
+"""
+Test keyset pagination of the target jobs list
+"""
+import os
+import tempfile
+from database import Database
+
+
+def all_pages(db: Database, user_id: int, limit: int) -> list:
+    """Follow next_cursor from the first page to the last; returns the pages"""
+    pages = [db.get_target_job_summaries(user_id, limit=limit)]
+    while pages[-1]['next_cursor']:
+        pages.append(db.get_target_job_summaries(user_id, limit=limit, before=pages[-1]['next_cursor']))
+    return pages
+
+
+def test_pages_split_jobs_added_at_the_same_time():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "pagination_test.db"))
+        user_id = db.create_user("alice", "secret")
+        other_id = db.create_user("bob", "secret")
+        job_ids = [db.add_target_job(user_id, f"Company {i}", "Analyst", None, f"Description {i}") for i in range(7)]
+        db.add_target_job(other_id, "Hooli", "Analyst", None, "Not alice's")
+
+        # Five jobs share a timestamp, so page boundaries fall between equal date_added values
+        conn = db.get_connection()
+        conn.execute("UPDATE target_jobs SET date_added = '2024-05-01 09:00:00' WHERE id IN (?, ?, ?, ?, ?)",
+                     job_ids[1:6])
+        conn.execute("UPDATE target_jobs SET date_added = '2024-04-01 09:00:00' WHERE id = ?", (job_ids[0],))
+        conn.execute("UPDATE target_jobs SET date_added = '2024-06-01 09:00:00' WHERE id = ?", (job_ids[6],))
+        conn.commit()
+        conn.close()
+
+        pages = all_pages(db, user_id, limit=2)
+        listed = [job['id'] for page in pages for job in page['jobs']]
+        # Newest first, ties by id descending, each job exactly once
+        assert listed == [job_ids[6], job_ids[5], job_ids[4], job_ids[3], job_ids[2], job_ids[1], job_ids[0]]
+        assert [len(page['jobs']) for page in pages] == [2, 2, 2, 1]
+        assert pages[1]['next_cursor'] == ('2024-05-01 09:00:00', job_ids[3])
+        assert pages[-1]['next_cursor'] is None
+
+
+def test_last_and_empty_pages():
+    with tempfile.TemporaryDirectory() as tmp:
+        db = Database(os.path.join(tmp, "pagination_test.db"))
+        user_id = db.create_user("alice", "secret")
+        assert db.get_target_job_summaries(user_id) == {'jobs': [], 'next_cursor': None}
+
+        for i in range(4):
+            db.add_target_job(user_id, f"Company {i}", "Analyst", None, "x" * 600)
+
+        # A page exactly as long as what is left is the last one
+        page = db.get_target_job_summaries(user_id, limit=4)
+        assert len(page['jobs']) == 4 and page['next_cursor'] is None
+        assert page['jobs'][0]['description_length'] == 600 and len(page['jobs'][0]['description_preview']) == 500
+
+        # A cursor past the oldest job gives an empty page
+        oldest = page['jobs'][-1]
+        assert db.get_target_job_summaries(user_id, before=(oldest['date_added'], oldest['id'])) == \
+            {'jobs': [], 'next_cursor': None}
+
+
+if __name__ == "__main__":
+    test_pages_split_jobs_added_at_the_same_time()
+    test_last_and_empty_pages()
+    print("+ All target job pagination tests passed!")
@@ -0,0 +1,103 @@
+"""
+Test job description trimming before prompting
+"""
+from token_budget import estimate_tokens, trim_job_description
+
+SAMPLE_JOB = """Senior Data Analyst
+About Us:
+We are a fast-growing fintech on a mission to make money simple for everyone.
+Our culture values curiosity and ownership.
+Responsibilities:
+Build dashboards and forecasting models in Python and SQL
+Partner with product managers to design and analyze A/B tests
+Requirements:
+5+ years of experience in analytics or data science
+Expert SQL and working knowledge of Python
+Benefits:
+Unlimited PTO and a generous 401(k) match
+Medical, dental and vision insurance
+We are an equal opportunity employer and consider all applicants without regard to race, color, religion or sex.
+"""
+
+
+def test_strips_low_signal_sections():
+    """EEO, benefits and about-us text is removed; requirements stay"""
+    result = trim_job_description(SAMPLE_JOB, token_budget=0)
+
+    assert "Expert SQL" in result.text
+    assert "A/B tests" in result.text
+    assert "401(k)" not in result.text
+    assert "fintech" not in result.text
+    assert "equal opportunity" not in result.text
+    assert result.removed == ["about_us", "benefits"]
+    assert result.tokens_saved > 0
+    assert result.original_tokens == estimate_tokens(SAMPLE_JOB)
+
+
+def test_budget_keeps_requirements_first():
+    """A tight budget drops neutral text before responsibilities/requirements"""
+    filler = "Neutral:\n" + "\n".join(f"Filler line number {i} about the office" for i in range(50))
+    result = trim_job_description(filler + "\n" + SAMPLE_JOB, token_budget=80)
+
+    assert result.tokens <= 80
+    assert "Expert SQL" in result.text
+    assert "Filler line number 49" not in result.text
+    assert "truncated" in result.removed
+
+
+def test_duty_headings_mentioning_pay_or_notices_stay():
+    """Only boilerplate headings are dropped, not duties that share a word with them"""
+    job = """Compensation Analyst
+Compensation Planning:
+Run the annual merit and bonus cycle across 40 countries
+Customer Notice Workflows:
+Own the templates for rate-change letters
+Compensation:
+$90,000 - $110,000 base
+Notice to Recruiters:
+We do not accept unsolicited resumes from agencies
+"""
+    result = trim_job_description(job, token_budget=0)
+
+    assert "merit and bonus cycle" in result.text
+    assert "rate-change letters" in result.text
+    assert "$90,000" not in result.text
+    assert "unsolicited" not in result.text
+    assert result.removed == ["benefits", "legal"]
+
+
+def test_short_requirement_lines_are_not_headings():
+    """Short lines starting with a boilerplate word are requirements unless marked as headings"""
+    job = """Paralegal
+Requirements:
+Legal research and writing
+Manage case files and discovery
+Coordinate with court clerks
+Diversity and inclusion programs
+**Benefits**
+Dental and vision
+LEGAL NOTICE
+This posting is not a contract
+"""
+    result = trim_job_description(job, token_budget=0)
+
+    assert "Legal research and writing" in result.text
+    assert "Coordinate with court clerks" in result.text
+    assert "Diversity and inclusion programs" in result.text
+    assert "Dental" not in result.text and "contract" not in result.text
+    assert result.removed == ["benefits", "legal"]
+
+
+def test_empty_description():
+    result = trim_job_description("", token_budget=100)
+    assert result.text == ""
+    assert result.tokens_saved == 0
+
+
+if __name__ == "__main__":
+    test_strips_low_signal_sections()
+    test_budget_keeps_requirements_first()
+    test_duty_headings_mentioning_pay_or_notices_stay()
+    test_short_requirement_lines_are_not_headings()
+    test_empty_description()
+    print("+ All token budget tests passed!")
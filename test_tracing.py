@@ -0,0 +1,107 @@
+"""
+Test span timing, nesting, summaries, OTLP export and span listeners
+"""
+import json
+import os
+import tempfile
+import time
+import tracing
+from tracing import FileSpanExporter, span, traced
+
+
+def test_percentiles_and_summary():
+    values = [float(i) for i in range(1, 101)]
+    assert tracing._percentile(values, 0.50) == 50.0
+    assert tracing._percentile(values, 0.95) == 95.0
+    assert tracing._percentile([7.0], 0.95) == 7.0
+
+    tracing.reset()
+    for seconds in (0.001, 0.001, 0.02):
+        with span("test.stage"):
+            time.sleep(seconds)
+    stats = tracing.summary()["test.stage"]
+    assert stats["count"] == 3
+    assert 1 <= stats["p50_ms"] < 20 <= stats["max_ms"] == stats["p95_ms"]
+    assert "test.stage" in tracing.format_summary()
+    tracing.reset()
+    assert "test.stage" not in tracing.summary()
+
+
+def test_spans_nest_within_a_trace():
+    finished = []
+    tracing.add_span_listener(finished.append)
+    try:
+        @traced("test.inner")
+        def inner():
+            pass
+
+        with span("test.outer", user_id=1) as outer:
+            inner()
+            with span("test.inner"):
+                pass
+        with span("test.outer"):
+            pass
+    finally:
+        tracing._listeners.remove(finished.append)
+
+    first_inner, second_inner, first_outer, second_outer = finished
+    assert [s.name for s in finished] == ["test.inner", "test.inner", "test.outer", "test.outer"]
+    assert first_outer is outer and outer.parent_id is None and outer.attributes == {"user_id": 1}
+    assert first_inner.parent_id == second_inner.parent_id == outer.span_id
+    assert first_inner.trace_id == outer.trace_id
+    # A new top-level span starts a new trace
+    assert second_outer.trace_id != outer.trace_id
+    assert outer.duration_ns >= first_inner.duration_ns + second_inner.duration_ns
+
+
+def test_otlp_export_and_errors():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "spans.jsonl")
+        previous = tracing._exporter
+        tracing.set_exporter(FileSpanExporter(path))
+        try:
+            with span("test.export", template="classic", attempt=2):
+                try:
+                    with span("test.failing"):
+                        raise ValueError("bad bullet")
+                except ValueError:
+                    pass
+        finally:
+            tracing.set_exporter(previous)
+
+        with open(path, encoding="utf-8") as f:
+            exported = [json.loads(line)["resourceSpans"][0]["scopeSpans"][0]["spans"][0] for line in f]
+
+    failing, parent = exported
+    assert failing["parentSpanId"] == parent["spanId"] and "parentSpanId" not in parent
+    assert failing["status"] == {"code": 2, "message": "ValueError: bad bullet"}
+    assert parent["status"] == {"code": 1}
+    assert {"key": "template", "value": {"stringValue": "classic"}} in parent["attributes"]
+    assert {"key": "attempt", "value": {"intValue": "2"}} in parent["attributes"]
+    assert int(parent["endTimeUnixNano"]) >= int(parent["startTimeUnixNano"])
+
+
+def test_failing_listener_does_not_break_the_span():
+    seen = []
+
+    def broken(finished):
+        raise RuntimeError("metrics backend down")
+
+    tracing.add_span_listener(broken)
+    tracing.add_span_listener(seen.append)
+    try:
+        with span("test.listened"):
+            value = 42
+    finally:
+        tracing._listeners.remove(broken)
+        tracing._listeners.remove(seen.append)
+
+    assert value == 42 and [s.name for s in seen] == ["test.listened"]
+
+
+if __name__ == "__main__":
+    test_percentiles_and_summary()
+    test_spans_nest_within_a_trace()
+    test_otlp_export_and_errors()
+    test_failing_listener_does_not_break_the_span()
+    print("+ All tracing tests passed!")
@@ -0,0 +1,189 @@
+"""
+Token budget estimation and job description trimming
+
+Scraped job postings carry a lot of text that does nothing for bullet tailoring:
+EEO statements, benefits lists, "about us" blurbs and legal notices. This module
+splits a description into sections, drops the low-signal ones and truncates what
+is left to a token budget, keeping responsibilities and requirements first.
+"""
+import re
+from typing import List, Tuple
+
+# About 4 characters per token for English prose
+CHARS_PER_TOKEN = 4
+
+# Headings whose sections are worth keeping even when the budget is tight
+HIGH_SIGNAL_HEADINGS = re.compile(
+    r"responsibilit|requirement|qualification|what you.?ll do|what you will do|"
+    r"what we.?re looking for|who you are|you have|you will|skills|experience|"
+    r"duties|the role|about the role|role overview|job description|nice to have|preferred",
+    re.IGNORECASE
+)
+
+# Headings whose sections are dropped entirely; each must match the whole heading
+# (without its markers), so "Legal research:" or "Compensation Planning:" stay
+LOW_SIGNAL_HEADINGS = [
+    ("eeo", re.compile(
+        r"(our )?(commitment to )?(equal (employment )?opportunit(y|ies)( employer)?|eeo( statement)?|"
+        r"diversity( (and|&) inclusion)?|(diversity, )?equity( (and|&) inclusion)?|inclusion|"
+        r"(reasonable )?accommodations?)( statement)?",
+        re.IGNORECASE
+    )),
+    ("benefits", re.compile(
+        r"(our |the )?(benefits?|perks)(,? (and|&) (perks|benefits))?|what we offer|"
+        r"compensation(,? (and|&) benefits| range| details| package)?|salary( range)?|pay range|"
+        r"total rewards|why join( us)?",
+        re.IGNORECASE
+    )),
+    ("about_us", re.compile(
+        r"about (us|the company|our company)|who we are|our (mission|story|culture|values)|company overview",
+        re.IGNORECASE
+    )),
+    ("legal", re.compile(
+        r"legal( notice| disclaimer)?|disclaimer|(applicant |candidate )?privacy( notice| policy)?|"
+        r"notice to (applicants|candidates|agencies|recruiters)|e-?verify|background checks?|"
+        r"recruit(ing|ment) fraud( notice| alert)?",
+        re.IGNORECASE
+    )),
+]
+
+# Boilerplate sentences that show up without a heading of their own
+LOW_SIGNAL_LINES = [
+    ("eeo", re.compile(
+        r"equal (employment )?opportunity|without regard to|regardless of (race|age|gender)|"
+        r"race, (color|colour)|protected veteran|sexual orientation|reasonable accommodation",
+        re.IGNORECASE
+    )),
+    ("legal", re.compile(r"e-?verify|privacy (policy|notice)|applicant privacy|fraudulent (job|recruit)", re.IGNORECASE)),
+]
+
+MAX_HEADING_LENGTH = 60
+
+
+class TrimmedJobDescription:
+    """Result of trimming a job description to a token budget"""
+
+    def __init__(self, text: str, original_tokens: int, tokens: int, removed: List[str]):
+        self.text = text
+        self.original_tokens = original_tokens
+        self.tokens = tokens
+        self.removed = removed
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.tokens
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate token count without calling a tokenizer"""
+    if not text:
+        return 0
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+def _is_heading(line: str) -> bool:
+    """
+    Short lines ending with a colon, marked up as markdown headings or bold, or in
+    all caps are section headings; anything else, however short, is content
+    """
+    if len(line) > MAX_HEADING_LENGTH:
+        return False
+    if line.endswith(':') or line.startswith('#'):
+        return True
+    if len(line) > 4 and (line[:2] == line[-2:] == '**' or line[:2] == line[-2:] == '__'):
+        return True
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and line.upper() == line
+
+
+def _heading_text(heading: str) -> str:
+    """A heading without its markdown markers and trailing colon"""
+    return heading.strip('#*_: \t').rstrip(':').strip()
+
+
+def _split_sections(text: str) -> List[Tuple[str, List[str]]]:
+    """Split text into (heading, lines) pairs; text before the first heading has an empty heading"""
+    sections = [("", [])]
+    for raw_line in text.split('\n'):
+        line = raw_line.strip()
+        if not line:
+            continue
+        if _is_heading(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return [(heading, lines) for heading, lines in sections if heading or lines]
+
+
+def _classify_heading(heading: str) -> str:
+    """Return 'high', 'neutral', or the low-signal label for a heading"""
+    if not heading:
+        return "neutral"
+    text = _heading_text(heading)
+    for label, pattern in LOW_SIGNAL_HEADINGS:
+        if pattern.fullmatch(text):
+            return label
+    if HIGH_SIGNAL_HEADINGS.search(heading):
+        return "high"
+    return "neutral"
+
+
+def trim_job_description(text: str, token_budget: int) -> TrimmedJobDescription:
+    """
+    Strip low-signal sections and truncate a job description to a token budget
+
+    Args:
+        text: Raw job description (pasted or scraped)
+        token_budget: Maximum estimated tokens to keep (0 disables truncation)
+
+    Returns:
+        TrimmedJobDescription with the kept text and token accounting
+    """
+    original_tokens = estimate_tokens(text)
+    if not text:
+        return TrimmedJobDescription("", 0, 0, [])
+
+    removed = []
+    kept = []  # (priority, heading, lines) in original order
+    for heading, lines in _split_sections(text):
+        kind = _classify_heading(heading)
+        if kind not in ("high", "neutral"):
+            removed.append(kind)
+            continue
+
+        clean_lines = []
+        for line in lines:
+            label = next((label for label, pattern in LOW_SIGNAL_LINES if pattern.search(line)), None)
+            if label:
+                removed.append(label)
+            else:
+                clean_lines.append(line)
+
+        if clean_lines or kind == "high":
+            kept.append((0 if kind == "high" else 1, heading, clean_lines))
+
+    # Fill the budget with requirement/responsibility sections first, then the rest
+    if token_budget:
+        char_budget = token_budget * CHARS_PER_TOKEN
+        allowed = {}
+        for index in sorted(range(len(kept)), key=lambda i: kept[i][0]):
+            _, heading, lines = kept[index]
+            taken = []
+            for line in ([heading] if heading else []) + lines:
+                if len(line) + 1 > char_budget:
+                    break
+                taken.append(line)
+                char_budget -= len(line) + 1
+            if heading and lines and len(taken) == 1:
+                # Don't leave a heading with nothing under it
+                char_budget += len(heading) + 1
+                taken = []
+            allowed[index] = taken
+            if len(taken) < len(lines) + (1 if heading else 0):
+                removed.append("truncated")
+        output_lines = [line for index in range(len(kept)) for line in allowed.get(index, [])]
+    else:
+        output_lines = [line for _, heading, lines in kept for line in ([heading] if heading else []) + lines]
+
+    trimmed = '\n'.join(output_lines)
+    return TrimmedJobDescription(trimmed, original_tokens, estimate_tokens(trimmed), sorted(set(removed)))
@@ -0,0 +1,233 @@
+"""
+Lightweight tracing for the generation pipeline
+
+Wrap a stage in `with span("stage.name"):` (or decorate a function with
+`@traced("stage.name")`) to time it with a monotonic clock. Finished spans are
+logged as structured JSON, kept in a bounded per-stage sample for p50/p95
+summaries, and optionally appended to a local file in OTLP/JSON format so they can
+be loaded by OpenTelemetry tooling.
+"""
+import functools
+import json
+import logging
+import secrets
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+import config
+
+logger = logging.getLogger("resume_optimizer.tracing")
+if config.TRACE_LOG and not logger.handlers:
+    _handler = logging.StreamHandler()
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+_local = threading.local()
+_lock = threading.Lock()
+_durations: Dict[str, deque] = defaultdict(lambda: deque(maxlen=config.TRACE_SAMPLE_SIZE))
+_listeners: List[Callable[["Span"], None]] = []
+
+
+class Span:
+    """A single timed stage"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error = None
+        # Wall clock only anchors the exported timestamps; durations use the monotonic clock
+        self.start_unix_ns = time.time_ns()
+        self._start = time.perf_counter_ns()
+        self.duration_ns = 0
+
+    def set_attribute(self, key: str, value):
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float:
+        return self.duration_ns / 1e6
+
+    def to_log_record(self) -> Dict:
+        record = {
+            "span": self.name,
+            "duration_ms": round(self.duration_ms, 3),
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+        }
+        record.update(self.attributes)
+        if self.error:
+            record["error"] = self.error
+        return record
+
+
+class FileSpanExporter:
+    """Append finished spans to a file as OTLP/JSON lines (one export request per span)"""
+
+    def __init__(self, path: str, service_name: str = "resume-optimizer"):
+        self.path = path
+        self.service_name = service_name
+        self._lock = threading.Lock()
+
+    def export(self, span: Span):
+        otlp_span = {
+            "traceId": span.trace_id,
+            "spanId": span.span_id,
+            "name": span.name,
+            "kind": 1,
+            "startTimeUnixNano": str(span.start_unix_ns),
+            "endTimeUnixNano": str(span.start_unix_ns + span.duration_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in span.attributes.items()],
+            "status": {"code": 2, "message": span.error} if span.error else {"code": 1},
+        }
+        if span.parent_id:
+            otlp_span["parentSpanId"] = span.parent_id
+
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+            "scopeSpans": [{"scope": {"name": "resume_optimizer.tracing"}, "spans": [otlp_span]}],
+        }]}
+
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(payload) + "\n")
+
+
+def _otlp_attribute(key: str, value) -> Dict:
+    """Encode a Python value as an OTLP AnyValue attribute"""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+_exporter: Optional[FileSpanExporter] = FileSpanExporter(config.TRACE_EXPORT_PATH) if config.TRACE_EXPORT_PATH else None
+
+
+def set_exporter(exporter: Optional[FileSpanExporter]):
+    """Replace (or disable, with None) the span exporter"""
+    global _exporter
+    _exporter = exporter
+
+
+def add_span_listener(listener: Callable[[Span], None]):
+    """Call listener(span) for every finished span (e.g. to feed metrics)"""
+    _listeners.append(listener)
+
+
+def _stack() -> List[Span]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+@contextmanager
+def span(name: str, **attributes):
+    """
+    Time a block of code as a named stage
+
+    Nested spans on the same thread share a trace id and record their parent.
+    Attributes can be added while the span is open with span.set_attribute().
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    current = Span(
+        name,
+        trace_id=parent.trace_id if parent else secrets.token_hex(16),
+        parent_id=parent.span_id if parent else None,
+        attributes=attributes
+    )
+    stack.append(current)
+    try:
+        yield current
+    except Exception as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.duration_ns = time.perf_counter_ns() - current._start
+        stack.pop()
+        _finish(current)
+
+
+def traced(name: str):
+    """Decorator form of span() for whole functions and methods"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _finish(finished: Span):
+    with _lock:
+        _durations[finished.name].append(finished.duration_ms)
+
+    # Serializing every span (each db.* call included) is not free; skip it when nothing logs
+    if logger.isEnabledFor(logging.INFO):
+        logger.info(json.dumps(finished.to_log_record(), default=str))
+
+    for listener in _listeners:
+        # A broken listener must not fail the traced code or starve the others
+        try:
+            listener(finished)
+        except Exception as e:
+            logger.warning(f"Span listener failed: {e}")
+
+    if _exporter:
+        try:
+            _exporter.export(finished)
+        except OSError as e:
+            logger.warning(f"Span export failed: {e}")
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    index = max(0, int(round(fraction * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def summary() -> Dict[str, Dict[str, float]]:
+    """Per-stage count, p50, p95 and max duration (ms) over the recent sample"""
+    with _lock:
+        samples = {name: sorted(values) for name, values in _durations.items() if values}
+
+    return {
+        name: {
+            "count": len(values),
+            "p50_ms": _percentile(values, 0.50),
+            "p95_ms": _percentile(values, 0.95),
+            "max_ms": values[-1],
+        }
+        for name, values in sorted(samples.items())
+    }
+
+
+def format_summary() -> str:
+    """Render summary() as a fixed-width text table"""
+    lines = [f"{'stage':<36} {'count':>6} {'p50 ms':>10} {'p95 ms':>10} {'max ms':>10}"]
+    for name, stats in summary().items():
+        lines.append(
+            f"{name:<36} {stats['count']:>6} {stats['p50_ms']:>10.2f} "
+            f"{stats['p95_ms']:>10.2f} {stats['max_ms']:>10.2f}"
+        )
+    return "\n".join(lines)
+
+
+def reset():
+    """Forget all recorded durations"""
+    with _lock:
+        _durations.clear()
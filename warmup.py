@@ -0,0 +1,88 @@
+"""
+Background pre-warming of heavy imports and the PDF renderer
+
+app.py imports the scraper, the LLM stack and the resume renderer where they are
+first used so a fresh dyno can serve the login page quickly. Once that page has
+rendered, start_warmup() imports them on a daemon thread and then renders a tiny
+PDF, so the first real scrape, generation or PDF does not pay for any of it.
+is_pdf_renderer_ready() tells the UI whether that last step has finished.
+"""
+import importlib
+import threading
+import config
+from tracing import span
+
+# Modules app.py imports lazily, with what each pulls in
+HEAVY_MODULES = (
+    "web_scraper",       # requests, bs4
+    "resume_service",    # llm_processor_web, resume_renderer (jinja2, compiled templates)
+    "dedup",             # numpy, used when bullets are added
+    "embeddings",
+    "job_clustering",
+)
+
+_lock = threading.Lock()
+_started = False
+_pdf_ready = threading.Event()
+
+
+def _import_all(modules):
+    for name in modules:
+        try:
+            with span("warmup.import", module=name):
+                importlib.import_module(name)
+        except ImportError as e:
+            print(f"Warm-up could not import {name}: {str(e)}")
+
+
+def warm_pdf_renderer():
+    """Load xhtml2pdf/reportlab, register fonts and render a tiny document (blocking)"""
+    try:
+        with span("warmup.pdf_renderer"):
+            from resume_renderer import warm_up_pdf_renderer
+
+            warm_up_pdf_renderer()
+    except Exception as e:
+        print(f"PDF renderer warm-up failed: {str(e)}")
+    finally:
+        # A failed warm-up only means the first real render pays the cost
+        _pdf_ready.set()
+
+
+def _run(modules):
+    _import_all(modules)
+    warm_pdf_renderer()
+
+
+def start_warmup(modules=None) -> bool:
+    """
+    Import heavy modules and warm the PDF renderer on a daemon thread (once per process)
+
+    Args:
+        modules: Module names to import first (default: HEAVY_MODULES, plus the
+            Anthropic SDK when it is the configured backend)
+
+    Returns:
+        True if this call started the warm-up, False if it was already running
+    """
+    global _started
+    with _lock:
+        if _started:
+            return False
+        _started = True
+
+    if modules is None:
+        modules = HEAVY_MODULES + (("anthropic",) if config.LLM_BACKEND == "anthropic" else ())
+
+    threading.Thread(target=_run, args=(tuple(modules),), name="warmup", daemon=True).start()
+    return True
+
+
+def is_pdf_renderer_ready() -> bool:
+    """True once the PDF renderer warm-up has finished (or failed)"""
+    return _pdf_ready.is_set()
+
+
+def wait_for_pdf_renderer(timeout: float = None) -> bool:
+    """Block until the PDF renderer is warm; returns False on timeout"""
+    return _pdf_ready.wait(timeout)
@@ -3,15 +3,70 @@ Module for scraping job descriptions from web URLs
 """
 import requests
 from bs4 import BeautifulSoup
-from typing import Optional
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 import config
+import job_extractors
+import metrics
+from scrape_scheduler import SCHEDULER, SlotTimeout, parse_retry_after
 
+# Query parameters that only say where a link was shared from
+TRACKING_PARAMS = frozenset({
+    "fbclid", "gclid", "msclkid", "mc_cid", "mc_eid", "ref", "refid", "src", "source",
+    "trk", "trkinfo", "trackingid", "gh_src", "lever-source", "lever-origin", "lever-via",
+})
 
-def scrape_job_description(url: str) -> Optional[str]:
+# Failures that retrying will not fix; timeouts, rate limits and server errors are never cached
+PERMANENT_FAILURES = frozenset({"not_found", "too_short"})
+
+
+def normalize_url(url: str) -> str:
+    """
+    Cache key for a job URL: lowercase scheme and host, no "www.", fragment,
+    trailing slash or tracking parameters, and the remaining parameters sorted
+    """
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    )
+    return urlunsplit((parts.scheme.lower() or "https", host, parts.path.rstrip("/"), urlencode(query), ""))
+
+
+def scrape_job_description(url: str, db=None, user_id: Optional[int] = None) -> Optional[str]:
     """
     Scrape job description from the given URL with improved patience and extraction
     Returns the text content of the page, or None if scraping fails
+
+    With a Database, results are shared through its scrape cache: descriptions for
+    config.SCRAPE_CACHE_TTL seconds and permanent failures (PERMANENT_FAILURES) for
+    config.SCRAPE_FAILURE_TTL. Transient failures are left for the next caller to retry.
+    Fetches are paced per host by scrape_scheduler, taking turns by user_id.
     """
+    if db is None:
+        return _scrape(url, user_id)[0]
+
+    url_key = normalize_url(url)
+    cached = db.get_cached_scrape(url_key)
+    if cached and (cached['description'] or cached['status'] in PERMANENT_FAILURES):
+        ttl = config.SCRAPE_CACHE_TTL if cached['description'] else config.SCRAPE_FAILURE_TTL
+        if cached['age_seconds'] < ttl:
+            metrics.SCRAPE_CACHE.inc(result="hit" if cached['description'] else "failure_hit")
+            return cached['description']
+    metrics.SCRAPE_CACHE.inc(result="miss")
+
+    description, outcome = _scrape(url, user_id)
+    if description or outcome in PERMANENT_FAILURES:
+        db.save_scrape(url_key, description, outcome)
+    return description
+
+
+@metrics.SCRAPE_SECONDS.time()
+def _scrape(url: str, user_id: Optional[int] = None) -> Tuple[Optional[str], str]:
+    """Fetch and extract one page; returns (text or None, outcome)"""
     try:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
@@ -23,82 +78,133 @@ def scrape_job_description(url: str) -> Optional[str]:
         }
 
         # Increase timeout to 30 seconds for better patience
-        response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
+        with SCHEDULER.slot(url, user_id):
+            response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
+
+        if response.status_code in (429, 503):
+            # Keep every user off the host for as long as it asked, and retry once if that is short
+            retry_after = parse_retry_after(response.headers.get('Retry-After'))
+            SCHEDULER.retry_after(url, retry_after if retry_after is not None else config.SCRAPE_HOST_DELAY)
+            if retry_after is not None and retry_after <= config.SCRAPE_MAX_RETRY_AFTER:
+                with SCHEDULER.slot(url, user_id):
+                    response = requests.get(url, headers=headers, timeout=30, allow_redirects=True)
+            if response.status_code in (429, 503):
+                print(f"Rate limited scraping {url} (Retry-After: {response.headers.get('Retry-After')})")
+                metrics.SCRAPES.inc(outcome="rate_limited")
+                return None, "rate_limited"
         response.raise_for_status()
 
-        soup = BeautifulSoup(response.content, 'html.parser')
-
-        # Remove unwanted elements
-        for element in soup(["script", "style", "nav", "header", "footer", "aside", "form", "button"]):
-            element.decompose()
-
-        # Try to find job description in common containers first
-        job_description = None
-
-        # Common selectors for job descriptions
-        selectors = [
-            {'class': 'job-description'},
-            {'class': 'description'},
-            {'class': 'job-details'},
-            {'class': 'job_description'},
-            {'class': 'jobDescription'},
-            {'id': 'job-description'},
-            {'id': 'description'},
-            {'role': 'main'},
-            {'class': 'content'},
-            {'class': 'main-content'}
-        ]
-
-        for selector in selectors:
-            element = soup.find(['div', 'section', 'article', 'main'], selector)
-            if element:
-                job_description = element.get_text(separator='\n', strip=True)
-                break
-
-        # Fallback to entire body if nothing found
-        if not job_description or len(job_description) < 100:
-            # Get main content area
-            main = soup.find('main') or soup.find('article') or soup.find('body')
-            if main:
-                job_description = main.get_text(separator='\n', strip=True)
-
-        if not job_description:
-            job_description = soup.get_text(separator='\n', strip=True)
-
-        # Clean up text
-        lines = []
-        for line in job_description.split('\n'):
-            cleaned = line.strip()
-            # Skip very short lines (likely navigation/menu items)
-            if len(cleaned) > 3:
-                lines.append(cleaned)
-
-        # Remove duplicate consecutive lines
-        final_lines = []
-        prev_line = None
-        for line in lines:
-            if line != prev_line:
-                final_lines.append(line)
-                prev_line = line
-
-        text = '\n'.join(final_lines)
+        text = extract_description(response.content, response.url or url)
 
         # Only return if we got substantial content
         if len(text) > 200:  # At least 200 characters
-            return text
+            metrics.SCRAPES.inc(outcome="success")
+            return text, "success"
         else:
             print(f"Scraped content too short ({len(text)} chars), might not be job description")
-            return None
+            metrics.SCRAPES.inc(outcome="too_short")
+            return None, "too_short"
 
+    except SlotTimeout:
+        print(f"Gave up waiting for a turn to scrape {url}")
+        metrics.SCRAPES.inc(outcome="queue_timeout")
+        return None, "queue_timeout"
     except requests.Timeout:
         print(f"Timeout error scraping {url} - site took too long to respond")
-        return None
+        metrics.SCRAPES.inc(outcome="timeout")
+        return None, "timeout"
+    except requests.HTTPError as e:
+        # Gone for good vs. a server having a bad minute
+        outcome = "not_found" if e.response is not None and e.response.status_code in (404, 410) else "http_error"
+        print(f"HTTP error scraping {url}: {str(e)}")
+        metrics.SCRAPES.inc(outcome=outcome)
+        return None, outcome
     except requests.RequestException as e:
         print(f"Request error scraping {url}: {str(e)}")
-        return None
+        metrics.SCRAPES.inc(outcome="request_error")
+        return None, "request_error"
     except Exception as e:
         print(f"Error scraping {url}: {str(e)}")
-        return None
+        metrics.SCRAPES.inc(outcome="error")
+        return None, "error"
+
+
+def extract_description(content: bytes, url: str, site_extractors: bool = True) -> str:
+    """
+    Job description text from a fetched page (empty if nothing was found)
+
+    site_extractors=False skips job_extractors and uses only the generic selectors.
+    """
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # Known job boards and JSON-LD first; both are far less noisy than the selectors below
+    job_description = job_extractors.extract(soup, url) if site_extractors else None
+    if job_description is None:
+        job_description = _extract_generic(soup)
+
+    return _clean_lines(job_description)
+
+
+def _extract_generic(soup: BeautifulSoup) -> str:
+    """Common description containers, else the main content or the whole page"""
+    # Remove unwanted elements
+    for element in soup(["script", "style", "nav", "header", "footer", "aside", "form", "button"]):
+        element.decompose()
+
+    # Try to find job description in common containers first
+    job_description = None
+
+    # Common selectors for job descriptions
+    selectors = [
+        {'class': 'job-description'},
+        {'class': 'description'},
+        {'class': 'job-details'},
+        {'class': 'job_description'},
+        {'class': 'jobDescription'},
+        {'id': 'job-description'},
+        {'id': 'description'},
+        {'role': 'main'},
+        {'class': 'content'},
+        {'class': 'main-content'}
+    ]
+
+    for selector in selectors:
+        element = soup.find(['div', 'section', 'article', 'main'], selector)
+        if element:
+            job_description = element.get_text(separator='\n', strip=True)
+            break
+
+    # Fallback to entire body if nothing found
+    if not job_description or len(job_description) < 100:
+        # Get main content area
+        main = soup.find('main') or soup.find('article') or soup.find('body')
+        if main:
+            job_description = main.get_text(separator='\n', strip=True)
+
+    if not job_description:
+        job_description = soup.get_text(separator='\n', strip=True)
+
+    return job_description
+
+
+def _clean_lines(job_description: str) -> str:
+    """Drop very short lines and repeated consecutive lines"""
+    lines = []
+    for line in job_description.split('\n'):
+        cleaned = line.strip()
+        # Skip very short lines (likely navigation/menu items)
+        if len(cleaned) > 3:
+            lines.append(cleaned)
+
+    # Remove duplicate consecutive lines
+    final_lines = []
+    prev_line = None
+    for line in lines:
+        if line != prev_line:
+            final_lines.append(line)
+            prev_line = line
+
+    return '\n'.join(final_lines)
 
 
 def clean_job_description(text: str) -> str: